@@ -0,0 +1,40 @@
+"""Add available_count to hotel_min_price and backfill search summary
+
+Revision ID: 3f9a1c7d2b84
+Revises: beb29e1df7e9
+Create Date: 2026-10-18 09:12:40.118274
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c7d2b84"
+down_revision: Union[str, None] = "beb29e1df7e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("hotel_min_price", sa.Column("available_count", sa.Integer(), server_default="0", nullable=False))
+    op.execute("DELETE FROM hotel_min_price")
+    op.execute(
+        """
+        INSERT INTO hotel_min_price (hotel_id, date, price, city, available_count, created_at, updated_at)
+        SELECT hotel_id, date, MIN(price), MAX(city), MAX(total_count - book_count - reserved_count),
+               timezone('utc', now()), timezone('utc', now())
+        FROM inventory
+        WHERE closed = false AND total_count - book_count - reserved_count > 0
+        GROUP BY hotel_id, date
+        """
+    )
+    # The default only fills existing rows; the model sets the value on insert
+    op.alter_column("hotel_min_price", "available_count", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("hotel_min_price", "available_count")
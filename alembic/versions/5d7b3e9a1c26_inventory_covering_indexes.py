@@ -0,0 +1,58 @@
+"""Add composite and covering indexes for inventory hot paths
+
+Revision ID: 5d7b3e9a1c26
+Revises: 8c2e5d41a7f3
+Create Date: 2026-10-18 14:05:21.118402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d7b3e9a1c26"
+down_revision: Union[str, None] = "8c2e5d41a7f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inventory_room_date",
+            "inventory",
+            ["room_id", "date"],
+            postgresql_include=["total_count", "book_count", "reserved_count", "closed", "price"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_inventory_hotel_date",
+            "inventory",
+            ["hotel_id", "date"],
+            postgresql_include=["total_count", "book_count", "reserved_count", "closed", "price", "city"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_hotel_min_price_search",
+            "hotel_min_price",
+            ["date", "available_count"],
+            postgresql_include=["city", "hotel_id", "price"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded by the search index, which leads with the same column
+        op.drop_index("ix_hotel_min_price_date", table_name="hotel_min_price", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_hotel_min_price_date", "hotel_min_price", ["date"], postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index("ix_hotel_min_price_search", table_name="hotel_min_price", postgresql_concurrently=True)
+        op.drop_index("ix_inventory_hotel_date", table_name="inventory", postgresql_concurrently=True)
+        op.drop_index("ix_inventory_room_date", table_name="inventory", postgresql_concurrently=True)
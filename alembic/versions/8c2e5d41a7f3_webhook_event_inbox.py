@@ -0,0 +1,45 @@
+"""Add webhook_event inbox table
+
+Revision ID: 8c2e5d41a7f3
+Revises: 3f9a1c7d2b84
+Create Date: 2026-10-18 11:40:05.362918
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2e5d41a7f3"
+down_revision: Union[str, None] = "3f9a1c7d2b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_event",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.String(length=255), nullable=False),
+        sa.Column("type", sa.String(length=255), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "PROCESSED", "FAILED", name="webhookeventstatus"), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id"),
+    )
+    op.create_index(op.f("ix_webhook_event_id"), "webhook_event", ["id"], unique=False)
+    op.create_index(op.f("ix_webhook_event_status"), "webhook_event", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_webhook_event_status"), table_name="webhook_event")
+    op.drop_index(op.f("ix_webhook_event_id"), table_name="webhook_event")
+    op.drop_table("webhook_event")
+    sa.Enum(name="webhookeventstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,105 @@
+"""Add normalized city_key for indexed hotel search
+
+Revision ID: a4c81f3e6b52
+Revises: 5d7b3e9a1c26
+Create Date: 2026-10-18 15:32:47.604113
+
+"""
+
+import re
+import unicodedata
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c81f3e6b52"
+down_revision: Union[str, None] = "5d7b3e9a1c26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("hotel", "inventory", "hotel_min_price")
+
+_SEPARATORS = re.compile(r"[^\w]+|_")
+
+
+def normalize_city(city: str) -> str:
+    """Frozen copy of ``app.utils.city.normalize_city`` as of this revision.
+
+    Migrations must not import application code, which keeps changing after they are written.
+    """
+    decomposed = unicodedata.normalize("NFKD", city)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_SEPARATORS.sub(" ", stripped.casefold()).split())
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("city_key", sa.String(length=255), nullable=True))
+
+    # Normalization lives in Python, so backfill one UPDATE per distinct city
+    conn = op.get_bind()
+    for table in TABLES:
+        cities = conn.execute(sa.text(f"SELECT DISTINCT city FROM {table} WHERE city IS NOT NULL")).scalars().all()
+        for city in cities:
+            conn.execute(
+                sa.text(f"UPDATE {table} SET city_key = :city_key WHERE city = :city"),
+                {"city_key": normalize_city(city), "city": city},
+            )
+
+    op.alter_column("inventory", "city_key", nullable=False)
+    op.alter_column("hotel_min_price", "city_key", nullable=False)
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.drop_index("ix_hotel_min_price_search", table_name="hotel_min_price", postgresql_concurrently=True)
+        op.create_index(
+            "ix_hotel_min_price_search",
+            "hotel_min_price",
+            ["city_key", "date", "available_count"],
+            postgresql_include=["hotel_id", "price"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_hotel_min_price_city_key_trgm",
+            "hotel_min_price",
+            ["city_key"],
+            postgresql_using="gin",
+            postgresql_ops={"city_key": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_inventory_hotel_date", table_name="inventory", postgresql_concurrently=True)
+        op.create_index(
+            "ix_inventory_hotel_date",
+            "inventory",
+            ["hotel_id", "date"],
+            postgresql_include=["total_count", "book_count", "reserved_count", "closed", "price", "city", "city_key"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_inventory_hotel_date", table_name="inventory", postgresql_concurrently=True)
+        op.create_index(
+            "ix_inventory_hotel_date",
+            "inventory",
+            ["hotel_id", "date"],
+            postgresql_include=["total_count", "book_count", "reserved_count", "closed", "price", "city"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_hotel_min_price_city_key_trgm", table_name="hotel_min_price", postgresql_concurrently=True)
+        op.drop_index("ix_hotel_min_price_search", table_name="hotel_min_price", postgresql_concurrently=True)
+        op.create_index(
+            "ix_hotel_min_price_search",
+            "hotel_min_price",
+            ["date", "available_count"],
+            postgresql_include=["city", "hotel_id", "price"],
+            postgresql_concurrently=True,
+        )
+
+    for table in reversed(TABLES):
+        op.drop_column(table, "city_key")
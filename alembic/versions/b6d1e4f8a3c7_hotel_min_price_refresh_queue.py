@@ -0,0 +1,35 @@
+"""Add hotel_min_price_refresh queue for search summary refreshes
+
+Revision ID: b6d1e4f8a3c7
+Revises: f5a2c9e7d4b1
+Create Date: 2026-10-18 23:10:42.518306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d1e4f8a3c7"
+down_revision: Union[str, None] = "f5a2c9e7d4b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "hotel_min_price_refresh",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("hotel_id", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("hotel_min_price_refresh")
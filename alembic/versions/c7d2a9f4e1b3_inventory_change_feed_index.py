@@ -0,0 +1,34 @@
+"""Index inventory by hotel and update time for the change feed
+
+Revision ID: c7d2a9f4e1b3
+Revises: a4c81f3e6b52
+Create Date: 2026-10-18 18:42:07.530118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2a9f4e1b3"
+down_revision: Union[str, None] = "a4c81f3e6b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inventory_hotel_updated",
+            "inventory",
+            ["hotel_id", "updated_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_inventory_hotel_updated", table_name="inventory", postgresql_concurrently=True)
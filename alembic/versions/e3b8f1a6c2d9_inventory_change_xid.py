@@ -0,0 +1,54 @@
+"""Key the inventory change feed on the writing transaction id
+
+Revision ID: e3b8f1a6c2d9
+Revises: c7d2a9f4e1b3
+Create Date: 2026-10-18 21:16:44.208391
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8f1a6c2d9"
+down_revision: Union[str, None] = "c7d2a9f4e1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default adds the column without rewriting the table; existing rows sort first
+    op.add_column("inventory", sa.Column("change_xid", sa.BigInteger(), server_default="0", nullable=False))
+    op.alter_column("inventory", "change_xid", server_default=sa.text("txid_current()"))
+    op.alter_column("inventory", "updated_at", server_default=sa.text("timezone('utc', clock_timestamp())"))
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inventory_hotel_change",
+            "inventory",
+            ["hotel_id", "change_xid", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_inventory_hotel_updated", table_name="inventory", postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inventory_hotel_updated",
+            "inventory",
+            ["hotel_id", "updated_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index("ix_inventory_hotel_change", table_name="inventory", postgresql_concurrently=True)
+
+    op.alter_column("inventory", "updated_at", server_default=None)
+    op.drop_column("inventory", "change_xid")
@@ -0,0 +1,34 @@
+"""Index inventory by writing transaction for availability engine catch-up
+
+Revision ID: f5a2c9e7d4b1
+Revises: e3b8f1a6c2d9
+Create Date: 2026-10-18 22:05:13.774902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f5a2c9e7d4b1"
+down_revision: Union[str, None] = "e3b8f1a6c2d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_inventory_change_xid",
+            "inventory",
+            ["change_xid"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_inventory_change_xid", table_name="inventory", postgresql_concurrently=True)
@@ -1,17 +1,54 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import AsyncGenerator, Callable, Iterable, Sequence
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.utils.metrics import MetricFamily, registry
+from app.utils.on_commit import has_written
+from app.utils.pool_metrics import InstrumentedPool, pool_status
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True,
-)
+
+def _statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(**overrides) -> dict:
+    """``create_async_engine`` options from settings; passing ``poolclass`` drops the pool sizing."""
+    options: dict = {"echo": False, "future": True}
+    if "poolclass" not in overrides:
+        options.update(
+            poolclass=InstrumentedPool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    if settings.DB_PGBOUNCER:
+        # Transaction pooling hands each transaction a different server connection, so
+        # prepared statements must not be cached or reused by name across statements
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _statement_name,
+        }
+    return {**options, **overrides}
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -20,20 +57,225 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def create_read_engine(url: str, **kwargs) -> AsyncEngine:
+    """Engine for read-only handlers.
+
+    Statements run in autocommit on connections whose transactions default to READ ONLY, so
+    there are no BEGIN/COMMIT round trips and the server rejects any write that slips through.
+    PgBouncer refuses that startup parameter, so behind it reads use READ ONLY transactions.
+    """
+    options = engine_options(**kwargs)
+    if settings.DB_PGBOUNCER:
+        return create_async_engine(url, **options, execution_options={"postgresql_readonly": True})
+    connect_args = {**options.pop("connect_args", {}), "server_settings": {"default_transaction_read_only": "on"}}
+    return create_async_engine(url, **options, isolation_level="AUTOCOMMIT", connect_args=connect_args)
+
+
+# A client that committed a write is handed its read-your-writes deadline (epoch seconds) in
+# this header and cookie, and echoes it back so every API process routes its reads alike
+READ_YOUR_WRITES_HEADER = "X-Primary-Until"
+READ_YOUR_WRITES_COOKIE = "primary_until"
+
+# Seconds a replica has been replaying behind its primary; 0 on a primary or a caught-up replica
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+@dataclass
+class ReadRouterStats:
+    """Where read-only sessions were sent."""
+
+    primary: int = 0
+    replica: int = 0
+    sticky: int = 0
+    lag_checks: int = 0
+
+
+class ReadRouter:
+    """Routes read-only sessions between the primary and its replicas.
+
+    Replicas take reads while their last measured lag is within ``max_lag_seconds``; a replica
+    that is lagging, unreachable or not yet checked is skipped, and with no healthy replica
+    reads go to the primary. A client that wrote within ``sticky_seconds`` reads from the
+    primary so it sees its own writes; the client carries that deadline between requests (see
+    ``pin_until``), so it holds across API processes and token refreshes.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        max_lag_seconds: float = 5.0,
+        sticky_seconds: float = 10.0,
+        check_timeout_seconds: float = 2.0,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self.lag: list[float | None] = [None] * len(self.replicas)
+        self.stats = ReadRouterStats()
+        self._round_robin = itertools.count()
+        self._makers = {
+            id(bind): async_sessionmaker(bind, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+            for bind in [primary, *self.replicas]
+        }
+
+    def pin_until(self) -> float:
+        """Read-your-writes deadline for a client whose write just committed."""
+        return time.time() + self.sticky_seconds
+
+    def pinned(self, primary_until: float | None) -> bool:
+        """Whether a client-supplied deadline still pins reads to the primary.
+
+        Deadlines further out than twice the window are ignored, so a forged value cannot pin
+        a client for long while clock skew between API hosts is tolerated.
+        """
+        if primary_until is None:
+            return False
+        remaining = primary_until - time.time()
+        return 0 < remaining <= 2 * self.sticky_seconds
+
+    def engine_for(self, primary_until: float | None = None, primary: bool = False) -> AsyncEngine:
+        """Pick the engine for one read-only session."""
+        if self.pinned(primary_until):
+            self.stats.sticky += 1
+            primary = True
+        healthy = [
+            r for r, lag in zip(self.replicas, self.lag, strict=True) if lag is not None and lag <= self.max_lag_seconds
+        ]
+        if primary or not healthy:
+            self.stats.primary += 1
+            return self.primary
+        self.stats.replica += 1
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    def session(self, primary_until: float | None = None, primary: bool = False) -> AsyncSession:
+        """Open a read-only session on the engine chosen for a client's deadline."""
+        return self._makers[id(self.engine_for(primary_until, primary))]()
+
+    async def check_lag(self) -> int:
+        """Measure every replica's replay lag; returns how many are healthy."""
+        self.stats.lag_checks += 1
+        self.lag = list(await asyncio.gather(*(self._measure(replica) for replica in self.replicas)))
+        return sum(1 for lag in self.lag if lag is not None and lag <= self.max_lag_seconds)
+
+    async def _measure(self, replica: AsyncEngine) -> float | None:
+        try:
+            async with asyncio.timeout(self.check_timeout_seconds), replica.connect() as conn:
+                return float((await conn.execute(_LAG_SQL)).scalar_one())
+        except Exception:
+            logger.warning("Replica %s is unreachable", replica.url.render_as_string(hide_password=True))
+            return None
+
+
+read_engine = create_read_engine(settings.DATABASE_URL)
+
+read_router = ReadRouter(
+    read_engine,
+    [create_read_engine(url.strip()) for url in settings.REPLICA_DATABASE_URLS.split(",") if url.strip()],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def _engines() -> dict[str, AsyncEngine]:
+    engines = {"primary": engine, "read": read_engine}
+    engines.update({f"replica-{i}": replica for i, replica in enumerate(read_router.replicas)})
+    return engines
+
+
+def pool_stats() -> dict[str, dict]:
+    """Pool gauges and checkout metrics for every engine, by role."""
+    return {name: pool_status(bind.pool) for name, bind in _engines().items()}
+
+
+def _collect_pools() -> Iterable[MetricFamily]:
+    """Pool gauges and checkout metrics for the ``/metrics`` exposition."""
+    families = {
+        "checked_out": MetricFamily("db_pool_checked_out", "gauge", "Connections in use."),
+        "size": MetricFamily("db_pool_size", "gauge", "Configured pool size."),
+        "overflow": MetricFamily("db_pool_overflow", "gauge", "Connections open beyond the pool size."),
+        "checkouts": MetricFamily("db_pool_checkouts_total", "counter", "Successful connection checkouts."),
+        "timeouts": MetricFamily("db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+    }
+    wait = MetricFamily("db_pool_wait_seconds", "histogram", "Time spent waiting for a connection.")
+    for name, bind in _engines().items():
+        labels = {"pool": name}
+        status = pool_status(bind.pool)
+        for key, family in families.items():
+            if key in status:
+                family.samples.append(("", labels, status[key]))
+        metrics = getattr(bind.pool, "metrics", None)
+        if metrics is not None:
+            wait.samples.extend(metrics.wait_seconds.samples(labels))
+    return [*families.values(), wait]
+
+
+registry.register(_collect_pools)
+
+
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
 
     pass
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that provides a database session."""
+def _primary_until(request: Request) -> float | None:
+    """The read-your-writes deadline a client echoed back, from the header or the cookie."""
+    value = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a database session.
+
+    A committed write records the client's read-your-writes deadline in the request state,
+    which ``ReadYourWritesMiddleware`` returns to the client.
+    """
     async with async_session_maker() as session:
         try:
             yield session
+            wrote = has_written(session)
             await session.commit()
+            if wrote:
+                request.state.primary_until = read_router.pin_until()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a session for handlers that only read.
+
+    Sessions go to a healthy replica unless the client wrote recently. Each statement runs on
+    its own snapshot and nothing is committed; use ``get_db`` for any handler that writes or
+    needs several reads to agree.
+    """
+    async with read_router.session(_primary_until(request)) as session:
+        yield session
+
+
+async def get_primary_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """``get_read_db`` pinned to the primary, for reads that must not lag, e.g. payment status."""
+    async with read_router.session(primary=True) as session:
+        yield session
+
+
+def get_read_session_factory(request: Request) -> Callable[[], AbstractAsyncContextManager[AsyncSession]]:
+    """Dependency returning a factory of ``get_read_db``-style sessions.
+
+    Dependencies with ``yield`` are closed before a streamed body is sent, so streaming
+    handlers open their session with this factory inside the body instead.
+    """
+    primary_until = _primary_until(request)
+    return lambda: read_router.session(primary_until)
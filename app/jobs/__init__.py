@@ -0,0 +1,19 @@
+# Background jobs package
+from app.jobs.availability_refresh import AvailabilityEngineRefresher
+from app.jobs.base import JobStats, PeriodicJob
+from app.jobs.booking_expiry import BookingExpirySweeper
+from app.jobs.inventory_horizon import InventoryHorizonExtender
+from app.jobs.replica_lag import ReplicaLagMonitor
+from app.jobs.search_summary import SearchSummaryRefresher
+from app.jobs.webhook_inbox import WebhookInboxProcessor
+
+__all__ = [
+    "JobStats",
+    "PeriodicJob",
+    "AvailabilityEngineRefresher",
+    "BookingExpirySweeper",
+    "InventoryHorizonExtender",
+    "ReplicaLagMonitor",
+    "SearchSummaryRefresher",
+    "WebhookInboxProcessor",
+]
@@ -0,0 +1,28 @@
+from app.config import get_settings
+from app.jobs.base import PeriodicJob
+from app.services.availability_engine import AvailabilityEngine, availability_engine
+
+settings = get_settings()
+
+
+class AvailabilityEngineRefresher(PeriodicJob):
+    """Periodic job that reloads the availability engine from the database.
+
+    Rolls the engine's window forward as days pass and bounds drift from writes missed during
+    a reload.
+    """
+
+    name = "availability-engine"
+
+    def __init__(
+        self,
+        engine: AvailabilityEngine = availability_engine,
+        interval_seconds: int = settings.AVAILABILITY_ENGINE_REFRESH_SECONDS,
+    ):
+        super().__init__(interval_seconds)
+        self.engine = engine
+
+    async def run_once(self) -> int:
+        """Reload the engine; returns the number of rooms loaded."""
+        await self.engine.load()
+        return self.engine.stats.rooms
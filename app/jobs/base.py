@@ -0,0 +1,59 @@
+import asyncio
+import contextlib
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobStats:
+    """Counters shared by every periodic job."""
+
+    runs: int = 0
+    errors: int = 0
+    last_run_at: datetime | None = None
+
+
+class PeriodicJob(ABC):
+    """Base class for asyncio jobs that call ``run_once`` every ``interval_seconds``."""
+
+    name = "job"
+
+    def __init__(self, interval_seconds: float, stats: JobStats | None = None):
+        self.interval_seconds = interval_seconds
+        self.stats = stats or JobStats()
+        self._task: asyncio.Task | None = None
+
+    @abstractmethod
+    async def run_once(self) -> int:
+        """Do one unit of work; returns how many items were handled."""
+
+    async def run_forever(self) -> None:
+        """Run the job every ``interval_seconds`` until cancelled."""
+        while True:
+            try:
+                await self.run_once()
+                self.stats.runs += 1
+                self.stats.last_run_at = datetime.utcnow()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Background job %s failed", self.name)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Schedule the job on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever(), name=self.name)
+
+    async def stop(self) -> None:
+        """Cancel the job and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -0,0 +1,63 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.jobs.base import JobStats, PeriodicJob
+from app.services.booking_service import BookingService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepStats(JobStats):
+    """Counters describing how much inventory the sweeper has reclaimed."""
+
+    bookings_expired: int = 0
+    room_nights_released: int = 0
+
+
+class BookingExpirySweeper(PeriodicJob):
+    """Periodic job that expires abandoned booking holds and releases their inventory."""
+
+    name = "booking-expiry"
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        interval_seconds: int = settings.BOOKING_EXPIRY_INTERVAL_SECONDS,
+        batch_size: int = settings.BOOKING_EXPIRY_BATCH_SIZE,
+        hold_minutes: int = settings.BOOKING_HOLD_MINUTES,
+        payment_hold_minutes: int = settings.PAYMENT_HOLD_MINUTES,
+    ):
+        super().__init__(interval_seconds, SweepStats())
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.hold_minutes = hold_minutes
+        self.payment_hold_minutes = payment_hold_minutes
+
+    async def run_once(self) -> int:
+        """Expire stale holds batch by batch until none are left; returns bookings expired."""
+        now = datetime.utcnow()
+        reserved_before = now - timedelta(minutes=self.hold_minutes)
+        pending_before = now - timedelta(minutes=self.payment_hold_minutes)
+
+        total = 0
+        while True:
+            # Each batch commits on its own so row locks are held only briefly
+            async with self.session_maker() as session, session.begin():
+                expired, room_nights = await BookingService(session).expire_stale_bookings(
+                    reserved_before, pending_before, self.batch_size
+                )
+
+            total += expired
+            self.stats.bookings_expired += expired
+            self.stats.room_nights_released += room_nights
+            if expired:
+                logger.info("Expired %d stale bookings, released %d room-nights", expired, room_nights)
+            if expired < self.batch_size:
+                return total
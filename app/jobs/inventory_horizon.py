@@ -0,0 +1,60 @@
+import logging
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.jobs.base import JobStats, PeriodicJob
+from app.services.inventory_writer import InventoryWriter
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HorizonStats(JobStats):
+    """Counters describing how much inventory the extender has generated."""
+
+    rows_inserted: int = 0
+
+
+class InventoryHorizonExtender(PeriodicJob):
+    """Periodic job that keeps every room's inventory generated up to today + ``horizon_days``."""
+
+    name = "inventory-horizon"
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        interval_seconds: int = settings.INVENTORY_HORIZON_INTERVAL_SECONDS,
+        horizon_days: int = settings.INVENTORY_HORIZON_DAYS,
+        batch_size: int = settings.INVENTORY_HORIZON_BATCH_SIZE,
+    ):
+        super().__init__(interval_seconds, HorizonStats())
+        self.session_maker = session_maker
+        self.horizon_days = horizon_days
+        self.batch_size = batch_size
+
+    async def run_once(self) -> int:
+        """Fill in missing tail dates for all rooms, one batch of rooms per transaction."""
+        horizon_end = date.today() + timedelta(days=self.horizon_days - 1)
+
+        total = 0
+        after_room_id = 0
+        while True:
+            async with self.session_maker() as session, session.begin():
+                last_room_id, inserted = await InventoryWriter(session).extend_horizon(
+                    horizon_end, after_room_id, self.batch_size
+                )
+
+            total += inserted
+            self.stats.rows_inserted += inserted
+            if last_room_id is None:
+                break
+            after_room_id = last_room_id
+
+        if total:
+            logger.info("Extended inventory to %s with %d new rows", horizon_end, total)
+        return total
@@ -0,0 +1,19 @@
+from app.config import get_settings
+from app.database import ReadRouter, read_router
+from app.jobs.base import PeriodicJob
+
+settings = get_settings()
+
+
+class ReplicaLagMonitor(PeriodicJob):
+    """Periodic job that measures replica lag so reads skip replicas that fall behind."""
+
+    name = "replica-lag"
+
+    def __init__(self, router: ReadRouter = read_router, interval_seconds: float = settings.REPLICA_LAG_CHECK_SECONDS):
+        super().__init__(interval_seconds)
+        self.router = router
+
+    async def run_once(self) -> int:
+        """Check every replica; returns how many are healthy."""
+        return await self.router.check_lag()
@@ -0,0 +1,57 @@
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.jobs.base import JobStats, PeriodicJob
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.search_cache import search_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SummaryRefreshStats(JobStats):
+    """Counters describing how many queued summary refreshes have been applied."""
+
+    entries_applied: int = 0
+    hotels_refreshed: int = 0
+
+
+class SearchSummaryRefresher(PeriodicJob):
+    """Periodic job that applies search summary refreshes queued by booking writes."""
+
+    name = "search-summary-refresh"
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        interval_seconds: float = settings.SEARCH_SUMMARY_REFRESH_INTERVAL_SECONDS,
+        batch_size: int = settings.SEARCH_SUMMARY_REFRESH_BATCH_SIZE,
+    ):
+        super().__init__(interval_seconds, SummaryRefreshStats())
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+
+    async def run_once(self) -> int:
+        """Drain the refresh queue batch by batch; returns queue entries applied."""
+        total = 0
+        while True:
+            async with self.session_maker() as session, session.begin():
+                applied, ranges = await HotelMinPriceService(session).refresh_pending(self.batch_size)
+                # Pages computed from the summary before this refresh are stale now
+                for hotel_id, (start_date, end_date) in ranges.items():
+                    await search_cache.invalidate_hotels(session, [hotel_id], start_date, end_date)
+
+            total += applied
+            self.stats.entries_applied += applied
+            self.stats.hotels_refreshed += len(ranges)
+            if applied < self.batch_size:
+                break
+
+        if total:
+            logger.debug("Applied %d queued search summary refreshes", total)
+        return total
@@ -0,0 +1,51 @@
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.jobs.base import JobStats, PeriodicJob
+from app.services.checkout_service import CheckoutService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InboxStats(JobStats):
+    """Counters describing webhook inbox throughput."""
+
+    events_processed: int = 0
+
+
+class WebhookInboxProcessor(PeriodicJob):
+    """Periodic job that drains the webhook inbox in batches."""
+
+    name = "webhook-inbox"
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        interval_seconds: float = settings.WEBHOOK_INBOX_INTERVAL_SECONDS,
+        batch_size: int = settings.WEBHOOK_INBOX_BATCH_SIZE,
+    ):
+        super().__init__(interval_seconds, InboxStats())
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+
+    async def run_once(self) -> int:
+        """Process pending events until the inbox is empty; returns events processed."""
+        total = 0
+        while True:
+            async with self.session_maker() as session, session.begin():
+                processed = await CheckoutService(session).process_webhook_events(self.batch_size)
+
+            total += processed
+            self.stats.events_processed += processed
+            if processed < self.batch_size:
+                break
+
+        if total:
+            logger.info("Processed %d webhook events", total)
+        return total
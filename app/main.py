@@ -1,22 +1,61 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.database import READ_YOUR_WRITES_HEADER, read_router
 from app.exceptions.handlers import register_exception_handlers
+from app.jobs import (
+    AvailabilityEngineRefresher,
+    BookingExpirySweeper,
+    InventoryHorizonExtender,
+    ReplicaLagMonitor,
+    SearchSummaryRefresher,
+    WebhookInboxProcessor,
+)
+from app.middleware import QueryStatsMiddleware, ReadYourWritesMiddleware, RequestMetricsMiddleware
 from app.routers import (
     auth_router,
     bookings_router,
     browse_router,
     hotels_router,
+    internal_router,
     inventory_router,
     rooms_router,
     users_router,
     webhooks_router,
 )
+from app.services.availability_engine import availability_engine
 
 settings = get_settings()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start and stop background jobs with the application."""
+    jobs = (
+        [BookingExpirySweeper(), InventoryHorizonExtender(), WebhookInboxProcessor(), SearchSummaryRefresher()]
+        if settings.BACKGROUND_JOBS_ENABLED
+        else []
+    )
+    if settings.AVAILABILITY_ENGINE_ENABLED:
+        # Load before serving so the first searches already use the engine
+        await availability_engine.load()
+        jobs.append(AvailabilityEngineRefresher())
+    if read_router.replicas:
+        # Replicas only take reads once a lag check has found them healthy
+        await read_router.check_lag()
+        jobs.append(ReplicaLagMonitor())
+    app.state.jobs = jobs
+    for job in jobs:
+        job.start()
+    yield
+    for job in jobs:
+        await job.stop()
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
@@ -26,6 +65,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        lifespan=lifespan,
     )
 
     # Configure CORS
@@ -35,8 +75,14 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Browsers hide non-safelisted response headers from scripts unless they are exposed
+        expose_headers=["X-Next-Cursor", "X-Total-Count-Estimate", READ_YOUR_WRITES_HEADER],
     )
 
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(RequestMetricsMiddleware)
+
     # Register exception handlers
     register_exception_handlers(app)
 
@@ -49,6 +95,7 @@ def create_app() -> FastAPI:
     app.include_router(users_router)
     app.include_router(browse_router)
     app.include_router(webhooks_router)
+    app.include_router(internal_router)
 
     @app.get("/", tags=["Health"])
     async def health_check():
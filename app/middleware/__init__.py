@@ -0,0 +1,13 @@
+# Middleware package
+from app.middleware.metrics import RequestMetricsMiddleware
+from app.middleware.query_stats import QueryStats, QueryStatsMiddleware, count_queries, query_metrics
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+
+__all__ = [
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "ReadYourWritesMiddleware",
+    "RequestMetricsMiddleware",
+    "count_queries",
+    "query_metrics",
+]
@@ -0,0 +1,46 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.routes import route_template
+from app.utils.metrics import registry
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+)
+
+
+class RequestMetricsMiddleware:
+    """Counts requests and observes their latency, labelled by route template rather than raw path.
+
+    Latency runs until the response body has been sent. A request that fails before starting a
+    response is counted as a 500.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            method, route = scope["method"], route_template(scope)
+            http_requests.inc(method, route, str(status_code))
+            http_request_seconds.labels(method, route).observe(elapsed)
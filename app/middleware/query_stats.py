@@ -0,0 +1,178 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.middleware.routes import route_template
+from app.utils.metrics import Histogram, MetricFamily, registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+# Every QueryStats collecting in the current context; nested collectors all see each statement
+_active: ContextVar[tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while collecting, with their total database time."""
+
+    count: int = 0
+    seconds: float = 0.0
+    keep_statements: bool = False
+    statements: list[str] = field(default_factory=list)
+    repeats: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        """The statement text executed most often, with its count."""
+        return self.repeats.most_common(1)[0] if self.repeats else None
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False) -> Iterator[QueryStats]:
+    """Collect statements run in this context (and tasks it starts) until the block exits."""
+    stats = QueryStats(keep_statements=keep_statements)
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    collectors = _active.get()
+    if not collectors:
+        return
+    conn.info["query_started_at"] = time.perf_counter()
+    for stats in collectors:
+        stats.count += 1
+        stats.repeats[statement] += 1
+        if stats.keep_statements:
+            stats.statements.append(statement)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    started_at = conn.info.pop("query_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    for stats in _active.get():
+        stats.seconds += elapsed
+
+
+@dataclass
+class RouteQueryMetrics:
+    """Per-route distribution of statements and database time per request."""
+
+    requests: int = 0
+    repeated_statement_warnings: int = 0
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERY_COUNT_BUCKETS))
+    db_seconds: Histogram = field(default_factory=Histogram)
+
+
+class QueryMetrics:
+    """Query metrics for every route, keyed by ``"METHOD /path/{template}"``."""
+
+    def __init__(self):
+        self.routes: dict[str, RouteQueryMetrics] = {}
+
+    def record(self, route: str, stats: QueryStats, repeated: bool) -> None:
+        metrics = self.routes.setdefault(route, RouteQueryMetrics())
+        metrics.requests += 1
+        metrics.repeated_statement_warnings += repeated
+        metrics.queries.observe(stats.count)
+        metrics.db_seconds.observe(stats.seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            route: {
+                "requests": m.requests,
+                "repeated_statement_warnings": m.repeated_statement_warnings,
+                "queries": m.queries.snapshot(),
+                "db_seconds": m.db_seconds.snapshot(),
+            }
+            for route, m in sorted(self.routes.items())
+        }
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+    def collect(self) -> Iterable[MetricFamily]:
+        """Per-route families for the ``/metrics`` exposition."""
+        queries = MetricFamily("db_queries_per_request", "histogram", "SQL statements per request.")
+        seconds = MetricFamily("db_seconds_per_request", "histogram", "Database time per request.")
+        warnings = MetricFamily(
+            "db_repeated_statement_warnings_total", "counter", "Requests flagged as a likely N+1 query."
+        )
+        for key, m in self.routes.items():
+            method, route = key.split(" ", 1)
+            labels = {"method": method, "route": route}
+            queries.samples.extend(m.queries.samples(labels))
+            seconds.samples.extend(m.db_seconds.samples(labels))
+            warnings.samples.append(("", labels, m.repeated_statement_warnings))
+        return queries, seconds, warnings
+
+
+query_metrics = QueryMetrics()
+registry.register(query_metrics.collect)
+
+
+class QueryStatsMiddleware:
+    """Counts SQL statements and database time per request.
+
+    Results feed ``query_metrics``; with ``debug_headers`` they are also returned as
+    ``X-DB-Query-Count`` and ``X-DB-Time-Ms``. A statement repeated ``repeat_threshold`` times
+    in one request is logged as a likely N+1 query.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        debug_headers: bool = settings.DEBUG,
+        repeat_threshold: int = settings.QUERY_REPEAT_WARNING_THRESHOLD,
+    ):
+        self.app = app
+        self.debug_headers = debug_headers
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            # Statements run after the response starts (e.g. a dependency's commit) are
+            # missing from the headers but still reach the metrics
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.2f}"
+            await send(message)
+
+        with count_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_headers if self.debug_headers else send)
+            finally:
+                self._record(scope, stats)
+
+    def _record(self, scope: Scope, stats: QueryStats) -> None:
+        route = f"{scope['method']} {route_template(scope)}"
+        top = stats.most_repeated()
+        repeated = top is not None and top[1] >= self.repeat_threshold
+        if repeated:
+            logger.warning("Possible N+1 query in %s: ran %d times: %s", route, top[1], top[0])
+        query_metrics.record(route, stats, repeated)
@@ -0,0 +1,40 @@
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, read_router
+
+
+class ReadYourWritesMiddleware:
+    """Returns a client's read-your-writes deadline after a request commits a write.
+
+    ``get_db`` records the deadline in the request state before the response starts. It is sent
+    as the ``X-Primary-Until`` header and as a cookie that expires with it; browsers send the
+    cookie back on their own and other clients echo the header, so any API process can route
+    their reads to the primary until then.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_deadline(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                primary_until = scope.get("state", {}).get("primary_until")
+                if primary_until is not None:
+                    value = f"{primary_until:.3f}"
+                    headers = MutableHeaders(scope=message)
+                    headers.append(READ_YOUR_WRITES_HEADER, value)
+                    headers.append(
+                        "set-cookie",
+                        f"{READ_YOUR_WRITES_COOKIE}={value}; Max-Age={math.ceil(read_router.sticky_seconds)}; "
+                        "Path=/; HttpOnly; SameSite=Lax",
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_deadline)
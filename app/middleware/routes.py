@@ -0,0 +1,32 @@
+from collections.abc import Callable
+
+from starlette.routing import Match
+from starlette.types import Scope
+
+# Endpoint -> template for endpoints served by exactly one route (None when ambiguous)
+_templates: dict[Callable, str | None] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that handled a request, e.g. ``/hotels/{hotel_id}/info``.
+
+    Keeps metric labels bounded: unmatched paths are reported as ``unmatched``. Call it after
+    the app has handled the request; the router then has put the endpoint in the scope and the
+    template is a dict lookup instead of matching every route again.
+    """
+    app = scope.get("app")
+    routes = getattr(app, "routes", ())
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        if endpoint not in _templates:
+            paths = {getattr(route, "path", None) for route in routes if getattr(route, "endpoint", None) is endpoint}
+            _templates[endpoint] = paths.pop() if len(paths) == 1 else None
+        template = _templates[endpoint]
+        if template is not None:
+            return template
+
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
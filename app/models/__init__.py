@@ -3,9 +3,11 @@ from app.models.booking import Booking
 from app.models.guest import Guest
 from app.models.hotel import Hotel, HotelContactInfo
 from app.models.hotel_min_price import HotelMinPrice
+from app.models.hotel_min_price_refresh import HotelMinPriceRefresh
 from app.models.inventory import Inventory
 from app.models.room import Room
 from app.models.user import User
+from app.models.webhook_event import WebhookEvent
 
 __all__ = [
     "User",
@@ -16,4 +18,6 @@ __all__ = [
     "Booking",
     "Guest",
     "HotelMinPrice",
+    "HotelMinPriceRefresh",
+    "WebhookEvent",
 ]
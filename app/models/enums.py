@@ -32,3 +32,32 @@ class PaymentStatus(str, enum.Enum):
     PENDING = "PENDING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
+
+
+class WebhookEventStatus(str, enum.Enum):
+    """Processing states of an inbox webhook event."""
+
+    PENDING = "PENDING"
+    PROCESSED = "PROCESSED"
+    FAILED = "FAILED"
+
+
+class HotelSearchSort(str, enum.Enum):
+    """Sort orders for hotel search results."""
+
+    MIN_PRICE = "min_price"
+    ID = "id"
+
+
+class InventoryFormat(str, enum.Enum):
+    """Response layouts for a room's inventory calendar."""
+
+    ROWS = "rows"
+    COLUMNAR = "columnar"
+
+
+class BulkFormat(str, enum.Enum):
+    """Line-oriented file formats for bulk import and export."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
@@ -7,6 +7,7 @@ from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.city import city_key_default
 
 if TYPE_CHECKING:
     from app.models.room import Room
@@ -30,6 +31,8 @@ class Hotel(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     city: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    # Canonical form of ``city`` used for search lookups
+    city_key: Mapped[str | None] = mapped_column(String(255), nullable=True, default=city_key_default)
     photos: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
     amenities: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
 
@@ -2,10 +2,11 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String, UniqueConstraint
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.city import city_key_default
 
 if TYPE_CHECKING:
     from app.models.hotel import Hotel
@@ -15,12 +16,27 @@ class HotelMinPrice(Base):
     """Tracks minimum room price for a hotel by date for search optimization."""
 
     __tablename__ = "hotel_min_price"
-    __table_args__ = (UniqueConstraint("hotel_id", "date", name="unique_hotel_date"),)
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "date", name="unique_hotel_date"),
+        # Hotel search: exact city key, date range and capacity, answered from the index alone
+        Index(
+            "ix_hotel_min_price_search",
+            "city_key",
+            "date",
+            "available_count",
+            postgresql_include=["hotel_id", "price"],
+        ),
+        # Fuzzy "contains" search: trigram GIN index on city_key, created by migration since it needs pg_trgm
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Cheapest open room type with at least one room free; multi-room searches re-price from inventory
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     city: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    city_key: Mapped[str] = mapped_column(String(255), nullable=False, default=city_key_default)
+    # Most rooms of a single open room type still sellable on this date
+    available_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
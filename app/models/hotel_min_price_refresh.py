@@ -0,0 +1,25 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class HotelMinPriceRefresh(Base):
+    """Queued search summary refresh for one hotel and date range.
+
+    Booking transactions append a row instead of rewriting ``hotel_min_price`` themselves, so
+    bookings of different rooms in one hotel never wait on the hotel's summary rows. The table
+    has no unique key for the same reason: inserts never conflict, duplicates are merged by the
+    job that drains it.
+    """
+
+    __tablename__ = "hotel_min_price_refresh"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    hotel_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -2,10 +2,24 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.city import city_key_default
 
 if TYPE_CHECKING:
     from app.models.hotel import Hotel
@@ -16,7 +30,27 @@ class Inventory(Base):
     """Inventory entity tracking room availability and pricing by date."""
 
     __tablename__ = "inventory"
-    __table_args__ = (UniqueConstraint("hotel_id", "room_id", "date", name="unique_hotel_room_date"),)
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "room_id", "date", name="unique_hotel_room_date"),
+        # Reservation, release and per-room listing: room_id = ? AND date BETWEEN ? AND ?
+        Index(
+            "ix_inventory_room_date",
+            "room_id",
+            "date",
+            postgresql_include=["total_count", "book_count", "reserved_count", "closed", "price"],
+        ),
+        # Search summary refresh and hotel reports: hotel_id = ? AND date BETWEEN ? AND ?
+        Index(
+            "ix_inventory_hotel_date",
+            "hotel_id",
+            "date",
+            postgresql_include=["total_count", "book_count", "reserved_count", "closed", "price", "city", "city_key"],
+        ),
+        # Change feed: hotel_id = ? AND (change_xid, id) > (?, ?) ORDER BY change_xid, id
+        Index("ix_inventory_hotel_change", "hotel_id", "change_xid", "id"),
+        # Availability engine catch-up: change_xid >= ?
+        Index("ix_inventory_change_xid", "change_xid"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
@@ -26,11 +60,21 @@ class Inventory(Base):
     surge_factor: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=1.0, nullable=False)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     city: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    city_key: Mapped[str] = mapped_column(String(255), nullable=False, default=city_key_default)
     closed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Set by the database clock (UTC) so every writer, bulk COPY included, agrees on the time
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime,
+        server_default=text("timezone('utc', clock_timestamp())"),
+        onupdate=func.timezone("utc", func.clock_timestamp()),
+        nullable=False,
+    )
+    # Id of the transaction that last wrote the row; the change feed only reads past ids of
+    # transactions that have all finished, so it cannot skip a slow commit
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, server_default=text("txid_current()"), onupdate=func.txid_current(), nullable=False
     )
 
     # Foreign keys
@@ -0,0 +1,25 @@
+# Payments package
+from app.payments.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.payments.gateway import (
+    CheckoutRequest,
+    CheckoutSession,
+    FakePaymentGateway,
+    PaymentGateway,
+    PaymentGatewayError,
+    PaymentGatewayUnavailable,
+    StripePaymentGateway,
+    get_payment_gateway,
+)
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CheckoutRequest",
+    "CheckoutSession",
+    "PaymentGateway",
+    "PaymentGatewayError",
+    "PaymentGatewayUnavailable",
+    "StripePaymentGateway",
+    "FakePaymentGateway",
+    "get_payment_gateway",
+]
@@ -0,0 +1,175 @@
+import asyncio
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache, partial
+
+import stripe
+
+from app.config import get_settings
+from app.payments.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+settings = get_settings()
+
+
+class PaymentGatewayError(Exception):
+    """Payment provider rejected or failed a request.
+
+    ``transient`` errors (timeouts, connection problems, provider outages) count towards
+    opening the circuit breaker; request errors do not.
+    """
+
+    def __init__(self, message: str, transient: bool = False):
+        self.message = message
+        self.transient = transient
+
+
+class PaymentGatewayUnavailable(PaymentGatewayError):
+    """Payment provider timed out or the circuit breaker is open."""
+
+    def __init__(self, message: str):
+        super().__init__(message, transient=True)
+
+
+@dataclass
+class CheckoutSession:
+    """Provider checkout session the guest is redirected to."""
+
+    id: str
+    url: str
+
+
+@dataclass
+class CheckoutRequest:
+    """Provider-agnostic description of a checkout."""
+
+    booking_id: int
+    amount: Decimal
+    name: str
+    description: str
+    success_url: str
+    cancel_url: str
+    # When the provider should stop accepting payment for this checkout (timezone-aware)
+    expires_at: datetime | None = None
+
+
+class PaymentGateway(ABC):
+    """Async payment provider client with a per-call timeout and a circuit breaker."""
+
+    def __init__(self, timeout_seconds: float, breaker: CircuitBreaker):
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker
+
+    async def create_checkout_session(self, request: CheckoutRequest) -> CheckoutSession:
+        """Create a checkout session, failing fast while the provider is unhealthy."""
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            raise PaymentGatewayUnavailable("Payment provider is temporarily unavailable")
+
+        try:
+            session = await asyncio.wait_for(self._create_checkout_session(request), self.timeout_seconds)
+        except TimeoutError:
+            self.breaker.record_failure()
+            raise PaymentGatewayUnavailable("Payment provider timed out")
+        except PaymentGatewayError as e:
+            if e.transient:
+                self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return session
+
+    @abstractmethod
+    async def _create_checkout_session(self, request: CheckoutRequest) -> CheckoutSession:
+        """Call the provider; raise ``PaymentGatewayError`` (``transient`` for retryable failures)."""
+
+
+class StripePaymentGateway(PaymentGateway):
+    """Stripe gateway running the blocking SDK on a bounded worker pool."""
+
+    TRANSIENT_ERRORS = (stripe.error.APIConnectionError, stripe.error.APIError, stripe.error.RateLimitError)
+    # Stripe accepts checkout expiries between 30 minutes and 24 hours after creation
+    MIN_EXPIRY = timedelta(minutes=30)
+    MAX_EXPIRY = timedelta(hours=24)
+
+    def __init__(self, api_key: str, timeout_seconds: float, max_workers: int, breaker: CircuitBreaker):
+        super().__init__(timeout_seconds, breaker)
+        stripe.api_key = api_key
+        # The SDK's own timeout stops worker threads from piling up behind a hung connection
+        stripe.default_http_client = stripe.new_default_http_client(timeout=timeout_seconds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="payment-gateway")
+
+    async def _create_checkout_session(self, request: CheckoutRequest) -> CheckoutSession:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self._create_sync, request))
+
+    def _create_sync(self, request: CheckoutRequest) -> CheckoutSession:
+        options = {}
+        if request.expires_at is not None:
+            now = datetime.now(UTC)
+            expires_at = min(max(request.expires_at, now + self.MIN_EXPIRY), now + self.MAX_EXPIRY)
+            options["expires_at"] = int(expires_at.timestamp())
+        try:
+            checkout_session = stripe.checkout.Session.create(
+                payment_method_types=["card"],
+                line_items=[
+                    {
+                        "price_data": {
+                            "currency": "usd",
+                            "product_data": {"name": request.name, "description": request.description},
+                            "unit_amount": int(request.amount * 100),  # Convert to cents
+                        },
+                        "quantity": 1,
+                    }
+                ],
+                mode="payment",
+                success_url=request.success_url,
+                cancel_url=request.cancel_url,
+                metadata={"booking_id": str(request.booking_id)},
+                **options,
+            )
+        except stripe.error.StripeError as e:
+            raise PaymentGatewayError(str(e), transient=isinstance(e, self.TRANSIENT_ERRORS))
+
+        return CheckoutSession(id=checkout_session.id, url=checkout_session.url)
+
+
+class FakePaymentGateway(PaymentGateway):
+    """Local stand-in for tests and load runs; never leaves the process."""
+
+    def __init__(
+        self,
+        timeout_seconds: float = 10.0,
+        breaker: CircuitBreaker | None = None,
+        latency_seconds: float = 0.0,
+        fail_with: PaymentGatewayError | None = None,
+    ):
+        super().__init__(timeout_seconds, breaker or CircuitBreaker(failure_threshold=5, reset_seconds=30))
+        self.latency_seconds = latency_seconds
+        self.fail_with = fail_with
+        self.requests: list[CheckoutRequest] = []
+
+    async def _create_checkout_session(self, request: CheckoutRequest) -> CheckoutSession:
+        self.requests.append(request)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if self.fail_with is not None:
+            raise self.fail_with
+
+        session_id = f"cs_fake_{uuid.uuid4().hex}"
+        return CheckoutSession(id=session_id, url=f"{settings.FRONTEND_URL}/fake-checkout/{session_id}")
+
+
+@lru_cache
+def get_payment_gateway() -> PaymentGateway:
+    """Dependency returning the process-wide payment gateway selected by ``PAYMENT_PROVIDER``."""
+    breaker = CircuitBreaker(settings.PAYMENT_CIRCUIT_FAILURE_THRESHOLD, settings.PAYMENT_CIRCUIT_RESET_SECONDS)
+    if settings.PAYMENT_PROVIDER == "fake":
+        return FakePaymentGateway(settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS, breaker)
+    return StripePaymentGateway(
+        settings.STRIPE_API_KEY, settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS, settings.PAYMENT_GATEWAY_WORKERS, breaker
+    )
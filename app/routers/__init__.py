@@ -3,6 +3,7 @@ from app.routers.auth import router as auth_router
 from app.routers.bookings import router as bookings_router
 from app.routers.browse import router as browse_router
 from app.routers.hotels import router as hotels_router
+from app.routers.internal import router as internal_router
 from app.routers.inventory import router as inventory_router
 from app.routers.rooms import router as rooms_router
 from app.routers.users import router as users_router
@@ -17,4 +18,5 @@ __all__ = [
     "users_router",
     "browse_router",
     "webhooks_router",
+    "internal_router",
 ]
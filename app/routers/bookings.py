@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_primary_read_db
 from app.models.user import User
+from app.payments.gateway import PaymentGateway, get_payment_gateway
 from app.schemas.booking import BookingCreate, BookingPaymentResponse, BookingResponse, BookingStatusResponse
 from app.security.dependencies import get_current_user
 from app.services.booking_service import BookingService
@@ -34,10 +35,13 @@ async def add_guests_to_booking(
 
 @router.post("/{booking_id}/payments", response_model=BookingPaymentResponse)
 async def initiate_payment(
-    booking_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    booking_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    gateway: PaymentGateway = Depends(get_payment_gateway),
 ):
     """Initiate payment for a booking using Stripe."""
-    service = CheckoutService(db)
+    service = CheckoutService(db, gateway)
     session_url = await service.create_checkout_session(booking_id, current_user)
     return BookingPaymentResponse(session_url=session_url)
 
@@ -53,7 +57,7 @@ async def cancel_booking(
 
 @router.get("/{booking_id}/status", response_model=BookingStatusResponse)
 async def get_booking_status(
-    booking_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    booking_id: int, db: AsyncSession = Depends(get_primary_read_db), current_user: User = Depends(get_current_user)
 ):
     """Check the status of a booking."""
     service = BookingService(db)
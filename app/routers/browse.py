@@ -1,87 +1,72 @@
 from datetime import date
-from decimal import Decimal
 
-from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy import and_, func, select
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_read_db
+from app.models.enums import HotelSearchSort
 from app.models.hotel import Hotel
-from app.models.inventory import Inventory
-from app.schemas.hotel import HotelInfoResponse
+from app.schemas.hotel import HotelInfoResponse, HotelSearchResult
+from app.services.search_service import SearchService
+from app.utils.fast_json import FastJSONResponse, RowSerializer
+from app.utils.single_flight import single_flight
 
-router = APIRouter(prefix="/hotels", tags=["Hotel Browse"])
-
-
-class HotelSearchResult(BaseModel):
-    """Hotel search result with pricing."""
+settings = get_settings()
 
-    model_config = ConfigDict(from_attributes=True)
+search_result_json = RowSerializer(HotelSearchResult)
 
-    id: int
-    name: str
-    city: str | None = None
-    photos: list[str] | None = None
-    amenities: list[str] | None = None
-    min_price: Decimal | None = None
+router = APIRouter(prefix="/hotels", tags=["Hotel Browse"])
 
 
 @router.get("/search", response_model=list[HotelSearchResult])
 async def search_hotels(
+    response: Response,
     city: str = Query(..., description="City to search hotels in"),
     check_in_date: date = Query(..., description="Check-in date"),
     check_out_date: date = Query(..., description="Check-out date"),
     rooms_count: int = Query(1, description="Number of rooms needed"),
-    db: AsyncSession = Depends(get_db),
+    fuzzy: bool = Query(False, description="Match cities containing the search text instead of exactly"),
+    sort: HotelSearchSort = Query(HotelSearchSort.MIN_PRICE, description="Result order"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: str | None = Query(None, description="Continuation token from X-Next-Cursor"),
+    include_total: bool = Query(False, description="Return an estimated match count in X-Total-Count-Estimate"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Search for available hotels in a city."""
-    # Find hotels with available rooms for the given dates
-    subquery = (
-        select(Inventory.hotel_id, func.min(Inventory.price).label("min_price"))
-        .where(
-            and_(
-                Inventory.city.ilike(f"%{city}%"),
-                Inventory.date >= check_in_date,
-                Inventory.date <= check_out_date,
-                Inventory.closed == False,
-                (Inventory.total_count - Inventory.book_count - Inventory.reserved_count) >= rooms_count,
-            )
-        )
-        .group_by(Inventory.hotel_id)
-        .having(func.count(Inventory.id) >= (check_out_date - check_in_date).days + 1)
-        .subquery()
+    """Search for available hotels in a city, one page at a time."""
+    service = SearchService(db)
+    page = await service.search_hotels(
+        city, check_in_date, check_out_date, rooms_count, fuzzy, sort, limit, cursor, include_total
     )
 
-    result = await db.execute(
-        select(Hotel, subquery.c.min_price).join(subquery, Hotel.id == subquery.c.hotel_id).where(Hotel.active == True)
-    )
-
-    hotels = []
-    for hotel, min_price in result.all():
-        hotels.append(
-            HotelSearchResult(
-                id=hotel.id,
-                name=hotel.name,
-                city=hotel.city,
-                photos=hotel.photos,
-                amenities=hotel.amenities,
-                min_price=min_price,
-            )
-        )
-
-    return hotels
+    headers = {}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if page.total_estimate is not None:
+        headers["X-Total-Count-Estimate"] = str(page.total_estimate)
+    if settings.FAST_JSON_RESPONSES:
+        # Items are already validated models (possibly shared from the cache); skip revalidation
+        return FastJSONResponse(search_result_json.dumps_objects(page.items), headers=headers)
+    response.headers.update(headers)
+    return page.items
 
 
 @router.get("/{hotel_id}/info", response_model=HotelInfoResponse)
-async def get_hotel_info(hotel_id: int, db: AsyncSession = Depends(get_db)):
+async def get_hotel_info(hotel_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get public information about a hotel."""
-    result = await db.execute(select(Hotel).where(and_(Hotel.id == hotel_id, Hotel.active == True)))
-    hotel = result.scalar_one_or_none()
 
-    if not hotel:
+    async def load() -> HotelInfoResponse | None:
+        result = await db.execute(select(Hotel).where(and_(Hotel.id == hotel_id, Hotel.active == True)))
+        hotel = result.scalar_one_or_none()
+        return HotelInfoResponse.model_validate(hotel) if hotel else None
+
+    # Concurrent requests for the same hotel share one query
+    info = await single_flight.read(db, ("hotel_info", hotel_id), load)
+
+    if not info:
         from fastapi import HTTPException
 
         raise HTTPException(status_code=404, detail="Hotel not found")
 
-    return HotelInfoResponse.model_validate(hotel)
+    return info
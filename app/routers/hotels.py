@@ -3,7 +3,9 @@ from datetime import date
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_read_db
+from app.models.booking import Booking
 from app.models.enums import Role
 from app.models.user import User
 from app.schemas.booking import BookingResponse, HotelReportResponse
@@ -11,6 +13,11 @@ from app.schemas.hotel import HotelCreate, HotelResponse, HotelUpdate
 from app.security.dependencies import require_role
 from app.services.booking_service import BookingService
 from app.services.hotel_service import HotelService
+from app.utils.fast_json import FastJSONResponse, RowSerializer
+
+settings = get_settings()
+
+booking_json = RowSerializer(BookingResponse)
 
 router = APIRouter(prefix="/admin/hotels", tags=["Hotel Management"])
 
@@ -28,7 +35,7 @@ async def create_hotel(
 
 @router.get("", response_model=list[HotelResponse])
 async def get_all_hotels(
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_role([Role.HOTEL_MANAGER]))
+    db: AsyncSession = Depends(get_read_db), current_user: User = Depends(require_role([Role.HOTEL_MANAGER]))
 ):
     """Get all hotels owned by the current user."""
     service = HotelService(db)
@@ -37,7 +44,9 @@ async def get_all_hotels(
 
 @router.get("/{hotel_id}", response_model=HotelResponse)
 async def get_hotel_by_id(
-    hotel_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(require_role([Role.HOTEL_MANAGER]))
+    hotel_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
 ):
     """Get hotel details by ID."""
     service = HotelService(db)
@@ -76,10 +85,15 @@ async def activate_hotel(
 
 @router.get("/{hotel_id}/bookings", response_model=list[BookingResponse], tags=["Booking Flow"])
 async def get_hotel_bookings(
-    hotel_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(require_role([Role.HOTEL_MANAGER]))
+    hotel_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
 ):
     """Get all bookings for a hotel."""
     service = BookingService(db)
+    if settings.FAST_JSON_RESPONSES:
+        rows = await service.get_all_bookings_by_hotel_id(hotel_id, current_user, columns=booking_json.columns(Booking))
+        return FastJSONResponse(booking_json.dumps(rows))
     return await service.get_all_bookings_by_hotel_id(hotel_id, current_user)
 
 
@@ -88,14 +102,15 @@ async def get_hotel_report(
     hotel_id: int,
     start_date: date | None = None,
     end_date: date | None = None,
-    db: AsyncSession = Depends(get_db),
+    detailed: bool = False,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
 ):
-    """Generate booking report for a hotel."""
+    """Generate booking report for a hotel, optionally with a per-night breakdown."""
     if start_date is None:
         start_date = date.today().replace(day=1)
     if end_date is None:
         end_date = date.today()
 
     service = BookingService(db)
-    return await service.get_hotel_report(hotel_id, start_date, end_date, current_user)
+    return await service.get_hotel_report(hotel_id, start_date, end_date, current_user, detailed)
@@ -0,0 +1,70 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.config import get_settings
+from app.database import pool_stats, read_router
+from app.middleware import query_metrics
+from app.security.dependencies import require_internal_token
+from app.services.availability_engine import availability_engine
+from app.services.search_cache import search_cache
+from app.utils.metrics import registry
+from app.utils.single_flight import single_flight
+
+settings = get_settings()
+
+# Operational endpoints for scrapers and on-call; hidden from the public API schema
+router = APIRouter(tags=["Health"], dependencies=[Depends(require_internal_token)], include_in_schema=False)
+
+
+@router.get("/metrics")
+async def metrics():
+    """Request, service, query and pool metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/health/search-cache")
+async def search_cache_stats():
+    """Hit/miss/eviction counters for the hotel search cache."""
+    return {**asdict(search_cache.stats), "local_entries": len(search_cache.local)}
+
+
+@router.get("/health/single-flight")
+async def single_flight_stats():
+    """Counters for coalesced concurrent reads."""
+    return {"enabled": single_flight.enabled, "in_flight": len(single_flight), **asdict(single_flight.stats)}
+
+
+@router.get("/health/queries")
+async def query_stats():
+    """SQL statements and database time per request, by route."""
+    return query_metrics.snapshot()
+
+
+@router.get("/health/pools")
+async def connection_pool_stats():
+    """Connection pool occupancy, overflow and checkout wait times per engine."""
+    return pool_stats()
+
+
+@router.get("/health/replicas")
+async def replica_stats():
+    """Replica lag and where read-only sessions were routed."""
+    return {
+        "replicas": len(read_router.replicas),
+        "lag_seconds": read_router.lag,
+        "max_lag_seconds": read_router.max_lag_seconds,
+        **asdict(read_router.stats),
+    }
+
+
+@router.get("/health/availability-engine")
+async def availability_engine_stats():
+    """State and usage counters for the in-memory availability engine."""
+    return {
+        "enabled": settings.AVAILABILITY_ENGINE_ENABLED,
+        "ready": availability_engine.ready,
+        "start_date": availability_engine.start_date,
+        **asdict(availability_engine.stats),
+    }
@@ -1,29 +1,55 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.enums import Role
+from app.config import get_settings
+from app.database import get_db, get_primary_read_db, get_read_db, get_read_session_factory
+from app.models.enums import BulkFormat, InventoryFormat, Role
+from app.models.inventory import Inventory
 from app.models.user import User
-from app.schemas.inventory import InventoryResponse, InventoryUpdate
+from app.schemas.inventory import (
+    InventoryCalendarResponse,
+    InventoryChangesResponse,
+    InventoryImportResult,
+    InventoryResponse,
+    InventoryUpdate,
+)
 from app.security.dependencies import require_role
 from app.services.inventory_service import InventoryService
+from app.utils.bulk_io import MEDIA_TYPES, BulkFormatError, format_for_media_type, read_records
+from app.utils.fast_json import FastJSONResponse, RowSerializer
+
+settings = get_settings()
+
+inventory_json = RowSerializer(InventoryResponse)
 
 router = APIRouter(prefix="/admin/inventory", tags=["Admin Inventory"])
 
 
-@router.get("/rooms/{room_id}", response_model=list[InventoryResponse])
+@router.get("/rooms/{room_id}", response_model=list[InventoryResponse] | InventoryCalendarResponse)
 async def get_room_inventory(
     room_id: int,
     start_date: date | None = Query(None),
     end_date: date | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    response_format: InventoryFormat = Query(
+        InventoryFormat.ROWS, alias="format", description="One object per day, or parallel per-day arrays"
+    ),
+    rle: bool = Query(False, description="Run-length encode the columnar arrays"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
 ):
     """Get inventory for a room."""
     service = InventoryService(db)
-    return await service.get_inventory_by_room(room_id, current_user, start_date, end_date)
+    if settings.FAST_JSON_RESPONSES and response_format == InventoryFormat.ROWS:
+        rows = await service.get_inventory_by_room(
+            room_id, current_user, start_date, end_date, columns=inventory_json.columns(Inventory)
+        )
+        return FastJSONResponse(inventory_json.dumps(rows))
+    return await service.get_inventory_by_room(
+        room_id, current_user, start_date, end_date, format=response_format, rle=rle
+    )
 
 
 @router.patch("/rooms/{room_id}", response_model=list[InventoryResponse])
@@ -38,3 +64,63 @@ async def update_room_inventory(
     """Update inventory for a room within a date range."""
     service = InventoryService(db)
     return await service.update_inventory(room_id, update_data, current_user, start_date, end_date)
+
+
+@router.post("/import", response_model=InventoryImportResult)
+async def import_inventory(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
+):
+    """Bulk-update inventory from a streamed CSV (``text/csv``) or NDJSON (``application/x-ndjson``) body.
+
+    Each row is ``room_id, date`` and any of ``price, total_count, closed``; omitted values are
+    left unchanged.
+    """
+    file_format = format_for_media_type(request.headers.get("content-type"))
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Send text/csv or application/x-ndjson"
+        )
+    service = InventoryService(db)
+    try:
+        return await service.import_inventory(current_user, read_records(request.stream(), file_format))
+    except BulkFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+
+@router.get("/export")
+async def export_inventory(
+    hotel_id: int | None = Query(None, description="Limit to one hotel; defaults to all your hotels"),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    file_format: BulkFormat = Query(BulkFormat.CSV, alias="format"),
+    db: AsyncSession = Depends(get_read_db),
+    sessions=Depends(get_read_session_factory),
+    current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
+):
+    """Stream inventory as CSV or NDJSON in the import format, ordered by room and date."""
+    room_ids = await InventoryService(db).get_owned_room_ids(current_user, hotel_id)
+
+    async def body():
+        async with sessions() as session:
+            async for chunk in InventoryService(session).export_inventory(room_ids, file_format, start_date, end_date):
+                yield chunk
+
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[file_format])
+
+
+@router.get("/changes", response_model=InventoryChangesResponse)
+async def get_inventory_changes(
+    cursor: str | None = Query(None, description="Cursor from the previous page; omit to start from the beginning"),
+    limit: int = Query(500, ge=1, le=5000),
+    hotel_id: int | None = Query(None, description="Limit to one hotel; defaults to all your hotels"),
+    db: AsyncSession = Depends(get_primary_read_db),
+    current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
+):
+    """Inventory rows changed since ``cursor``, for mirroring availability incrementally.
+
+    Read from the primary, since a lagging replica could skip rows behind the cursor.
+    """
+    service = InventoryService(db)
+    return await service.get_inventory_changes(current_user, cursor, limit, hotel_id)
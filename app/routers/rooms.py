@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.enums import Role
 from app.models.user import User
 from app.schemas.room import RoomCreate, RoomResponse, RoomUpdate
@@ -25,7 +25,9 @@ async def create_room(
 
 @router.get("", response_model=list[RoomResponse])
 async def get_all_rooms(
-    hotel_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(require_role([Role.HOTEL_MANAGER]))
+    hotel_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
 ):
     """Get all rooms for a hotel."""
     service = RoomService(db)
@@ -36,7 +38,7 @@ async def get_all_rooms(
 async def get_room_by_id(
     hotel_id: int,
     room_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([Role.HOTEL_MANAGER])),
 ):
     """Get room details."""
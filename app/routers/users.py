@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_read_db
+from app.models.booking import Booking
 from app.models.user import User
 from app.schemas.booking import BookingResponse
 from app.schemas.guest import GuestCreate, GuestResponse, GuestUpdate
@@ -10,12 +12,17 @@ from app.security.dependencies import get_current_user
 from app.services.booking_service import BookingService
 from app.services.guest_service import GuestService
 from app.services.user_service import UserService
+from app.utils.fast_json import FastJSONResponse, RowSerializer
+
+settings = get_settings()
+
+booking_json = RowSerializer(BookingResponse)
 
 router = APIRouter(prefix="/users", tags=["User Profile"])
 
 
 @router.get("/profile", response_model=UserResponse)
-async def get_profile(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_profile(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_read_db)):
     """Get current user's profile."""
     service = UserService(db)
     return await service.get_profile(current_user)
@@ -31,15 +38,18 @@ async def update_profile(
 
 
 @router.get("/myBookings", response_model=list[BookingResponse])
-async def get_my_bookings(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_my_bookings(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_read_db)):
     """Get all bookings for the current user."""
     service = BookingService(db)
+    if settings.FAST_JSON_RESPONSES:
+        rows = await service.get_user_bookings(current_user, columns=booking_json.columns(Booking))
+        return FastJSONResponse(booking_json.dumps(rows))
     return await service.get_user_bookings(current_user)
 
 
 # Guest management endpoints
 @router.get("/guests", response_model=list[GuestResponse], tags=["Booking Guests"])
-async def get_guests(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_guests(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_read_db)):
     """Get all saved guests for the current user."""
     service = GuestService(db)
     return await service.get_all_guests(current_user)
@@ -9,7 +9,7 @@ router = APIRouter(prefix="/webhook", tags=["Webhook"])
 
 @router.post("/payment")
 async def payment_webhook(request: Request, db: AsyncSession = Depends(get_db)):
-    """Handle Stripe payment webhooks."""
+    """Acknowledge Stripe payment webhooks; they are processed from the inbox."""
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature", "")
 
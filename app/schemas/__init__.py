@@ -4,11 +4,20 @@ from app.schemas.booking import (
     BookingPaymentResponse,
     BookingResponse,
     BookingStatusResponse,
+    HotelReportDay,
     HotelReportResponse,
 )
 from app.schemas.common import APIResponse
 from app.schemas.guest import GuestCreate, GuestResponse, GuestUpdate
-from app.schemas.hotel import HotelContactInfoSchema, HotelCreate, HotelInfoResponse, HotelResponse, HotelUpdate
+from app.schemas.hotel import (
+    HotelContactInfoSchema,
+    HotelCreate,
+    HotelInfoResponse,
+    HotelResponse,
+    HotelSearchPage,
+    HotelSearchResult,
+    HotelUpdate,
+)
 from app.schemas.inventory import InventoryResponse, InventoryUpdate
 from app.schemas.room import RoomCreate, RoomResponse, RoomUpdate
 from app.schemas.user import LoginResponse, ProfileUpdate, TokenData, UserCreate, UserLogin, UserResponse
@@ -25,6 +34,8 @@ __all__ = [
     "HotelResponse",
     "HotelInfoResponse",
     "HotelContactInfoSchema",
+    "HotelSearchResult",
+    "HotelSearchPage",
     "RoomCreate",
     "RoomUpdate",
     "RoomResponse",
@@ -32,6 +43,7 @@ __all__ = [
     "BookingResponse",
     "BookingStatusResponse",
     "BookingPaymentResponse",
+    "HotelReportDay",
     "HotelReportResponse",
     "InventoryResponse",
     "InventoryUpdate",
@@ -66,6 +66,16 @@ class BookingPaymentResponse(BaseModel):
     session_url: str
 
 
+class HotelReportDay(BaseModel):
+    """Per-night figures for a detailed hotel report."""
+
+    date: date
+    revenue: Decimal
+    room_nights_sold: int
+    room_nights_total: int
+    occupancy_rate: float
+
+
 class HotelReportResponse(BaseModel):
     """Response for hotel booking report."""
 
@@ -74,3 +84,4 @@ class HotelReportResponse(BaseModel):
     total_revenue: Decimal
     start_date: date
     end_date: date
+    daily: list[HotelReportDay] | None = None
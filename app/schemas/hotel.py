@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
@@ -63,3 +64,24 @@ class HotelInfoResponse(BaseModel):
     contact_phone: str | None = None
     contact_email: str | None = None
     contact_address: str | None = None
+
+
+class HotelSearchResult(BaseModel):
+    """Hotel search result with pricing."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    city: str | None = None
+    photos: list[str] | None = None
+    amenities: list[str] | None = None
+    min_price: Decimal | None = None
+
+
+class HotelSearchPage(BaseModel):
+    """One page of hotel search results."""
+
+    items: list[HotelSearchResult]
+    next_cursor: str | None = None
+    total_estimate: int | None = None
@@ -1,7 +1,8 @@
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
+from typing import Annotated
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class InventoryResponse(BaseModel):
@@ -22,6 +23,51 @@ class InventoryResponse(BaseModel):
     closed: bool
 
 
+class InventoryChange(InventoryResponse):
+    """An inventory row as of its last update."""
+
+    updated_at: datetime
+
+
+class InventoryChangesResponse(BaseModel):
+    """One page of the inventory change feed.
+
+    Pass ``cursor`` back to continue after these rows; it is unchanged when nothing new has
+    settled, so clients can keep polling with the last cursor they received.
+    """
+
+    items: list[InventoryChange]
+    cursor: str | None = None
+    has_more: bool = False
+
+
+class ColumnRuns(BaseModel):
+    """Run-length encoded column: ``values[i]`` repeats ``lengths[i]`` times."""
+
+    values: list
+    lengths: list[int]
+
+
+class InventoryCalendarResponse(BaseModel):
+    """Room inventory as parallel per-day arrays instead of one object per day.
+
+    Day ``i`` is ``start_date + date_offsets[i]``; ``date_offsets`` is null when the days are
+    consecutive. With run-length encoding each value column is a ``ColumnRuns``.
+    """
+
+    room_id: int
+    hotel_id: int
+    start_date: date | None
+    days: int
+    date_offsets: list[int] | None = None
+    price: list[Decimal] | ColumnRuns
+    surge_factor: list[Decimal] | ColumnRuns
+    book_count: list[int] | ColumnRuns
+    reserved_count: list[int] | ColumnRuns
+    total_count: list[int] | ColumnRuns
+    closed: list[bool] | ColumnRuns
+
+
 class InventoryUpdate(BaseModel):
     """Schema for updating inventory."""
 
@@ -39,3 +85,22 @@ class InventoryBulkUpdate(BaseModel):
     surge_factor: Decimal | None = None
     price: Decimal | None = None
     closed: bool | None = None
+
+
+class InventoryImportRow(BaseModel):
+    """One line of a bulk inventory import; omitted values are left unchanged."""
+
+    # Bounds match the inventory columns, so bad values fail here with their line number
+    room_id: int = Field(gt=0, le=2**31 - 1)
+    date: date
+    price: Annotated[Decimal, Field(ge=0, max_digits=10, decimal_places=2)] | None = None
+    total_count: int | None = Field(None, ge=0, le=2**31 - 1)
+    closed: bool | None = None
+
+
+class InventoryImportResult(BaseModel):
+    """Outcome of a bulk inventory import."""
+
+    rows: int
+    rooms: int
+    updated: int
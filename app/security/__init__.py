@@ -1,14 +1,19 @@
 # Security package
-from app.security.dependencies import get_current_user, require_role
+from app.security.dependencies import get_current_user, require_internal_token, require_role
 from app.security.jwt import create_access_token, create_refresh_token, verify_token
-from app.security.password import hash_password, verify_password
+from app.security.password import hash_password, hash_password_async, verify_password, verify_password_async
+from app.security.principal_cache import principal_cache
 
 __all__ = [
     "verify_password",
     "hash_password",
+    "verify_password_async",
+    "hash_password_async",
     "create_access_token",
     "create_refresh_token",
     "verify_token",
     "get_current_user",
     "require_role",
+    "require_internal_token",
+    "principal_cache",
 ]
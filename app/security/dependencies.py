@@ -1,14 +1,21 @@
+import secrets
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.database import get_db
 from app.models.enums import Role
 from app.models.user import User
 from app.security.jwt import verify_token
+from app.security.principal_cache import principal_cache
+
+settings = get_settings()
 
 security = HTTPBearer()
+internal_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -22,21 +29,28 @@ async def get_current_user(
     )
 
     token = credentials.credentials
-    payload = verify_token(token)
-
+    payload = principal_cache.get_token(token)
     if payload is None:
-        raise credentials_exception
+        payload = verify_token(token)
+        if payload is None:
+            raise credentials_exception
+        principal_cache.set_token(token, payload)
 
     user_id = payload.get("sub")
     if user_id is None:
         raise credentials_exception
 
+    user = await principal_cache.get_user(int(user_id), db)
+    if user is not None:
+        return user
+
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise credentials_exception
 
+    principal_cache.set_user(user)
     return user
 
 
@@ -55,3 +69,20 @@ def require_role(required_roles: list[Role]):
 # Convenience dependencies for common role checks
 get_hotel_manager = require_role([Role.HOTEL_MANAGER])
 get_guest_or_manager = require_role([Role.GUEST, Role.HOTEL_MANAGER])
+
+
+async def require_internal_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(internal_security),
+) -> None:
+    """Dependency guarding operational endpoints with the shared ``INTERNAL_API_TOKEN``.
+
+    The endpoints do not exist (404) while no token is configured.
+    """
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(credentials.credentials, settings.INTERNAL_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,83 @@
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+
+from app.config import get_settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.on_commit import after_commit
+
+settings = get_settings()
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+
+class PrincipalCache:
+    """Per-process cache of verified access tokens and the user rows they resolve to.
+
+    Users are cached as plain column snapshots and re-attached to the request's session
+    without a SELECT, so services can still modify and flush them. Any change to a user made
+    through a session (profile, roles, password; ORM or bulk ``update(User)``) drops the
+    cached row once it commits. Other workers and changes made outside the application keep
+    serving the old row until it expires, at most ``PRINCIPAL_CACHE_TTL_SECONDS`` later.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.tokens = TTLCache(max_size, ttl_seconds)
+        self.users = TTLCache(max_size, ttl_seconds)
+
+    def get_token(self, token: str) -> dict | None:
+        """Return the decoded payload of a previously verified token."""
+        return self.tokens.get(token)
+
+    def set_token(self, token: str, payload: dict) -> None:
+        """Remember a verified token until it (or the cache entry) expires."""
+        exp = payload.get("exp")
+        ttl = exp - time.time() if isinstance(exp, int | float) else None
+        if ttl is None or ttl > 0:
+            self.tokens.set(token, payload, ttl)
+
+    async def get_user(self, user_id: int, db: AsyncSession) -> User | None:
+        """Return the cached user attached to ``db``, or ``None`` on a miss."""
+        snapshot = self.users.get(user_id)
+        if snapshot is None:
+            return None
+
+        user = User(**{key: list(value) if isinstance(value, list) else value for key, value in snapshot.items()})
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    def set_user(self, user: User) -> None:
+        """Cache a snapshot of a loaded user's columns."""
+        snapshot = {key: getattr(user, key) for key in _USER_COLUMNS}
+        snapshot["roles"] = list(snapshot["roles"] or [])
+        self.users.set(user.id, snapshot)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's cached row, e.g. after a profile or role change."""
+        self.users.pop(user_id)
+
+    def clear(self) -> None:
+        """Drop every cached token and user."""
+        self.tokens.clear()
+        self.users.clear()
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAX_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session: Session, flush_context: Any) -> None:
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            after_commit(session, lambda user_id=obj.id: principal_cache.invalidate(user_id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_user_writes(state: ORMExecuteState) -> None:
+    # Bulk UPDATE/DELETE statements do not say which users they touched
+    if (state.is_update or state.is_delete) and any(mapper.class_ is User for mapper in state.all_mappers):
+        after_commit(state.session, principal_cache.users.clear)
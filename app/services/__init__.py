@@ -1,19 +1,33 @@
 # Services package
 from app.services.auth_service import AuthService
+from app.services.availability_engine import AvailabilityEngine, availability_engine
 from app.services.booking_service import BookingService
 from app.services.checkout_service import CheckoutService
 from app.services.guest_service import GuestService
+from app.services.hotel_min_price_service import HotelMinPriceService
 from app.services.hotel_service import HotelService
 from app.services.inventory_service import InventoryService
+from app.services.inventory_writer import InventoryWriter
 from app.services.room_service import RoomService
+from app.services.search_cache import InMemorySearchCacheBackend, SearchCache, SearchCacheBackend, search_cache
+from app.services.search_service import SearchService
 from app.services.user_service import UserService
 
 __all__ = [
     "AuthService",
+    "AvailabilityEngine",
+    "availability_engine",
     "HotelService",
+    "HotelMinPriceService",
     "RoomService",
+    "SearchService",
+    "SearchCache",
+    "SearchCacheBackend",
+    "InMemorySearchCacheBackend",
+    "search_cache",
     "BookingService",
     "InventoryService",
+    "InventoryWriter",
     "UserService",
     "GuestService",
     "CheckoutService",
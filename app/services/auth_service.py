@@ -6,7 +6,7 @@ from app.models.enums import Role
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 from app.security.jwt import create_access_token, create_refresh_token, verify_token
-from app.security.password import hash_password, verify_password
+from app.security.password import hash_password_async, verify_password_async
 
 
 class AuthService:
@@ -25,7 +25,7 @@ class AuthService:
         # Create new user
         user = User(
             email=user_data.email,
-            password=hash_password(user_data.password),
+            password=await hash_password_async(user_data.password),
             name=user_data.name,
             roles=[Role.GUEST.value],
         )
@@ -41,7 +41,7 @@ class AuthService:
         result = await self.db.execute(select(User).where(User.email == login_data.email))
         user = result.scalar_one_or_none()
 
-        if not user or not verify_password(login_data.password, user.password):
+        if not user or not await verify_password_async(login_data.password, user.password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
         access_token = create_access_token(user.id, user.roles)
@@ -0,0 +1,379 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Integer, and_, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models.hotel import Hotel
+from app.models.inventory import Inventory
+from app.models.room import Room
+from app.utils.on_commit import after_commit
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_NO_PRICE = 2**63 - 1
+
+
+@dataclass
+class EngineStats:
+    """Counters describing the engine's state and use."""
+
+    loads: int = 0
+    rooms: int = 0
+    hotels: int = 0
+    days: int = 0
+    searches: int = 0
+    fallbacks: int = 0
+    syncs: int = 0
+    synced_rows: int = 0
+
+
+class AvailabilityEngine:
+    """In-memory room x day matrices of capacity and price for answering hotel search.
+
+    Rows are rooms ordered by ``(city_key, hotel_id, room_id)``, so each city and each hotel is
+    a contiguous block and per-hotel reductions are single ``reduceat`` calls. Columns are days
+    from ``start_date``. Booking and inventory writes made by this worker are applied as deltas
+    once their transaction commits; structural changes (rooms, cities, horizon) mark the engine
+    stale and trigger a background reload, during which search falls back to SQL.
+
+    Every worker holds its own matrices, so before answering, ``sync`` catches up with writes
+    committed by other workers: inventory rows are re-read by ``change_xid`` and a change in
+    the number of rooms or active hotels reloads the engine. A search therefore misses another
+    worker's write for at most ``sync_seconds`` after every transaction older than it has
+    finished. The engine is for browsing only: reservations always re-check availability in
+    the database. Requires NumPy.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        days: int = settings.INVENTORY_HORIZON_DAYS,
+        sync_seconds: float = settings.AVAILABILITY_ENGINE_SYNC_SECONDS,
+    ):
+        self.session_maker = session_maker
+        self.days = days
+        self.sync_seconds = sync_seconds
+        self.ready = False
+        self.start_date: date | None = None
+        self.stats = EngineStats()
+        self._reload: asyncio.Task | None = None
+        self._sync_lock = asyncio.Lock()
+
+    @staticmethod
+    def supported() -> bool:
+        """Whether NumPy is installed."""
+        return np is not None
+
+    async def load(self, start_date: date | None = None) -> None:
+        """Rebuild the matrices from ``inventory`` for ``days`` days from ``start_date`` (today)."""
+        if np is None:
+            raise RuntimeError("The availability engine requires numpy")
+        start_date = start_date or date.today()
+        end_date = start_date + timedelta(days=self.days - 1)
+
+        async with self.session_maker() as db:
+            # Read first: every write below the marker is then visible to the queries that follow
+            synced_xid, structure = await self._read_marker(db)
+            result = await db.execute(
+                select(Room.id, Room.hotel_id, Hotel.city_key, Hotel.active)
+                .join(Hotel, Hotel.id == Room.hotel_id)
+                .order_by(Hotel.city_key, Room.hotel_id, Room.id)
+            )
+            rooms = result.all()
+
+            room_ids = np.array([r.id for r in rooms], dtype=np.int64)
+            room_hotels = np.array([r.hotel_id for r in rooms], dtype=np.int64)
+            n_rooms = len(rooms)
+            # Wide enough for any value the columns accept: counts are ``Integer`` and
+            # ``book_count + reserved_count`` may exceed it; prices are ``Numeric(10, 2)`` in cents
+            total = np.zeros((n_rooms, self.days), dtype=np.int64)
+            used = np.zeros((n_rooms, self.days), dtype=np.int64)
+            # Days without an inventory row are treated as closed
+            closed = np.ones((n_rooms, self.days), dtype=bool)
+            price = np.full((n_rooms, self.days), _NO_PRICE, dtype=np.int64)
+
+            room_order = np.argsort(room_ids)
+            sorted_room_ids = room_ids[room_order]
+
+            stream = await db.stream(
+                select(
+                    Inventory.room_id,
+                    cast(Inventory.date - literal(start_date), Integer),
+                    Inventory.total_count,
+                    cast(Inventory.book_count, BigInteger) + Inventory.reserved_count,
+                    Inventory.closed,
+                    cast(Inventory.price * 100, BigInteger),
+                ).where(and_(Inventory.date >= start_date, Inventory.date <= end_date))
+            )
+            async for chunk in stream.partitions(50_000):
+                if not n_rooms:
+                    continue
+                cols = list(zip(*chunk, strict=True))
+                chunk_room_ids = np.fromiter(cols[0], dtype=np.int64, count=len(chunk))
+                rows = room_order[np.searchsorted(sorted_room_ids, chunk_room_ids)]
+                days = np.fromiter(cols[1], dtype=np.int64, count=len(chunk))
+                total[rows, days] = np.fromiter(cols[2], dtype=np.int64, count=len(chunk))
+                used[rows, days] = np.fromiter(cols[3], dtype=np.int64, count=len(chunk))
+                closed[rows, days] = np.fromiter(cols[4], dtype=bool, count=len(chunk))
+                price[rows, days] = np.fromiter(cols[5], dtype=np.int64, count=len(chunk))
+
+        # Hotel and city blocks over the ordered rows
+        hotel_starts = np.flatnonzero(np.r_[bool(n_rooms), room_hotels[1:] != room_hotels[:-1]])
+        hotel_ids = room_hotels[hotel_starts]
+        hotel_active = np.array([rooms[i].active for i in hotel_starts], dtype=bool)
+        city_blocks: dict[str, tuple[int, int]] = {}
+        for h, row in enumerate(hotel_starts):
+            key = rooms[row].city_key or ""
+            first, _ = city_blocks.get(key, (h, h))
+            city_blocks[key] = (first, h + 1)
+
+        # Swap everything in at once so concurrent searches never see a half-built engine
+        self._room_row = {int(room_id): row for row, room_id in enumerate(room_ids)}
+        self._room_city = [r.city_key or "" for r in rooms]
+        self._hotel_pos = {int(hotel_id): h for h, hotel_id in enumerate(hotel_ids)}
+        self._hotel_ids = hotel_ids
+        self._hotel_starts = hotel_starts
+        self._hotel_active = hotel_active
+        self._city_blocks = city_blocks
+        self._n_rooms = n_rooms
+        self._total, self._used, self._closed, self._price = total, used, closed, price
+        self.start_date = start_date
+        self._synced_xid, self._structure = synced_xid, structure
+        self._synced_at = time.monotonic()
+        self.ready = True
+
+        self.stats.loads += 1
+        self.stats.rooms = n_rooms
+        self.stats.hotels = len(hotel_ids)
+        self.stats.days = self.days
+
+    def search(
+        self, city_key: str, fuzzy: bool, check_in_date: date, check_out_date: date, rooms_count: int
+    ) -> list[tuple[int, Decimal]] | None:
+        """Return ``(hotel_id, min_price)`` for active hotels with ``rooms_count`` rooms of one
+        type free on every night in ``[check_in_date, check_out_date]``.
+
+        Matches the semantics of the ``hotel_min_price`` search. Returns ``None`` when the engine
+        cannot answer (not loaded, or dates outside its window) and the caller should use SQL.
+        """
+        if not self.ready:
+            self.stats.fallbacks += 1
+            return None
+        first = (check_in_date - self.start_date).days
+        last = (check_out_date - self.start_date).days
+        if first < 0 or last >= self.days or last < first:
+            self.stats.fallbacks += 1
+            return None
+
+        self.stats.searches += 1
+        if fuzzy:
+            blocks = [block for key, block in self._city_blocks.items() if city_key in key]
+        else:
+            blocks = [self._city_blocks[city_key]] if city_key in self._city_blocks else []
+
+        matches: list[tuple[int, Decimal]] = []
+        for h0, h1 in blocks:
+            r0 = self._hotel_starts[h0]
+            r1 = self._hotel_starts[h1] if h1 < len(self._hotel_starts) else self._n_rooms
+            window = np.s_[r0:r1, first : last + 1]
+            free = np.where(self._closed[window], 0, self._total[window] - self._used[window])
+            starts = self._hotel_starts[h0:h1] - r0
+
+            # Best single room type per hotel and night must fit the whole party on every night
+            fits = (np.maximum.reduceat(free, starts, axis=0) >= rooms_count).all(axis=1)
+            fits &= self._hotel_active[h0:h1]
+            if not fits.any():
+                continue
+
+            # Price only the room types that can hold the whole party
+            prices = np.where(free >= max(rooms_count, 1), self._price[window], _NO_PRICE)
+            min_prices = np.minimum.reduceat(prices, starts, axis=0).min(axis=1)
+            for h in np.flatnonzero(fits):
+                matches.append((int(self._hotel_ids[h0 + h]), Decimal(int(min_prices[h])).scaleb(-2)))
+        return matches
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Apply writes other workers committed since the last load or sync, through ``db``.
+
+        Runs at most once every ``sync_seconds``; concurrent callers wait for the sync in
+        progress. Inventory rows are re-read from the snapshot xmin recorded last time, so a
+        commit is picked up once every transaction older than it has finished, and re-reading
+        rows this worker already applied is harmless because values are overwritten, not added.
+        Unknown rooms, moved hotels and a changed number of rooms or active hotels reload the
+        engine instead.
+        """
+        if not self._sync_due():
+            return
+        async with self._sync_lock:
+            if not self._sync_due():
+                return
+            started, loads = time.monotonic(), self.stats.loads
+            # A savepoint keeps a failed read from aborting the caller's transaction
+            async with db.begin_nested():
+                synced_xid, structure = await self._read_marker(db)
+                if structure != self._structure:
+                    self.invalidate()
+                    return
+
+                end_date = self.start_date + timedelta(days=self.days - 1)
+                result = await db.execute(
+                    select(
+                        Inventory.room_id,
+                        Inventory.city_key,
+                        cast(Inventory.date - literal(self.start_date), Integer),
+                        Inventory.total_count,
+                        cast(Inventory.book_count, BigInteger) + Inventory.reserved_count,
+                        Inventory.closed,
+                        cast(Inventory.price * 100, BigInteger),
+                    ).where(
+                        Inventory.change_xid >= self._synced_xid,
+                        Inventory.date >= self.start_date,
+                        Inventory.date <= end_date,
+                    )
+                )
+                rows = result.all()
+            if self.stats.loads != loads or not self.ready:
+                # A reload swapped the matrices meanwhile and already covers these rows
+                return
+            for room_id, city_key, day, total, used, closed, price in rows:
+                row = self._room_row.get(room_id)
+                if row is None or self._room_city[row] != (city_key or ""):
+                    self.invalidate()
+                    return
+                self._total[row, day] = total
+                self._used[row, day] = used
+                self._closed[row, day] = closed
+                self._price[row, day] = price
+
+            self._synced_xid, self._synced_at = synced_xid, started
+            self.stats.syncs += 1
+            self.stats.synced_rows += len(rows)
+
+    def record_used(self, db: AsyncSession, room_id: int, start: date, end: date, delta: int) -> None:
+        """Add ``delta`` booked/reserved rooms to a room's nights once ``db`` commits."""
+        after_commit(db, lambda: self._apply(room_id, start, end, used_delta=delta))
+
+    def record_inventory(
+        self,
+        db: AsyncSession,
+        room_id: int,
+        start: date,
+        end: date,
+        total_count: int | None = None,
+        closed: bool | None = None,
+        price: Decimal | None = None,
+    ) -> None:
+        """Overwrite a room's inventory values for a date range once ``db`` commits."""
+        after_commit(db, lambda: self._apply(room_id, start, end, total=total_count, closed=closed, price=price))
+
+    def record_hotel_active(self, db: AsyncSession, hotel_id: int, active: bool) -> None:
+        """Update a hotel's listing status once ``db`` commits."""
+
+        def apply() -> None:
+            if self.ready and hotel_id in self._hotel_pos:
+                pos = self._hotel_pos[hotel_id]
+                if self._hotel_active[pos] != active:
+                    # Keep ``sync`` from reloading for this worker's own change
+                    rooms, active_hotels = self._structure
+                    self._structure = (rooms, active_hotels + (1 if active else -1))
+                self._hotel_active[pos] = active
+
+        after_commit(db, apply)
+
+    def record_structure_change(self, db: AsyncSession) -> None:
+        """Schedule a full reload once ``db`` commits, e.g. after rooms or cities change."""
+        after_commit(db, self.invalidate)
+
+    def invalidate(self) -> None:
+        """Stop answering searches and reload in the background."""
+        if not self.ready:
+            return
+        self.ready = False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._reload is None or self._reload.done():
+            self._reload = loop.create_task(self._reload_quietly())
+
+    async def verify(self) -> int:
+        """Compare the matrices with ``inventory`` and return the number of mismatching cells."""
+        if not self.ready:
+            raise RuntimeError("The availability engine is not loaded")
+        snapshot = (self._total, self._used, self._closed, self._price, self._room_row, self.start_date)
+        reference = AvailabilityEngine(self.session_maker, self.days)
+        await reference.load(self.start_date)
+
+        total, used, closed, price, room_row, _ = snapshot
+        if room_row != reference._room_row:
+            return -1
+        mismatched = closed != reference._closed
+        open_cells = ~reference._closed
+        mismatched |= open_cells & (
+            (total != reference._total) | (used != reference._used) | (price != reference._price)
+        )
+        return int(mismatched.sum())
+
+    def _apply(
+        self,
+        room_id: int,
+        start: date,
+        end: date,
+        used_delta: int = 0,
+        total: int | None = None,
+        closed: bool | None = None,
+        price: Decimal | None = None,
+    ) -> None:
+        if not self.ready or room_id not in self._room_row:
+            return
+        first = max((start - self.start_date).days, 0)
+        last = min((end - self.start_date).days, self.days - 1)
+        if last < first:
+            return
+        cells = np.s_[self._room_row[room_id], first : last + 1]
+        if used_delta:
+            self._used[cells] += used_delta
+        if total is not None:
+            self._total[cells] = total
+        if closed is not None:
+            self._closed[cells] = closed
+        if price is not None:
+            self._price[cells] = int(Decimal(price).scaleb(2))
+
+    def _sync_due(self) -> bool:
+        return self.ready and time.monotonic() - self._synced_at >= self.sync_seconds
+
+    @staticmethod
+    async def _read_marker(db: AsyncSession) -> tuple[int, tuple[int, int]]:
+        """The current snapshot's xmin and the number of rooms and active hotels."""
+        result = await db.execute(
+            select(
+                func.txid_snapshot_xmin(func.txid_current_snapshot()),
+                select(func.count()).select_from(Room).scalar_subquery(),
+                select(func.count()).select_from(Hotel).where(Hotel.active == True).scalar_subquery(),
+            )
+        )
+        xmin, rooms, active_hotels = result.one()
+        return xmin, (rooms, active_hotels)
+
+    async def _reload_quietly(self) -> None:
+        try:
+            await self.load()
+        except Exception:
+            logger.exception("Availability engine reload failed")
+
+
+availability_engine = AvailabilityEngine()
@@ -1,7 +1,9 @@
-from datetime import date
+from collections.abc import Sequence
+from datetime import date, datetime
+from decimal import Decimal
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, select, update
+from sqlalchemy import Numeric, Row, and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -12,9 +14,15 @@ from app.models.hotel import Hotel
 from app.models.inventory import Inventory
 from app.models.room import Room
 from app.models.user import User
-from app.schemas.booking import BookingCreate, BookingResponse, HotelReportResponse
+from app.schemas.booking import BookingCreate, BookingResponse, HotelReportDay, HotelReportResponse
+from app.services.availability_engine import availability_engine
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.search_cache import search_cache
+from app.utils.metrics import instrument
+from app.utils.single_flight import single_flight
 
 
+@instrument
 class BookingService:
     """Service for booking operations."""
 
@@ -23,28 +31,33 @@ class BookingService:
 
     async def initialise_booking(self, booking_data: BookingCreate, user: User) -> BookingResponse:
         """Initialize a new booking reservation."""
+        if booking_data.check_out_date < booking_data.check_in_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Check-out date cannot be before check-in date"
+            )
+
         # Validate hotel and room
         hotel = await self._get_hotel(booking_data.hotel_id)
         room = await self._get_room(booking_data.room_id, booking_data.hotel_id)
 
-        # Check availability and lock inventory
-        inventories = await self._get_available_inventory(
+        # Check availability and reserve the rooms in a single statement
+        prices = await self._reserve_inventory(
             booking_data.room_id, booking_data.check_in_date, booking_data.check_out_date, booking_data.rooms_count
         )
-
-        days_count = (booking_data.check_out_date - booking_data.check_in_date).days + 1
-        if len(inventories) != days_count:
+        if prices is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Room is not available for the selected dates"
             )
-
-        # Reserve the rooms
-        await self._reserve_inventory(
-            booking_data.room_id, booking_data.check_in_date, booking_data.check_out_date, booking_data.rooms_count
+        await HotelMinPriceService(self.db).schedule_refresh(
+            [hotel.id], booking_data.check_in_date, booking_data.check_out_date
+        )
+        await search_cache.invalidate(self.db, hotel.city_key, booking_data.check_in_date, booking_data.check_out_date)
+        availability_engine.record_used(
+            self.db, room.id, booking_data.check_in_date, booking_data.check_out_date, booking_data.rooms_count
         )
 
         # Calculate total price
-        total_price = sum(inv.price for inv in inventories) * booking_data.rooms_count
+        total_price = sum(prices) * booking_data.rooms_count
 
         # Create booking
         booking = Booking(
@@ -96,50 +109,123 @@ class BookingService:
         return booking.booking_status
 
     async def cancel_booking(self, booking_id: int, user: User) -> None:
-        """Cancel a booking."""
-        booking = await self._get_user_booking(booking_id, user)
+        """Cancel a booking and give its rooms back.
+
+        The status change is one conditional UPDATE on the locked booking row, so a booking
+        already cancelled or expired (whose rooms were released then) is left alone and
+        inventory moves at most once. Confirmed bookings give back booked rooms, holds give
+        back reserved ones.
+        """
+        previous = (
+            select(Booking.id, Booking.booking_status)
+            .where(and_(Booking.id == booking_id, Booking.user_id == user.id))
+            .with_for_update()
+            .subquery("previous")
+        )
+        result = await self.db.execute(
+            update(Booking)
+            .where(
+                and_(
+                    Booking.id == previous.c.id,
+                    Booking.booking_status.in_(
+                        [
+                            BookingStatus.RESERVED,
+                            BookingStatus.GUESTS_ADDED,
+                            BookingStatus.PAYMENTS_PENDING,
+                            BookingStatus.CONFIRMED,
+                        ]
+                    ),
+                )
+            )
+            .values(booking_status=BookingStatus.CANCELLED)
+            .returning(
+                previous.c.booking_status,
+                Booking.hotel_id,
+                Booking.room_id,
+                Booking.rooms_count,
+                Booking.check_in_date,
+                Booking.check_out_date,
+            )
+        )
+        cancelled = result.one_or_none()
+        if cancelled is None:
+            # 404 for someone else's booking; nothing left to release for an inactive one
+            await self._get_user_booking(booking_id, user)
+            return
 
-        if booking.booking_status == BookingStatus.CONFIRMED:
+        if cancelled.booking_status == BookingStatus.CONFIRMED:
             # Would need to handle refund via Stripe here
-            pass
-
-        # Release reserved inventory
-        await self._release_inventory(
-            booking.room_id, booking.check_in_date, booking.check_out_date, booking.rooms_count
+            await self._move_inventory_counts([booking_id], booked_delta=-1)
+        else:
+            await self._move_inventory_counts([booking_id], reserved_delta=-1)
+        await HotelMinPriceService(self.db).schedule_refresh(
+            [cancelled.hotel_id], cancelled.check_in_date, cancelled.check_out_date
+        )
+        await search_cache.invalidate_hotels(
+            self.db, [cancelled.hotel_id], cancelled.check_in_date, cancelled.check_out_date
+        )
+        availability_engine.record_used(
+            self.db, cancelled.room_id, cancelled.check_in_date, cancelled.check_out_date, -cancelled.rooms_count
         )
-
-        booking.booking_status = BookingStatus.CANCELLED
-        await self.db.flush()
 
     async def confirm_booking(self, booking_id: int) -> None:
         """Confirm booking after successful payment."""
-        result = await self.db.execute(select(Booking).where(Booking.id == booking_id))
-        booking = result.scalar_one_or_none()
+        await self.confirm_bookings([booking_id])
 
-        if booking:
-            # Move from reserved to booked
-            await self._confirm_inventory(
-                booking.room_id, booking.check_in_date, booking.check_out_date, booking.rooms_count
-            )
-            booking.booking_status = BookingStatus.CONFIRMED
-            await self.db.flush()
+    async def confirm_bookings(self, booking_ids: list[int]) -> list[int]:
+        """Confirm paid bookings and move their rooms from reserved to booked in bulk.
+
+        Only bookings still holding inventory are confirmed, so repeated calls for the same
+        booking move inventory at most once. Returns the ids that were confirmed.
+        """
+        if not booking_ids:
+            return []
 
-    async def get_all_bookings_by_hotel_id(self, hotel_id: int, owner: User) -> list[BookingResponse]:
-        """Get all bookings for a hotel."""
+        result = await self.db.execute(
+            update(Booking)
+            .where(
+                and_(
+                    Booking.id.in_(booking_ids),
+                    Booking.booking_status.in_(
+                        [BookingStatus.RESERVED, BookingStatus.GUESTS_ADDED, BookingStatus.PAYMENTS_PENDING]
+                    ),
+                )
+            )
+            .values(booking_status=BookingStatus.CONFIRMED)
+            .returning(Booking.id)
+        )
+        confirmed = list(result.scalars().all())
+        if confirmed:
+            # Move from reserved to booked; availability is unchanged, so cached searches stay valid
+            await self._move_inventory_counts(confirmed, reserved_delta=-1, booked_delta=1)
+        return confirmed
+
+    async def get_all_bookings_by_hotel_id(
+        self, hotel_id: int, owner: User, columns: list | None = None
+    ) -> list[BookingResponse] | Sequence[Row]:
+        """Get all bookings for a hotel; with ``columns`` returns just those columns as Core rows."""
         await self._verify_hotel_ownership(hotel_id, owner)
 
+        if columns is not None:
+            result = await self.db.execute(select(*columns).where(Booking.hotel_id == hotel_id))
+            return result.all()
         result = await self.db.execute(select(Booking).where(Booking.hotel_id == hotel_id))
         bookings = result.scalars().all()
         return [BookingResponse.model_validate(b) for b in bookings]
 
     async def get_hotel_report(
-        self, hotel_id: int, start_date: date, end_date: date, owner: User
+        self, hotel_id: int, start_date: date, end_date: date, owner: User, detailed: bool = False
     ) -> HotelReportResponse:
-        """Generate hotel booking report."""
+        """Generate hotel booking report.
+
+        Totals are aggregated in SQL over CONFIRMED bookings staying within
+        ``[start_date, end_date]``. With ``detailed`` the report also carries a per-night
+        breakdown for the same inclusive range, derived from inventory counts.
+        """
         await self._verify_hotel_ownership(hotel_id, owner)
 
         result = await self.db.execute(
-            select(Booking).where(
+            select(func.count(Booking.id), func.coalesce(func.sum(Booking.amount), 0)).where(
                 and_(
                     Booking.hotel_id == hotel_id,
                     Booking.booking_status == BookingStatus.CONFIRMED,
@@ -148,35 +234,136 @@ class BookingService:
                 )
             )
         )
-        bookings = result.scalars().all()
+        total_bookings, total_revenue = result.one()
 
-        total_revenue = sum(b.amount for b in bookings)
+        daily = await self._get_daily_report(hotel_id, start_date, end_date) if detailed else None
 
         return HotelReportResponse(
             hotel_id=hotel_id,
-            total_bookings=len(bookings),
+            total_bookings=total_bookings,
             total_revenue=total_revenue,
             start_date=start_date,
             end_date=end_date,
+            daily=daily,
         )
 
-    async def get_user_bookings(self, user: User) -> list[BookingResponse]:
-        """Get all bookings for a user."""
+    async def _get_daily_report(self, hotel_id: int, start_date: date, end_date: date) -> list[HotelReportDay]:
+        """Aggregate revenue, room-nights sold and occupancy per night in one grouped query."""
+        sold = func.sum(Inventory.book_count)
+        capacity = func.sum(Inventory.total_count)
+        result = await self.db.execute(
+            select(
+                Inventory.date,
+                func.coalesce(func.sum(Inventory.book_count * Inventory.price), 0),
+                sold,
+                capacity,
+                func.coalesce(sold / func.nullif(func.cast(capacity, Numeric), 0), 0),
+            )
+            .where(
+                and_(
+                    Inventory.hotel_id == hotel_id,
+                    Inventory.date >= start_date,
+                    Inventory.date <= end_date,
+                )
+            )
+            .group_by(Inventory.date)
+            .order_by(Inventory.date)
+        )
+        return [
+            HotelReportDay(
+                date=day,
+                revenue=revenue,
+                room_nights_sold=room_nights_sold,
+                room_nights_total=room_nights_total,
+                occupancy_rate=round(float(occupancy), 4),
+            )
+            for day, revenue, room_nights_sold, room_nights_total, occupancy in result.all()
+        ]
+
+    async def expire_stale_bookings(
+        self, reserved_before: datetime, pending_before: datetime, limit: int
+    ) -> tuple[int, int]:
+        """Expire one batch of abandoned holds and release their inventory.
+
+        Bookings still RESERVED/GUESTS_ADDED since ``reserved_before``, or PAYMENTS_PENDING since
+        ``pending_before``, are claimed with FOR UPDATE SKIP LOCKED so several workers can sweep
+        concurrently. Returns ``(bookings_expired, room_nights_released)``.
+        """
+        stale = (
+            select(Booking.id)
+            .where(
+                or_(
+                    and_(
+                        Booking.booking_status.in_([BookingStatus.RESERVED, BookingStatus.GUESTS_ADDED]),
+                        Booking.created_at < reserved_before,
+                    ),
+                    and_(
+                        Booking.booking_status == BookingStatus.PAYMENTS_PENDING,
+                        Booking.updated_at < pending_before,
+                    ),
+                )
+            )
+            .order_by(Booking.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("stale")
+        )
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.id.in_(select(stale.c.id)))
+            .values(booking_status=BookingStatus.EXPIRED)
+            .returning(
+                Booking.id,
+                Booking.hotel_id,
+                Booking.room_id,
+                Booking.rooms_count,
+                Booking.check_in_date,
+                Booking.check_out_date,
+            )
+        )
+        expired = result.all()
+        if not expired:
+            return 0, 0
+
+        # Release every expired hold with one grouped UPDATE instead of one per booking
+        room_nights = await self._move_inventory_counts([row.id for row in expired], reserved_delta=-1)
+
+        hotel_ids = list({row.hotel_id for row in expired})
+        start = min(row.check_in_date for row in expired)
+        end = max(row.check_out_date for row in expired)
+        await HotelMinPriceService(self.db).schedule_refresh(hotel_ids, start, end)
+        await search_cache.invalidate_hotels(self.db, hotel_ids, start, end)
+        for row in expired:
+            availability_engine.record_used(
+                self.db, row.room_id, row.check_in_date, row.check_out_date, -row.rooms_count
+            )
+
+        return len(expired), room_nights
+
+    async def get_user_bookings(self, user: User, columns: list | None = None) -> list[BookingResponse] | Sequence[Row]:
+        """Get all bookings for a user; with ``columns`` returns just those columns as Core rows."""
+        if columns is not None:
+            result = await self.db.execute(select(*columns).where(Booking.user_id == user.id))
+            return result.all()
         result = await self.db.execute(select(Booking).where(Booking.user_id == user.id))
         bookings = result.scalars().all()
         return [BookingResponse.model_validate(b) for b in bookings]
 
     # Helper methods
     async def _get_hotel(self, hotel_id: int) -> Hotel:
-        result = await self.db.execute(select(Hotel).where(Hotel.id == hotel_id))
-        hotel = result.scalar_one_or_none()
+        hotel = await single_flight.scalar_one_or_none(
+            self.db, ("hotel", hotel_id), select(Hotel).where(Hotel.id == hotel_id)
+        )
         if not hotel:
             raise HTTPException(status_code=404, detail=f"Hotel not found: {hotel_id}")
         return hotel
 
     async def _get_room(self, room_id: int, hotel_id: int) -> Room:
-        result = await self.db.execute(select(Room).where(and_(Room.id == room_id, Room.hotel_id == hotel_id)))
-        room = result.scalar_one_or_none()
+        room = await single_flight.scalar_one_or_none(
+            self.db,
+            ("room", room_id, hotel_id),
+            select(Room).where(and_(Room.id == room_id, Room.hotel_id == hotel_id)),
+        )
         if not room:
             raise HTTPException(status_code=404, detail=f"Room not found: {room_id}")
         return room
@@ -191,46 +378,76 @@ class BookingService:
         return booking
 
     async def _verify_hotel_ownership(self, hotel_id: int, owner: User) -> None:
-        result = await self.db.execute(select(Hotel).where(Hotel.id == hotel_id))
-        hotel = result.scalar_one_or_none()
+        hotel = await single_flight.scalar_one_or_none(
+            self.db, ("hotel", hotel_id), select(Hotel).where(Hotel.id == hotel_id)
+        )
         if not hotel or hotel.owner_id != owner.id:
             raise HTTPException(status_code=403, detail="Access denied")
 
-    async def _get_available_inventory(
+    async def _reserve_inventory(
         self, room_id: int, check_in: date, check_out: date, rooms_count: int
-    ) -> list[Inventory]:
-        result = await self.db.execute(
-            select(Inventory).where(
-                and_(
-                    Inventory.room_id == room_id,
-                    Inventory.date >= check_in,
-                    Inventory.date <= check_out,
-                    Inventory.closed == False,
-                    (Inventory.total_count - Inventory.book_count - Inventory.reserved_count) >= rooms_count,
-                )
+    ) -> list[Decimal] | None:
+        """Reserve rooms for every night in the range, or for none of them.
+
+        Candidate rows are locked in date order and only updated when every night still has
+        capacity, so concurrent requests cannot both take the last room. Returns the nightly
+        prices, or ``None`` when the range is not fully available.
+        """
+        days_count = (check_out - check_in).days + 1
+        available = select(Inventory.id).where(
+            and_(
+                Inventory.room_id == room_id,
+                Inventory.date >= check_in,
+                Inventory.date <= check_out,
+                Inventory.closed == False,
+                (Inventory.total_count - Inventory.book_count - Inventory.reserved_count) >= rooms_count,
             )
         )
-        return list(result.scalars().all())
+        locked = available.order_by(Inventory.date).with_for_update().cte("locked")
 
-    async def _reserve_inventory(self, room_id: int, check_in: date, check_out: date, rooms_count: int) -> None:
-        await self.db.execute(
+        result = await self.db.execute(
             update(Inventory)
-            .where(and_(Inventory.room_id == room_id, Inventory.date >= check_in, Inventory.date <= check_out))
+            .where(
+                and_(
+                    Inventory.id.in_(select(locked.c.id)),
+                    select(func.count()).select_from(locked).scalar_subquery() == days_count,
+                )
+            )
             .values(reserved_count=Inventory.reserved_count + rooms_count)
+            .returning(Inventory.price)
         )
-
-    async def _release_inventory(self, room_id: int, check_in: date, check_out: date, rooms_count: int) -> None:
-        await self.db.execute(
-            update(Inventory)
-            .where(and_(Inventory.room_id == room_id, Inventory.date >= check_in, Inventory.date <= check_out))
-            .values(reserved_count=Inventory.reserved_count - rooms_count)
+        prices = list(result.scalars().all())
+        return prices if len(prices) == days_count else None
+
+    async def _move_inventory_counts(
+        self, booking_ids: list[int], reserved_delta: int = 0, booked_delta: int = 0
+    ) -> int:
+        """Shift inventory counts for many bookings at once; returns the room-nights touched.
+
+        Each inventory row moves by ``delta * rooms`` where ``rooms`` sums the listed bookings
+        covering that room and night.
+        """
+        rooms = (
+            select(Inventory.id, func.sum(Booking.rooms_count).label("rooms_count"))
+            .join(
+                Booking,
+                and_(
+                    Booking.room_id == Inventory.room_id,
+                    Inventory.date >= Booking.check_in_date,
+                    Inventory.date <= Booking.check_out_date,
+                ),
+            )
+            .where(Booking.id.in_(booking_ids))
+            .group_by(Inventory.id)
+            .subquery()
         )
-
-    async def _confirm_inventory(self, room_id: int, check_in: date, check_out: date, rooms_count: int) -> None:
-        await self.db.execute(
+        result = await self.db.execute(
             update(Inventory)
-            .where(and_(Inventory.room_id == room_id, Inventory.date >= check_in, Inventory.date <= check_out))
+            .where(Inventory.id == rooms.c.id)
             .values(
-                reserved_count=Inventory.reserved_count - rooms_count, book_count=Inventory.book_count + rooms_count
+                reserved_count=Inventory.reserved_count + reserved_delta * rooms.c.rooms_count,
+                book_count=Inventory.book_count + booked_delta * rooms.c.rooms_count,
             )
+            .returning(rooms.c.rooms_count)
         )
+        return sum(result.scalars().all())
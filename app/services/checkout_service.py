@@ -1,22 +1,39 @@
+import json
+import logging
+from datetime import UTC, datetime, timedelta
+
 import stripe
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.models.booking import Booking
-from app.models.enums import BookingStatus
+from app.models.enums import BookingStatus, WebhookEventStatus
 from app.models.user import User
+from app.models.webhook_event import WebhookEvent
+from app.payments.gateway import (
+    CheckoutRequest,
+    PaymentGateway,
+    PaymentGatewayError,
+    PaymentGatewayUnavailable,
+    get_payment_gateway,
+)
+from app.services.booking_service import BookingService
+from app.utils.metrics import instrument
 
 settings = get_settings()
-stripe.api_key = settings.STRIPE_API_KEY
+logger = logging.getLogger(__name__)
 
 
+@instrument
 class CheckoutService:
     """Service for payment checkout operations."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, gateway: PaymentGateway | None = None):
         self.db = db
+        self.gateway = gateway or get_payment_gateway()
 
     async def create_checkout_session(self, booking_id: int, user: User) -> str:
         """Create Stripe checkout session for a booking."""
@@ -27,44 +44,47 @@ class CheckoutService:
         if not booking:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Booking not found: {booking_id}")
 
-        if booking.booking_status not in [BookingStatus.RESERVED, BookingStatus.GUESTS_ADDED]:
+        payable_statuses = [BookingStatus.RESERVED, BookingStatus.GUESTS_ADDED]
+        if booking.booking_status not in payable_statuses:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Booking cannot proceed to payment")
 
-        # Create Stripe checkout session
+        # End the transaction so no pooled connection is held while waiting on the payment provider
+        await self.db.commit()
+
         try:
-            checkout_session = stripe.checkout.Session.create(
-                payment_method_types=["card"],
-                line_items=[
-                    {
-                        "price_data": {
-                            "currency": "usd",
-                            "product_data": {
-                                "name": f"Booking #{booking.id}",
-                                "description": f"Room booking from {booking.check_in_date} to {booking.check_out_date}",
-                            },
-                            "unit_amount": int(booking.amount * 100),  # Convert to cents
-                        },
-                        "quantity": 1,
-                    }
-                ],
-                mode="payment",
-                success_url=f"{settings.FRONTEND_URL}/booking/{booking.id}/success",
-                cancel_url=f"{settings.FRONTEND_URL}/booking/{booking.id}/cancel",
-                metadata={"booking_id": str(booking.id)},
+            checkout_session = await self.gateway.create_checkout_session(
+                CheckoutRequest(
+                    booking_id=booking.id,
+                    amount=booking.amount,
+                    name=f"Booking #{booking.id}",
+                    description=f"Room booking from {booking.check_in_date} to {booking.check_out_date}",
+                    success_url=f"{settings.FRONTEND_URL}/booking/{booking.id}/success",
+                    cancel_url=f"{settings.FRONTEND_URL}/booking/{booking.id}/cancel",
+                    # Stop taking payment before the expiry sweeper can release the hold
+                    expires_at=datetime.now(UTC) + timedelta(minutes=settings.PAYMENT_HOLD_MINUTES),
+                )
             )
-
-            # Update booking with session ID
-            booking.payment_session_id = checkout_session.id
-            booking.booking_status = BookingStatus.PAYMENTS_PENDING
-            await self.db.flush()
-
-            return checkout_session.url
-
-        except stripe.error.StripeError as e:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Payment error: {str(e)}")
+        except PaymentGatewayUnavailable as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Payment error: {e.message}")
+        except PaymentGatewayError as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Payment error: {e.message}")
+
+        # Update booking with session ID, unless it changed state while the provider was called
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.id == booking.id, Booking.booking_status.in_(payable_statuses))
+            .values(payment_session_id=checkout_session.id, booking_status=BookingStatus.PAYMENTS_PENDING)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Booking cannot proceed to payment")
+
+        return checkout_session.url
 
     async def handle_payment_webhook(self, payload: bytes, sig_header: str) -> None:
-        """Handle Stripe webhook events."""
+        """Verify a Stripe webhook and record it in the inbox for asynchronous processing.
+
+        Redeliveries of an event already in the inbox are ignored.
+        """
         try:
             event = stripe.Webhook.construct_event(payload, sig_header, settings.STRIPE_WEBHOOK_SECRET)
         except ValueError:
@@ -72,14 +92,70 @@ class CheckoutService:
         except stripe.error.SignatureVerificationError:
             raise HTTPException(status_code=400, detail="Invalid signature")
 
-        if event["type"] == "checkout.session.completed":
-            session = event["data"]["object"]
-            booking_id = int(session["metadata"]["booking_id"])
-
-            # Confirm the booking
-            result = await self.db.execute(select(Booking).where(Booking.id == booking_id))
-            booking = result.scalar_one_or_none()
-
-            if booking:
-                booking.booking_status = BookingStatus.CONFIRMED
-                await self.db.flush()
+        await self.db.execute(
+            insert(WebhookEvent)
+            .values(
+                event_id=event["id"],
+                type=event["type"],
+                payload=json.loads(payload),
+                status=WebhookEventStatus.PENDING,
+                received_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=[WebhookEvent.event_id])
+        )
+
+    async def process_webhook_events(self, limit: int) -> int:
+        """Process one batch of pending inbox events; returns the number of events handled.
+
+        Events are claimed with FOR UPDATE SKIP LOCKED so several workers can drain the inbox.
+        Completed checkouts confirm their bookings in bulk, in the same transaction that marks
+        the events processed. A paid booking that can no longer be confirmed (expired or
+        cancelled first) leaves its event FAILED so the payment can be refunded or reconciled.
+        """
+        result = await self.db.execute(
+            select(WebhookEvent)
+            .where(WebhookEvent.status == WebhookEventStatus.PENDING)
+            .order_by(WebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        events = result.scalars().all()
+        if not events:
+            return 0
+
+        now = datetime.utcnow()
+        paid: dict[int, list[WebhookEvent]] = {}
+        for event in events:
+            event.status = WebhookEventStatus.PROCESSED
+            event.processed_at = now
+            if event.type != "checkout.session.completed":
+                continue
+            try:
+                booking_id = int(event.payload["data"]["object"]["metadata"]["booking_id"])
+            except (KeyError, TypeError, ValueError):
+                event.status = WebhookEventStatus.FAILED
+                event.last_error = "Missing booking_id in checkout session metadata"
+            else:
+                paid.setdefault(booking_id, []).append(event)
+
+        confirmed = set(await BookingService(self.db).confirm_bookings(list(paid)))
+        unconfirmed = [booking_id for booking_id in paid if booking_id not in confirmed]
+        if unconfirmed:
+            result = await self.db.execute(
+                select(Booking.id, Booking.booking_status).where(Booking.id.in_(unconfirmed))
+            )
+            statuses = dict(result.all())
+            for booking_id in unconfirmed:
+                booking_status = statuses.get(booking_id)
+                if booking_status == BookingStatus.CONFIRMED:
+                    # Already confirmed by an earlier event for the same checkout
+                    continue
+                state = booking_status.value if booking_status else "not found"
+                logger.warning("Paid booking %d could not be confirmed (%s)", booking_id, state)
+                for event in paid[booking_id]:
+                    event.status = WebhookEventStatus.FAILED
+                    event.last_error = f"Booking {booking_id} could not be confirmed ({state}); refund or reconcile"
+
+        await self.db.flush()
+
+        return len(events)
@@ -0,0 +1,124 @@
+from datetime import date, datetime
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.hotel_min_price import HotelMinPrice
+from app.models.hotel_min_price_refresh import HotelMinPriceRefresh
+from app.models.inventory import Inventory
+
+
+class HotelMinPriceService:
+    """Service keeping the per-hotel, per-day search summary in sync with inventory."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def refresh_hotel(self, hotel_id: int, start_date: date | None = None, end_date: date | None = None) -> None:
+        """Recompute summary rows for one hotel, optionally limited to a date range."""
+        await self.refresh_hotels([hotel_id], start_date, end_date)
+
+    async def refresh_hotels(
+        self, hotel_ids: list[int] | None = None, start_date: date | None = None, end_date: date | None = None
+    ) -> None:
+        """Recompute summary rows from inventory with one DELETE and one INSERT ... SELECT.
+
+        Passing ``hotel_ids=None`` rebuilds the summary for every hotel.
+        """
+        summary_filters = []
+        inventory_filters = [
+            Inventory.closed == False,
+            (Inventory.total_count - Inventory.book_count - Inventory.reserved_count) > 0,
+        ]
+        if hotel_ids is not None:
+            summary_filters.append(HotelMinPrice.hotel_id.in_(hotel_ids))
+            inventory_filters.append(Inventory.hotel_id.in_(hotel_ids))
+        if start_date:
+            summary_filters.append(HotelMinPrice.date >= start_date)
+            inventory_filters.append(Inventory.date >= start_date)
+        if end_date:
+            summary_filters.append(HotelMinPrice.date <= end_date)
+            inventory_filters.append(Inventory.date <= end_date)
+
+        await self.db.execute(delete(HotelMinPrice).where(*summary_filters))
+
+        now = datetime.utcnow()
+        summary = (
+            select(
+                Inventory.hotel_id,
+                Inventory.date,
+                func.min(Inventory.price),
+                func.max(Inventory.city),
+                func.max(Inventory.city_key),
+                func.max(Inventory.total_count - Inventory.book_count - Inventory.reserved_count),
+                literal(now),
+                literal(now),
+            )
+            .where(*inventory_filters)
+            .group_by(Inventory.hotel_id, Inventory.date)
+        )
+        stmt = insert(HotelMinPrice).from_select(
+            ["hotel_id", "date", "price", "city", "city_key", "available_count", "created_at", "updated_at"], summary
+        )
+        # A concurrent refresh of the same hotel may have inserted the row after our DELETE
+        stmt = stmt.on_conflict_do_update(
+            constraint="unique_hotel_date",
+            set_={
+                "price": stmt.excluded.price,
+                "city": stmt.excluded.city,
+                "city_key": stmt.excluded.city_key,
+                "available_count": stmt.excluded.available_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def schedule_refresh(self, hotel_ids: list[int], start_date: date, end_date: date) -> None:
+        """Queue a refresh of the hotels' summary rows for a date range.
+
+        Used by booking writes: the queue is append-only, so concurrent bookings in one hotel do
+        not lock its summary rows. The summary catches up once ``refresh_pending`` runs.
+        """
+        if not hotel_ids:
+            return
+        await self.db.execute(
+            insert(HotelMinPriceRefresh),
+            [{"hotel_id": hotel_id, "start_date": start_date, "end_date": end_date} for hotel_id in hotel_ids],
+        )
+
+    async def refresh_pending(self, limit: int) -> tuple[int, dict[int, tuple[date, date]]]:
+        """Apply up to ``limit`` queued refreshes; returns the entries taken and refreshed ranges.
+
+        Entries are removed and applied in the caller's transaction, so a failed refresh leaves
+        them queued. Concurrent callers skip each other's entries. Entries committed after this
+        statement started stay queued for the next call, so no write is missed.
+        """
+        batch = (
+            select(HotelMinPriceRefresh.id)
+            .order_by(HotelMinPriceRefresh.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            delete(HotelMinPriceRefresh)
+            .where(HotelMinPriceRefresh.id.in_(batch))
+            .returning(HotelMinPriceRefresh.hotel_id, HotelMinPriceRefresh.start_date, HotelMinPriceRefresh.end_date)
+        )
+        entries = result.all()
+
+        # Merge repeated entries for a hotel into one range
+        ranges: dict[int, tuple[date, date]] = {}
+        for hotel_id, start_date, end_date in entries:
+            if hotel_id in ranges:
+                start, end = ranges[hotel_id]
+                start_date, end_date = min(start, start_date), max(end, end_date)
+            ranges[hotel_id] = (start_date, end_date)
+        for hotel_id, (start_date, end_date) in ranges.items():
+            await self.refresh_hotel(hotel_id, start_date, end_date)
+        return len(entries), ranges
+
+    async def delete_hotel(self, hotel_id: int) -> None:
+        """Remove all summary rows for a hotel."""
+        await self.db.execute(delete(HotelMinPrice).where(HotelMinPrice.hotel_id == hotel_id))
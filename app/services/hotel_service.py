@@ -1,10 +1,16 @@
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.hotel import Hotel
+from app.models.inventory import Inventory
 from app.models.user import User
 from app.schemas.hotel import HotelCreate, HotelResponse, HotelUpdate
+from app.services.availability_engine import availability_engine
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.search_cache import search_cache
+from app.utils.city import normalize_city
+from app.utils.single_flight import single_flight
 
 
 class HotelService:
@@ -18,6 +24,7 @@ class HotelService:
         hotel = Hotel(
             name=hotel_data.name,
             city=hotel_data.city,
+            city_key=normalize_city(hotel_data.city) if hotel_data.city is not None else None,
             photos=hotel_data.photos,
             amenities=hotel_data.amenities,
             active=False,
@@ -52,8 +59,11 @@ class HotelService:
 
         if hotel_data.name is not None:
             hotel.name = hotel_data.name
+        city_changed = hotel_data.city is not None and hotel_data.city != hotel.city
+        previous_city_key = hotel.city_key
         if hotel_data.city is not None:
             hotel.city = hotel_data.city
+            hotel.city_key = normalize_city(hotel_data.city)
         if hotel_data.photos is not None:
             hotel.photos = hotel_data.photos
         if hotel_data.amenities is not None:
@@ -67,6 +77,18 @@ class HotelService:
                 hotel.contact_address = hotel_data.contact_info.address
 
         await self.db.flush()
+
+        if city_changed:
+            # Inventory and the search summary carry a denormalized copy of the city
+            await self.db.execute(
+                update(Inventory).where(Inventory.hotel_id == hotel.id).values(city=hotel.city, city_key=hotel.city_key)
+            )
+            await HotelMinPriceService(self.db).refresh_hotel(hotel.id)
+            await search_cache.invalidate(self.db, previous_city_key)
+            availability_engine.record_structure_change(self.db)
+        # Name, photos and amenities are part of search results too
+        await search_cache.invalidate(self.db, hotel.city_key)
+
         await self.db.refresh(hotel)
 
         return HotelResponse.model_validate(hotel)
@@ -74,6 +96,9 @@ class HotelService:
     async def delete_hotel(self, hotel_id: int, owner: User) -> None:
         """Delete a hotel."""
         hotel = await self._get_owned_hotel(hotel_id, owner)
+        await HotelMinPriceService(self.db).delete_hotel(hotel.id)
+        await search_cache.invalidate(self.db, hotel.city_key)
+        availability_engine.record_structure_change(self.db)
         await self.db.delete(hotel)
 
     async def activate_hotel(self, hotel_id: int, owner: User) -> None:
@@ -81,11 +106,14 @@ class HotelService:
         hotel = await self._get_owned_hotel(hotel_id, owner)
         hotel.active = True
         await self.db.flush()
+        await search_cache.invalidate(self.db, hotel.city_key)
+        availability_engine.record_hotel_active(self.db, hotel.id, True)
 
     async def _get_owned_hotel(self, hotel_id: int, owner: User) -> Hotel:
         """Get hotel ensuring ownership."""
-        result = await self.db.execute(select(Hotel).where(Hotel.id == hotel_id))
-        hotel = result.scalar_one_or_none()
+        hotel = await single_flight.scalar_one_or_none(
+            self.db, ("hotel", hotel_id), select(Hotel).where(Hotel.id == hotel_id)
+        )
 
         if not hotel:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Hotel not found with id: {hotel_id}")
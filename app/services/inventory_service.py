@@ -1,16 +1,75 @@
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
 from datetime import date
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, select, update
+from pydantic import ValidationError
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Integer,
+    MetaData,
+    Numeric,
+    Row,
+    Table,
+    and_,
+    func,
+    select,
+    true,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.models.enums import BulkFormat, InventoryFormat
 from app.models.hotel import Hotel
 from app.models.inventory import Inventory
 from app.models.room import Room
 from app.models.user import User
-from app.schemas.inventory import InventoryResponse, InventoryUpdate
+from app.schemas.inventory import (
+    ColumnRuns,
+    InventoryCalendarResponse,
+    InventoryChange,
+    InventoryChangesResponse,
+    InventoryImportResult,
+    InventoryImportRow,
+    InventoryResponse,
+    InventoryUpdate,
+)
+from app.services.availability_engine import availability_engine
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.search_cache import search_cache
+from app.utils.bulk_io import csv_line, ndjson_line
+from app.utils.metrics import instrument
+from app.utils.pagination import decode_cursor, encode_cursor
 
+# Per-day value columns of InventoryCalendarResponse
+_CALENDAR_COLUMNS = ("price", "surge_factor", "book_count", "reserved_count", "total_count", "closed")
 
+# Rows per COPY while importing and per keyset page while exporting
+_BULK_BATCH_SIZE = 5000
+# Above this many imported rows the availability engine reloads instead of patching each cell
+_ENGINE_PATCH_LIMIT = 10_000
+
+_IMPORT_COLUMNS = ("line", "room_id", "date", "price", "total_count", "closed")
+_EXPORT_COLUMNS = ("room_id", "date", "price", "total_count", "closed", "book_count", "reserved_count")
+
+# Per-transaction staging table for imports, created and dropped by import_inventory
+_import_staging = Table(
+    "inventory_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("room_id", Integer, nullable=False),
+    Column("date", Date, nullable=False),
+    Column("price", Numeric(10, 2)),
+    Column("total_count", Integer),
+    Column("closed", Boolean),
+    prefixes=["TEMPORARY"],
+)
+
+
+@instrument
 class InventoryService:
     """Service for inventory management operations."""
 
@@ -18,12 +77,30 @@ class InventoryService:
         self.db = db
 
     async def get_inventory_by_room(
-        self, room_id: int, owner: User, start_date: date = None, end_date: date = None
-    ) -> list[InventoryResponse]:
-        """Get inventory for a room."""
-        await self._get_room_with_ownership(room_id, owner)
+        self,
+        room_id: int,
+        owner: User,
+        start_date: date = None,
+        end_date: date = None,
+        columns: list | None = None,
+        format: InventoryFormat = InventoryFormat.ROWS,
+        rle: bool = False,
+    ) -> list[InventoryResponse] | InventoryCalendarResponse | Sequence[Row]:
+        """Get inventory for a room.
 
-        query = select(Inventory).where(Inventory.room_id == room_id)
+        With ``columns`` just those columns are returned as Core rows, skipping ORM instances.
+        ``InventoryFormat.COLUMNAR`` returns the calendar as parallel arrays, run-length encoded
+        with ``rle``.
+        """
+        room = await self._get_room_with_ownership(room_id, owner)
+
+        if format == InventoryFormat.COLUMNAR:
+            query = select(Inventory.date, *(getattr(Inventory, name) for name in _CALENDAR_COLUMNS))
+        elif columns is not None:
+            query = select(*columns)
+        else:
+            query = select(Inventory)
+        query = query.where(Inventory.room_id == room_id)
 
         if start_date:
             query = query.where(Inventory.date >= start_date)
@@ -33,6 +110,10 @@ class InventoryService:
         query = query.order_by(Inventory.date)
 
         result = await self.db.execute(query)
+        if format == InventoryFormat.COLUMNAR:
+            return _calendar(room, result.all(), rle)
+        if columns is not None:
+            return result.all()
         inventories = result.scalars().all()
 
         return [InventoryResponse.model_validate(inv) for inv in inventories]
@@ -41,7 +122,7 @@ class InventoryService:
         self, room_id: int, update_data: InventoryUpdate, owner: User, start_date: date = None, end_date: date = None
     ) -> list[InventoryResponse]:
         """Update inventory for a room within date range."""
-        await self._get_room_with_ownership(room_id, owner)
+        room = await self._get_room_with_ownership(room_id, owner)
 
         if not start_date:
             start_date = date.today()
@@ -64,9 +145,214 @@ class InventoryService:
                 .where(and_(Inventory.room_id == room_id, Inventory.date >= start_date, Inventory.date <= end_date))
                 .values(**update_dict)
             )
+            await HotelMinPriceService(self.db).refresh_hotel(room.hotel_id, start_date, end_date)
+            await search_cache.invalidate_hotels(self.db, [room.hotel_id], start_date, end_date)
+            availability_engine.record_inventory(
+                self.db,
+                room_id,
+                start_date,
+                end_date,
+                total_count=update_data.total_count,
+                closed=update_data.closed,
+                price=update_data.price,
+            )
 
         return await self.get_inventory_by_room(room_id, owner, start_date, end_date)
 
+    async def import_inventory(self, owner: User, records: AsyncIterable[tuple[int, dict]]) -> InventoryImportResult:
+        """Apply streamed ``(line_number, record)`` rows to many rooms' inventory at once.
+
+        Rows are validated as they arrive, ownership is checked once per room, and batches are
+        COPYed into a temporary table. One ``UPDATE ... FROM`` then applies them; the last line
+        wins for a repeated room and date, and days without inventory are skipped.
+        """
+        # A failed import rolls back to here, leaving no staging table in a reused session
+        async with self.db.begin_nested():
+            conn = await self.db.connection()
+            await conn.run_sync(_import_staging.create)
+            driver = (await conn.get_raw_connection()).driver_connection
+
+            room_hotels: dict[int, int] = {}
+            engine_rows: list[InventoryImportRow] | None = []
+            rows, batch = 0, []
+            first_date = last_date = None
+            async for line, record in records:
+                try:
+                    row = InventoryImportRow.model_validate(record)
+                except ValidationError as exc:
+                    error = exc.errors()[0]
+                    field = ".".join(str(part) for part in error["loc"])
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Line {line}: {field}: {error['msg']}"
+                    ) from exc
+                rows += 1
+                batch.append((line, row.room_id, row.date, row.price, row.total_count, row.closed))
+                first_date = row.date if first_date is None else min(first_date, row.date)
+                last_date = row.date if last_date is None else max(last_date, row.date)
+                if engine_rows is not None:
+                    engine_rows.append(row)
+                    if len(engine_rows) > _ENGINE_PATCH_LIMIT:
+                        engine_rows = None
+                if len(batch) >= _BULK_BATCH_SIZE:
+                    await self._stage(driver, batch, owner, room_hotels)
+                    batch = []
+            if batch:
+                await self._stage(driver, batch, owner, room_hotels)
+
+            updated = 0
+            if rows:
+                staged = _import_staging.c
+                latest = (
+                    select(_import_staging)
+                    .distinct(staged.room_id, staged.date)
+                    .order_by(staged.room_id, staged.date, staged.line.desc())
+                    .subquery()
+                )
+                result = await self.db.execute(
+                    update(Inventory)
+                    .where(Inventory.room_id == latest.c.room_id, Inventory.date == latest.c.date)
+                    .values(
+                        price=func.coalesce(latest.c.price, Inventory.price),
+                        total_count=func.coalesce(latest.c.total_count, Inventory.total_count),
+                        closed=func.coalesce(latest.c.closed, Inventory.closed),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                updated = result.rowcount
+            await conn.run_sync(_import_staging.drop)
+
+        if updated:
+            hotel_ids = sorted(set(room_hotels.values()))
+            await HotelMinPriceService(self.db).refresh_hotels(hotel_ids, first_date, last_date)
+            await search_cache.invalidate_hotels(self.db, hotel_ids, first_date, last_date)
+            if engine_rows is None:
+                availability_engine.record_structure_change(self.db)
+            else:
+                for row in engine_rows:
+                    availability_engine.record_inventory(
+                        self.db,
+                        row.room_id,
+                        row.date,
+                        row.date,
+                        total_count=row.total_count,
+                        closed=row.closed,
+                        price=row.price,
+                    )
+
+        return InventoryImportResult(rows=rows, rooms=len(room_hotels), updated=updated)
+
+    async def get_owned_room_ids(self, owner: User, hotel_id: int | None = None) -> list[int]:
+        """Ids of the rooms in ``hotel_id``, or in every hotel ``owner`` owns."""
+        if hotel_id is not None:
+            await self._check_hotel_owner(hotel_id, owner)
+            query = select(Room.id).where(Room.hotel_id == hotel_id)
+        else:
+            query = select(Room.id).join(Hotel, Hotel.id == Room.hotel_id).where(Hotel.owner_id == owner.id)
+        result = await self.db.execute(query.order_by(Room.id))
+        return list(result.scalars().all())
+
+    async def export_inventory(
+        self, room_ids: list[int], file_format: BulkFormat, start_date: date = None, end_date: date = None
+    ) -> AsyncIterator[str]:
+        """Stream the rooms' inventory as CSV or NDJSON lines, ordered by room and date.
+
+        Rows are read in keyset pages, so memory stays flat however large the export; each page
+        is its own snapshot. The output can be fed back to ``import_inventory``.
+        """
+        if file_format == BulkFormat.CSV:
+            yield csv_line(_EXPORT_COLUMNS)
+
+        filters = [Inventory.room_id.in_(room_ids)]
+        if start_date:
+            filters.append(Inventory.date >= start_date)
+        if end_date:
+            filters.append(Inventory.date <= end_date)
+        columns = [getattr(Inventory, name) for name in _EXPORT_COLUMNS]
+
+        after = None
+        while room_ids:
+            query = select(*columns).where(*filters)
+            if after is not None:
+                query = query.where(tuple_(Inventory.room_id, Inventory.date) > after)
+            query = query.order_by(Inventory.room_id, Inventory.date).limit(_BULK_BATCH_SIZE)
+            page = (await self.db.execute(query)).all()
+            if file_format == BulkFormat.CSV:
+                yield "".join(csv_line(row) for row in page)
+            else:
+                yield "".join(ndjson_line(dict(zip(_EXPORT_COLUMNS, row, strict=True))) for row in page)
+            if len(page) < _BULK_BATCH_SIZE:
+                break
+            after = (page[-1].room_id, page[-1].date)
+
+    async def get_inventory_changes(
+        self, owner: User, cursor: str | None = None, limit: int = 500, hotel_id: int | None = None
+    ) -> InventoryChangesResponse:
+        """Inventory rows of the owner's hotels changed after ``cursor``, oldest change first.
+
+        Rows are ordered by ``(change_xid, id)``, the id of the transaction that last wrote the
+        row, and the cursor holds the last pair returned, so a row updated again reappears later
+        with its new values. Each hotel is read from its own ``(hotel_id, change_xid, id)`` index
+        range, at most ``limit + 1`` rows each, so a page costs the same however old the cursor
+        or large the catalogue. Only rows written by transactions older than every transaction
+        still in flight (the snapshot's xmin) are returned, so a slow commit holds the feed back
+        instead of landing behind a cursor that already passed it. Deleted rows are not reported.
+        """
+        after = _decode_change_cursor(cursor) if cursor else None
+        if hotel_id is not None:
+            await self._check_hotel_owner(hotel_id, owner)
+            hotels = select(Hotel.id).where(Hotel.id == hotel_id)
+        else:
+            hotels = select(Hotel.id).where(Hotel.owner_id == owner.id)
+        hotels = hotels.subquery("hotels")
+
+        settled = select(func.txid_snapshot_xmin(func.txid_current_snapshot())).scalar_subquery()
+        changed = select(Inventory).where(Inventory.hotel_id == hotels.c.id, Inventory.change_xid < settled)
+        if after is not None:
+            changed = changed.where(tuple_(Inventory.change_xid, Inventory.id) > after)
+        changed = changed.order_by(Inventory.change_xid, Inventory.id).limit(limit + 1).lateral("changed")
+        change = aliased(Inventory, changed)
+
+        result = await self.db.execute(
+            select(change)
+            .select_from(hotels)
+            .join(changed, true())
+            .order_by(change.change_xid, change.id)
+            .limit(limit + 1)
+        )
+        rows = result.scalars().all()
+
+        items = [InventoryChange.model_validate(row) for row in rows[:limit]]
+        if items:
+            last = rows[len(items) - 1]
+            cursor = encode_cursor({"k": [last.change_xid, last.id]})
+        return InventoryChangesResponse(items=items, cursor=cursor, has_more=len(rows) > limit)
+
+    async def _check_hotel_owner(self, hotel_id: int, owner: User) -> None:
+        result = await self.db.execute(select(Hotel.owner_id).where(Hotel.id == hotel_id))
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Hotel not found: {hotel_id}")
+        if owner_id != owner.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    async def _stage(self, driver, batch: list[tuple], owner: User, room_hotels: dict[int, int]) -> None:
+        """Check ownership of rooms not seen before, then COPY ``batch`` into the staging table."""
+        new_rooms = {row[1] for row in batch} - room_hotels.keys()
+        if new_rooms:
+            result = await self.db.execute(
+                select(Room.id, Room.hotel_id, Hotel.owner_id)
+                .join(Hotel, Hotel.id == Room.hotel_id)
+                .where(Room.id.in_(new_rooms))
+            )
+            for room_id, hotel_id, owner_id in result.all():
+                if owner_id != owner.id:
+                    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+                room_hotels[room_id] = hotel_id
+            missing = new_rooms - room_hotels.keys()
+            if missing:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Room not found: {min(missing)}")
+        await driver.copy_records_to_table(_import_staging.name, records=batch, columns=_IMPORT_COLUMNS)
+
     async def _get_room_with_ownership(self, room_id: int, owner: User) -> Room:
         """Get room and verify ownership through hotel."""
         result = await self.db.execute(select(Room).where(Room.id == room_id))
@@ -83,3 +369,42 @@ class InventoryService:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
         return room
+
+
+def _calendar(room: Room, rows: list, rle: bool) -> InventoryCalendarResponse:
+    """Pivot ``(date, *_CALENDAR_COLUMNS)`` rows ordered by date into parallel arrays."""
+    columns = list(zip(*rows, strict=True)) if rows else [()] * (len(_CALENDAR_COLUMNS) + 1)
+    dates = columns[0]
+    start_date = dates[0] if dates else None
+    offsets = [(day - start_date).days for day in dates]
+    return InventoryCalendarResponse(
+        room_id=room.id,
+        hotel_id=room.hotel_id,
+        start_date=start_date,
+        days=len(dates),
+        date_offsets=None if not offsets or offsets[-1] == len(offsets) - 1 else offsets,
+        **{
+            name: _run_length_encode(values) if rle else list(values)
+            for name, values in zip(_CALENDAR_COLUMNS, columns[1:], strict=True)
+        },
+    )
+
+
+def _run_length_encode(values: Sequence) -> ColumnRuns:
+    runs = ColumnRuns(values=[], lengths=[])
+    for value in values:
+        if runs.values and runs.values[-1] == value:
+            runs.lengths[-1] += 1
+        else:
+            runs.values.append(value)
+            runs.lengths.append(1)
+    return runs
+
+
+def _decode_change_cursor(cursor: str) -> tuple[int, int]:
+    invalid = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    try:
+        change_xid, row_id = decode_cursor(cursor)["k"]
+        return int(change_xid), int(row_id)
+    except (ValueError, KeyError, TypeError):
+        raise invalid from None
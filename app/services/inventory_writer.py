@@ -0,0 +1,167 @@
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from sqlalchemy import Date, cast, false, func, insert, literal, literal_column, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.hotel import Hotel
+from app.models.inventory import Inventory
+from app.models.room import Room
+from app.services.availability_engine import availability_engine
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.search_cache import search_cache
+from app.utils.city import normalize_city
+
+INVENTORY_COLUMNS = (
+    "hotel_id",
+    "room_id",
+    "date",
+    "book_count",
+    "reserved_count",
+    "total_count",
+    "surge_factor",
+    "price",
+    "city",
+    "city_key",
+    "closed",
+    "created_at",
+)
+
+
+class InventoryWriter:
+    """Bulk writer for inventory rows that never builds ORM instances.
+
+    Rows are streamed with asyncpg's binary COPY when the session runs on asyncpg, and
+    otherwise inserted with chunked multi-row ``INSERT ... VALUES`` statements.
+    """
+
+    def __init__(self, db: AsyncSession, use_copy: bool = True, chunk_size: int = 1000):
+        self.db = db
+        self.use_copy = use_copy
+        self.chunk_size = chunk_size
+
+    async def write(self, records: Iterable[tuple]) -> int:
+        """Insert records ordered as ``INVENTORY_COLUMNS``; returns the number of rows written."""
+        # Pending ORM changes (e.g. a new room) must reach the database before the bulk rows
+        await self.db.flush()
+        conn = await self.db.connection()
+
+        if self.use_copy and conn.dialect.driver == "asyncpg":
+            records = list(records)
+            if records:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    Inventory.__tablename__, records=records, columns=INVENTORY_COLUMNS
+                )
+            return len(records)
+
+        written = 0
+        iterator = iter(records)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            await conn.execute(insert(Inventory).values([dict(zip(INVENTORY_COLUMNS, r, strict=True)) for r in chunk]))
+            written += len(chunk)
+        return written
+
+    async def write_room_calendar(self, room: Room, hotel: Hotel, start_date: date, days: int) -> int:
+        """Create open inventory for a room for ``days`` consecutive dates from ``start_date``."""
+        return await self.write(room_calendar_records(room, hotel, start_date, days))
+
+    async def extend_horizon(
+        self, horizon_end: date, after_room_id: int = 0, limit: int = 500
+    ) -> tuple[int | None, int]:
+        """Generate missing tail dates up to ``horizon_end`` for the next ``limit`` rooms after ``after_room_id``.
+
+        Each room continues from the day after its last inventory date (or today), copying
+        ``total_count``/``base_price`` from the room and the city from the hotel. Rows that already
+        exist are skipped via ``ON CONFLICT DO NOTHING``, so the call is idempotent. Returns the last
+        room id processed (``None`` once no rooms remain) and the number of rows inserted.
+        """
+        result = await self.db.execute(select(Room.id).where(Room.id > after_room_id).order_by(Room.id).limit(limit))
+        room_ids = list(result.scalars().all())
+        if not room_ids:
+            return None, 0
+
+        today = date.today()
+        last = (
+            select(Inventory.room_id, func.max(Inventory.date).label("last_date"))
+            .where(Inventory.room_id.in_(room_ids))
+            .group_by(Inventory.room_id)
+            .subquery()
+        )
+        first_missing = func.greatest(func.coalesce(last.c.last_date + 1, today), today)
+        days = (
+            func.generate_series(first_missing, horizon_end, literal_column("interval '1 day'"))
+            .table_valued("day", name="days")
+            .render_derived()
+            .lateral()
+        )
+        now = datetime.utcnow()
+        tail = (
+            select(
+                Room.hotel_id,
+                Room.id,
+                cast(days.c.day, Date),
+                literal(0),
+                literal(0),
+                Room.total_count,
+                literal(Decimal("1.0")),
+                Room.base_price,
+                func.coalesce(Hotel.city, ""),
+                func.coalesce(Hotel.city_key, ""),
+                false(),
+                literal(now),
+            )
+            .join(Hotel, Hotel.id == Room.hotel_id)
+            .outerjoin(last, last.c.room_id == Room.id)
+            .join(days, true())
+            .where(Room.id.in_(room_ids))
+        )
+        stmt = (
+            pg_insert(Inventory)
+            .from_select(list(INVENTORY_COLUMNS), tail)
+            .on_conflict_do_nothing(constraint="unique_hotel_room_date")
+            .returning(Inventory.hotel_id, Inventory.date)
+        )
+        inserted = (await self.db.execute(stmt)).all()
+
+        # Newly sellable dates must show up in search
+        hotel_ranges: dict[int, tuple[date, date]] = {}
+        for hotel_id, inv_date in inserted:
+            start, end = hotel_ranges.get(hotel_id, (inv_date, inv_date))
+            hotel_ranges[hotel_id] = (min(start, inv_date), max(end, inv_date))
+        summary = HotelMinPriceService(self.db)
+        for hotel_id, (start, end) in hotel_ranges.items():
+            await summary.refresh_hotel(hotel_id, start, end)
+            await search_cache.invalidate_hotels(self.db, [hotel_id], start, end)
+        if inserted:
+            availability_engine.record_structure_change(self.db)
+
+        return room_ids[-1], len(inserted)
+
+
+def room_calendar_records(room: Room, hotel: Hotel, start_date: date, days: int) -> Iterator[tuple]:
+    """Yield default inventory records for a room, copying count and price from the room."""
+    now = datetime.utcnow()
+    city = hotel.city or ""
+    city_key = normalize_city(hotel.city)
+    total_count = room.total_count
+    price = Decimal(room.base_price)
+    surge_factor = Decimal("1.0")
+    for i in range(days):
+        yield (
+            hotel.id,
+            room.id,
+            start_date + timedelta(days=i),
+            0,
+            0,
+            total_count,
+            surge_factor,
+            price,
+            city,
+            city_key,
+            False,
+            now,
+        )
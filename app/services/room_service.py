@@ -1,14 +1,20 @@
-from datetime import date, timedelta
+from datetime import date
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.models.hotel import Hotel
-from app.models.inventory import Inventory
 from app.models.room import Room
 from app.models.user import User
 from app.schemas.room import RoomCreate, RoomResponse, RoomUpdate
+from app.services.availability_engine import availability_engine
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.inventory_writer import InventoryWriter
+from app.services.search_cache import search_cache
+
+settings = get_settings()
 
 
 class RoomService:
@@ -18,7 +24,7 @@ class RoomService:
         self.db = db
 
     async def create_room(self, hotel_id: int, room_data: RoomCreate, owner: User) -> RoomResponse:
-        """Create a new room and generate inventory for 1 year."""
+        """Create a new room and generate inventory up to the configured horizon."""
         hotel = await self._get_owned_hotel(hotel_id, owner)
 
         room = Room(
@@ -35,8 +41,11 @@ class RoomService:
         await self.db.flush()
         await self.db.refresh(room)
 
-        # Generate inventory for the next 365 days
+        # Generate inventory for the booking horizon
         await self._create_inventory_for_room(room, hotel)
+        await HotelMinPriceService(self.db).refresh_hotel(hotel.id)
+        await search_cache.invalidate(self.db, hotel.city_key)
+        availability_engine.record_structure_change(self.db)
 
         return RoomResponse.model_validate(room)
 
@@ -79,9 +88,13 @@ class RoomService:
 
     async def delete_room(self, hotel_id: int, room_id: int, owner: User) -> None:
         """Delete a room."""
-        await self._get_owned_hotel(hotel_id, owner)
+        hotel = await self._get_owned_hotel(hotel_id, owner)
         room = await self._get_room(room_id, hotel_id)
         await self.db.delete(room)
+        await self.db.flush()
+        await HotelMinPriceService(self.db).refresh_hotel(hotel_id)
+        await search_cache.invalidate(self.db, hotel.city_key)
+        availability_engine.record_structure_change(self.db)
 
     async def _get_owned_hotel(self, hotel_id: int, owner: User) -> Hotel:
         """Get hotel ensuring ownership."""
@@ -107,26 +120,5 @@ class RoomService:
         return room
 
     async def _create_inventory_for_room(self, room: Room, hotel: Hotel) -> None:
-        """Create inventory entries for the next 365 days."""
-        today = date.today()
-        city = hotel.city or ""
-
-        inventories = []
-        for i in range(365):
-            inv_date = today + timedelta(days=i)
-            inventory = Inventory(
-                hotel_id=hotel.id,
-                room_id=room.id,
-                date=inv_date,
-                book_count=0,
-                reserved_count=0,
-                total_count=room.total_count,
-                surge_factor=1.0,
-                price=room.base_price,
-                city=city,
-                closed=False,
-            )
-            inventories.append(inventory)
-
-        self.db.add_all(inventories)
-        await self.db.flush()
+        """Create inventory entries for the next ``INVENTORY_HORIZON_DAYS`` days."""
+        await InventoryWriter(self.db).write_room_calendar(room, hotel, date.today(), settings.INVENTORY_HORIZON_DAYS)
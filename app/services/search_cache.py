@@ -0,0 +1,278 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.enums import HotelSearchSort
+from app.models.hotel import Hotel
+from app.schemas.hotel import HotelSearchPage
+from app.utils.cache import CacheStats, TTLCache
+from app.utils.on_commit import after_commit
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class SearchKey:
+    """Normalized parameters identifying one page of hotel search results."""
+
+    city_key: str
+    fuzzy: bool
+    check_in_date: date
+    check_out_date: date
+    rooms_count: int
+    sort: HotelSearchSort
+    limit: int
+    cursor: str | None
+    include_total: bool
+
+    @property
+    def token(self) -> str:
+        """Flat string form for shared backends."""
+        return (
+            f"search:{self.city_key}:{int(self.fuzzy)}:{self.check_in_date}:{self.check_out_date}:"
+            f"{self.rooms_count}:{self.sort.value}:{self.limit}:{self.cursor or ''}:{int(self.include_total)}"
+        )
+
+    def affected_by(self, city_key: str, start: date | None, end: date | None) -> bool:
+        """Whether a write to ``city_key`` between ``start`` and ``end`` can change this result."""
+        city_hit = self.city_key in city_key if self.fuzzy else city_key == self.city_key
+        if not city_hit:
+            return False
+        return (start is None or self.check_out_date >= start) and (end is None or self.check_in_date <= end)
+
+
+class SearchCacheBackend(ABC):
+    """Shared tier for search results, e.g. a Redis hash per city; values are opaque bytes."""
+
+    @abstractmethod
+    async def get(self, key: SearchKey) -> bytes | None:
+        """Return a stored value, or ``None`` when missing or expired."""
+
+    @abstractmethod
+    async def generation(self, key: SearchKey) -> int:
+        """Counter bumped by every ``invalidate`` that can affect ``key``."""
+
+    @abstractmethod
+    async def set(self, key: SearchKey, value: bytes, ttl_seconds: float, generation: int | None = None) -> bool:
+        """Store a value for ``ttl_seconds`` unless ``generation`` is no longer current.
+
+        The check and the write must be atomic (e.g. a Lua script on Redis). Returns whether
+        the value was stored.
+        """
+
+    @abstractmethod
+    async def invalidate(self, city_key: str, start: date | None, end: date | None) -> int:
+        """Drop every entry affected by a write to the city/date range and bump its generation;
+        returns how many entries were dropped."""
+
+
+class Generations:
+    """Invalidation counters: one per city for exact searches, one overall for fuzzy ones.
+
+    A fuzzy search can match any city containing its key, so it watches every invalidation.
+    """
+
+    def __init__(self):
+        self._cities: dict[str, int] = {}
+        self._all = 0
+
+    def get(self, key: SearchKey) -> int:
+        return self._all if key.fuzzy else self._cities.get(key.city_key, 0)
+
+    def bump(self, city_key: str) -> None:
+        self._cities[city_key] = self._cities.get(city_key, 0) + 1
+        self._all += 1
+
+
+class InMemorySearchCacheBackend(SearchCacheBackend):
+    """Process-local stand-in for a shared backend, used in tests and single-node setups."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, SearchKey, bytes]] = {}
+        self._generations = Generations()
+
+    async def get(self, key: SearchKey) -> bytes | None:
+        entry = self._data.get(key.token)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key.token]
+            return None
+        return value
+
+    async def generation(self, key: SearchKey) -> int:
+        return self._generations.get(key)
+
+    async def set(self, key: SearchKey, value: bytes, ttl_seconds: float, generation: int | None = None) -> bool:
+        if generation is not None and generation != self._generations.get(key):
+            return False
+        self._data[key.token] = (time.monotonic() + ttl_seconds, key, value)
+        return True
+
+    async def invalidate(self, city_key: str, start: date | None, end: date | None) -> int:
+        self._generations.bump(city_key)
+        stale = [token for token, (_, key, _) in self._data.items() if key.affected_by(city_key, start, end)]
+        for token in stale:
+            del self._data[token]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass
+class SearchCacheStats:
+    """Counters for both cache tiers."""
+
+    local: CacheStats
+    shared: CacheStats
+    invalidations: int = 0
+    # Pages computed while a write to their city committed, and therefore not stored
+    stale_sets: int = 0
+
+
+class SearchCache:
+    """Two-tier cache of hotel search pages.
+
+    A small LRU+TTL tier in each process sits in front of an optional shared backend. Writes
+    that change availability, prices or listing status call ``invalidate``: matching entries
+    are dropped immediately and again once the writing transaction commits, and each drop
+    bumps the city's generation. Callers take ``generation`` before querying and pass it to
+    ``set``, which skips pages whose city was invalidated in between, so a read racing the
+    write cannot store a stale page. Local TTLs are kept short because other processes'
+    invalidations only reach the shared tier.
+    """
+
+    def __init__(
+        self,
+        local_max_size: int,
+        local_ttl_seconds: float,
+        shared_ttl_seconds: float,
+        backend: SearchCacheBackend | None = None,
+    ):
+        self.local = TTLCache(local_max_size, local_ttl_seconds)
+        self.backend = backend
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.stats = SearchCacheStats(local=self.local.stats, shared=CacheStats())
+        self._generations = Generations()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(self, key: SearchKey) -> HotelSearchPage | None:
+        """Return a cached page from the nearest tier that has it."""
+        page = self.local.get(key)
+        if page is not None or self.backend is None:
+            return page
+
+        raw = await self.backend.get(key)
+        if raw is None:
+            self.stats.shared.misses += 1
+            return None
+        self.stats.shared.hits += 1
+        page = HotelSearchPage.model_validate_json(raw)
+        self.local.set(key, page)
+        return page
+
+    async def generation(self, key: SearchKey) -> tuple[int, int | None]:
+        """Snapshot of the local and shared generations for ``key``, taken before computing it."""
+        shared = await self.backend.generation(key) if self.backend is not None else None
+        return self._generations.get(key), shared
+
+    async def set(
+        self, key: SearchKey, page: HotelSearchPage, generation: tuple[int, int | None] | None = None
+    ) -> None:
+        """Store a page in both tiers, unless its city was invalidated since ``generation``."""
+        local, shared = generation or (None, None)
+
+        def current() -> bool:
+            if local is None or local == self._generations.get(key):
+                return True
+            self.stats.stale_sets += 1
+            return False
+
+        if not current():
+            return
+        if self.backend is not None:
+            if not await self.backend.set(key, page.model_dump_json().encode(), self.shared_ttl_seconds, shared):
+                self.stats.stale_sets += 1
+                return
+            # An invalidation landing during the write drops the shared entry itself
+            if not current():
+                return
+        self.local.set(key, page)
+
+    async def invalidate(
+        self, db: AsyncSession, city_key: str | None, start: date | None = None, end: date | None = None
+    ) -> None:
+        """Drop pages for a city/date range now and again after ``db`` commits.
+
+        ``start``/``end`` of ``None`` mean the range is open on that side.
+        """
+        if not city_key:
+            return
+        self.stats.invalidations += 1
+        await self._drop(city_key, start, end)
+        after_commit(db, lambda: self._after_commit(city_key, start, end))
+
+    async def invalidate_hotels(
+        self, db: AsyncSession, hotel_ids: Iterable[int], start: date | None = None, end: date | None = None
+    ) -> None:
+        """``invalidate`` for the cities of the given hotels."""
+        hotel_ids = list(hotel_ids)
+        if not hotel_ids:
+            return
+        result = await db.execute(select(Hotel.city_key).where(Hotel.id.in_(hotel_ids)).distinct())
+        for city_key in result.scalars().all():
+            await self.invalidate(db, city_key, start, end)
+
+    def clear(self) -> None:
+        """Drop every locally cached page and reset the counters."""
+        self.local.clear()
+        self.local.stats = CacheStats()
+        self.stats = SearchCacheStats(local=self.local.stats, shared=CacheStats())
+
+    async def _drop(self, city_key: str, start: date | None, end: date | None) -> None:
+        self._drop_local(city_key, start, end)
+        if self.backend is not None:
+            await self.backend.invalidate(city_key, start, end)
+
+    def _drop_local(self, city_key: str, start: date | None, end: date | None) -> None:
+        self._generations.bump(city_key)
+        for key in [k for k in self.local if k.affected_by(city_key, start, end)]:
+            self.local.pop(key)
+
+    def _after_commit(self, city_key: str, start: date | None, end: date | None) -> None:
+        """Repeat an invalidation once its transaction is durable."""
+        self._drop_local(city_key, start, end)
+        if self.backend is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.backend.invalidate(city_key, start, end))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def _build_backend(name: str) -> SearchCacheBackend | None:
+    if name == "memory":
+        return InMemorySearchCacheBackend()
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown search cache backend: {name}")
+
+
+search_cache = SearchCache(
+    local_max_size=settings.SEARCH_CACHE_LOCAL_MAX_SIZE,
+    local_ttl_seconds=settings.SEARCH_CACHE_LOCAL_TTL_SECONDS,
+    shared_ttl_seconds=settings.SEARCH_CACHE_SHARED_TTL_SECONDS,
+    backend=_build_backend(settings.SEARCH_CACHE_BACKEND),
+)
@@ -0,0 +1,241 @@
+import hashlib
+import logging
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.enums import HotelSearchSort
+from app.models.hotel import Hotel
+from app.models.hotel_min_price import HotelMinPrice
+from app.models.inventory import Inventory
+from app.schemas.hotel import HotelSearchPage, HotelSearchResult
+from app.services.availability_engine import AvailabilityEngine, availability_engine
+from app.services.search_cache import SearchCache, SearchKey, search_cache
+from app.utils.city import normalize_city
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_row_count
+from app.utils.single_flight import single_flight
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    """Service for public hotel search."""
+
+    def __init__(self, db: AsyncSession, cache: SearchCache | None = None, engine: AvailabilityEngine | None = None):
+        self.db = db
+        if cache is None and settings.SEARCH_CACHE_ENABLED:
+            cache = search_cache
+        if engine is None and settings.AVAILABILITY_ENGINE_ENABLED:
+            engine = availability_engine
+        self.cache = cache
+        self.engine = engine
+
+    async def search_hotels(
+        self,
+        city: str,
+        check_in_date: date,
+        check_out_date: date,
+        rooms_count: int = 1,
+        fuzzy: bool = False,
+        sort: HotelSearchSort = HotelSearchSort.MIN_PRICE,
+        limit: int = 20,
+        cursor: str | None = None,
+        include_total: bool = False,
+    ) -> HotelSearchPage:
+        """Return one page of active hotels with rooms available for every night.
+
+        Pages are ordered by ``(min_price, id)`` or ``id`` and continue from ``cursor`` with a
+        keyset predicate, so every page costs the same regardless of its position. Pages are
+        served from the search cache when one is configured, and concurrent identical searches
+        share one computation.
+        """
+        city_key = normalize_city(city)
+        if not city_key:
+            return HotelSearchPage(items=[], total_estimate=0 if include_total else None)
+
+        key = SearchKey(city_key, fuzzy, check_in_date, check_out_date, rooms_count, sort, limit, cursor, include_total)
+        if self.cache is None:
+            return await single_flight.read(self.db, key, lambda: self._search(key))
+
+        page = await self.cache.get(key)
+        if page is None:
+            page = await single_flight.read(self.db, key, lambda: self._search_and_cache(key))
+        return page
+
+    async def _search_and_cache(self, key: SearchKey) -> HotelSearchPage:
+        # Taken before the query so a write committing meanwhile keeps this page out of the cache
+        generation = await self.cache.generation(key)
+        page = await self._search(key)
+        await self.cache.set(key, page, generation)
+        return page
+
+    async def _search(self, key: SearchKey) -> HotelSearchPage:
+        """Compute one page, from the availability engine when it can answer and SQL otherwise."""
+        fingerprint = self._fingerprint(
+            key.city_key, key.check_in_date, key.check_out_date, key.rooms_count, key.fuzzy, key.sort
+        )
+        after = self._decode(key.cursor, fingerprint, key.sort) if key.cursor else None
+
+        matches = None
+        if self.engine is not None:
+            matches = await self._search_engine(key)
+        if matches is None:
+            rows, total_estimate = await self._query_summary(key, after)
+        else:
+            rows, total_estimate = await self._load_matches(key, after, matches)
+
+        items = [
+            HotelSearchResult(
+                id=hotel.id,
+                name=hotel.name,
+                city=hotel.city,
+                photos=hotel.photos,
+                amenities=hotel.amenities,
+                min_price=min_price,
+            )
+            for hotel, min_price in rows[: key.limit]
+        ]
+
+        next_cursor = None
+        if len(rows) > key.limit:
+            last = items[-1]
+            values = [str(last.min_price), last.id] if key.sort == HotelSearchSort.MIN_PRICE else [last.id]
+            next_cursor = encode_cursor({"q": fingerprint, "k": values})
+
+        return HotelSearchPage(items=items, next_cursor=next_cursor, total_estimate=total_estimate)
+
+    async def _search_engine(self, key: SearchKey) -> list[tuple[int, Decimal]] | None:
+        """Engine matches, or ``None`` if the engine cannot answer or fails.
+
+        A failing engine is invalidated so it reloads in the background and the search falls
+        back to SQL.
+        """
+        try:
+            await self.engine.sync(self.db)
+            return self.engine.search(key.city_key, key.fuzzy, key.check_in_date, key.check_out_date, key.rooms_count)
+        except Exception:
+            logger.exception("Availability engine search failed, falling back to SQL")
+            self.engine.invalidate()
+            return None
+
+    async def _query_summary(self, key: SearchKey, after: list | None) -> tuple[list, int | None]:
+        """Fetch up to ``limit + 1`` matching hotels from the per-day search summary."""
+        if key.fuzzy:
+            # Served by the pg_trgm GIN index on city_key
+            city_filter = HotelMinPrice.city_key.contains(key.city_key, autoescape=True)
+        else:
+            city_filter = HotelMinPrice.city_key == key.city_key
+
+        filters = [
+            city_filter,
+            HotelMinPrice.date >= key.check_in_date,
+            HotelMinPrice.date <= key.check_out_date,
+            HotelMinPrice.available_count >= key.rooms_count,
+        ]
+        if after is not None and key.sort == HotelSearchSort.ID:
+            filters.append(HotelMinPrice.hotel_id > after[-1])
+
+        # Find hotels with available rooms for every night using the per-day search summary
+        nights = (key.check_out_date - key.check_in_date).days + 1
+        subquery = (
+            select(HotelMinPrice.hotel_id, func.min(HotelMinPrice.price).label("min_price"))
+            .where(and_(*filters))
+            .group_by(HotelMinPrice.hotel_id)
+            .having(func.count(HotelMinPrice.id) >= nights)
+        )
+        if key.rooms_count > 1:
+            subquery = self._party_prices(key, subquery.with_only_columns(HotelMinPrice.hotel_id), nights)
+        subquery = subquery.subquery()
+        query = select(Hotel, subquery.c.min_price).join(subquery, Hotel.id == subquery.c.hotel_id)
+        query = query.where(Hotel.active == True)
+
+        total_estimate = None
+        if key.include_total:
+            total_estimate = await estimate_row_count(self.db, query)
+
+        if key.sort == HotelSearchSort.MIN_PRICE:
+            if after is not None:
+                query = query.where(tuple_(subquery.c.min_price, Hotel.id) > tuple_(*after))
+            query = query.order_by(subquery.c.min_price, Hotel.id)
+        else:
+            query = query.order_by(Hotel.id)
+
+        # One extra row tells whether another page exists
+        result = await self.db.execute(query.limit(key.limit + 1))
+        return result.all(), total_estimate
+
+    @staticmethod
+    def _party_prices(key: SearchKey, candidates, nights: int):
+        """Price hotels from inventory rows that can hold the whole party.
+
+        The summary's price is the cheapest room type with any room free, which may not fit
+        ``rooms_count`` rooms, so it only narrows the candidate hotels here.
+        """
+        return (
+            select(Inventory.hotel_id, func.min(Inventory.price).label("min_price"))
+            .where(
+                Inventory.hotel_id.in_(candidates),
+                Inventory.date >= key.check_in_date,
+                Inventory.date <= key.check_out_date,
+                Inventory.closed == False,
+                (Inventory.total_count - Inventory.book_count - Inventory.reserved_count) >= key.rooms_count,
+            )
+            .group_by(Inventory.hotel_id)
+            .having(func.count(func.distinct(Inventory.date)) >= nights)
+        )
+
+    async def _load_matches(
+        self, key: SearchKey, after: list | None, matches: list[tuple[int, Decimal]]
+    ) -> tuple[list, int | None]:
+        """Order and page engine matches in memory, then load only that page's hotels."""
+        if key.sort == HotelSearchSort.MIN_PRICE:
+            ordered = sorted((price, hotel_id) for hotel_id, price in matches)
+            if after is not None:
+                ordered = [m for m in ordered if m > tuple(after)]
+            page = [(hotel_id, price) for price, hotel_id in ordered[: key.limit + 1]]
+        else:
+            ordered = sorted(matches)
+            if after is not None:
+                ordered = [m for m in ordered if m[0] > after[-1]]
+            page = ordered[: key.limit + 1]
+
+        hotels = {}
+        if page:
+            result = await self.db.execute(select(Hotel).where(Hotel.id.in_([hotel_id for hotel_id, _ in page])))
+            hotels = {hotel.id: hotel for hotel in result.scalars().all()}
+        rows = [(hotels[hotel_id], price) for hotel_id, price in page if hotel_id in hotels]
+        return rows, len(matches) if key.include_total else None
+
+    @staticmethod
+    def _fingerprint(
+        city_key: str, check_in: date, check_out: date, rooms_count: int, fuzzy: bool, sort: HotelSearchSort
+    ) -> str:
+        """Short digest binding a cursor to the search it was issued for."""
+        raw = f"{city_key}|{check_in}|{check_out}|{rooms_count}|{fuzzy}|{sort.value}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _decode(cursor: str, fingerprint: str, sort: HotelSearchSort) -> list:
+        """Validate a cursor against the current search and return its keyset values."""
+        invalid = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        try:
+            values = decode_cursor(cursor)
+        except ValueError:
+            raise invalid from None
+
+        key = values.get("k")
+        if values.get("q") != fingerprint or not isinstance(key, list):
+            raise invalid
+        try:
+            if sort == HotelSearchSort.MIN_PRICE:
+                price, hotel_id = key
+                return [Decimal(price), int(hotel_id)]
+            (hotel_id,) = key
+            return [int(hotel_id)]
+        except (TypeError, ValueError, InvalidOperation):
+            raise invalid from None
@@ -1 +1,21 @@
 # Utils package
+from app.utils.cache import CacheStats, TTLCache
+from app.utils.city import normalize_city
+from app.utils.metrics import Histogram
+from app.utils.on_commit import after_commit, has_written
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_row_count
+from app.utils.single_flight import SingleFlight, single_flight
+
+__all__ = [
+    "CacheStats",
+    "TTLCache",
+    "normalize_city",
+    "after_commit",
+    "Histogram",
+    "has_written",
+    "decode_cursor",
+    "encode_cursor",
+    "estimate_row_count",
+    "SingleFlight",
+    "single_flight",
+]
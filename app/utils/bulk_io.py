@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
+from app.models.enums import BulkFormat
+from app.utils.fast_json import dumps
+
+MEDIA_TYPES = {BulkFormat.CSV: "text/csv", BulkFormat.NDJSON: "application/x-ndjson"}
+
+
+class BulkFormatError(ValueError):
+    """A line of a bulk payload could not be parsed."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+def format_for_media_type(media_type: str | None) -> BulkFormat | None:
+    """The bulk format for a ``Content-Type`` header, ignoring parameters such as ``charset``."""
+    media_type = (media_type or "").split(";", 1)[0].strip().lower()
+    if media_type in ("application/jsonl", "application/ndjson"):
+        return BulkFormat.NDJSON
+    return next((fmt for fmt, known in MEDIA_TYPES.items() if known == media_type), None)
+
+
+def _decode(number: int, line: bytes) -> str:
+    try:
+        return line.decode().rstrip("\r")
+    except UnicodeDecodeError as exc:
+        raise BulkFormatError(number, f"invalid UTF-8 at byte {exc.start + 1}") from exc
+
+
+async def read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Split a streamed UTF-8 body into ``(line_number, line)`` without buffering it whole."""
+    pending, number = b"", 0
+    async for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            number += 1
+            yield number, _decode(number, line)
+    if pending:
+        yield number + 1, _decode(number + 1, pending)
+
+
+async def read_records(chunks: AsyncIterable[bytes], file_format: BulkFormat) -> AsyncIterator[tuple[int, dict]]:
+    """Parse a streamed CSV (with a header line) or NDJSON body into ``(line_number, record)``.
+
+    Blank lines are skipped and empty CSV fields are returned as ``None``. CSV fields must not
+    contain line breaks.
+    """
+    header = None
+    async for number, line in read_lines(chunks):
+        if not line.strip():
+            continue
+        if file_format == BulkFormat.NDJSON:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise BulkFormatError(number, exc.msg) from exc
+            if not isinstance(record, dict):
+                raise BulkFormatError(number, "expected a JSON object")
+            yield number, record
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            raise BulkFormatError(number, f"expected {len(header)} fields, got {len(values)}")
+        yield number, {name: value or None for name, value in zip(header, values, strict=True)}
+
+
+def csv_line(values: Sequence) -> str:
+    """One CSV line; ``None`` becomes an empty field and booleans are lower case."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(
+        "" if value is None else str(value).lower() if isinstance(value, bool) else value for value in values
+    )
+    return buffer.getvalue()
+
+
+def ndjson_line(record: dict) -> str:
+    """One NDJSON line."""
+    return dumps(record).decode() + "\n"
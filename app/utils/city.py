@@ -0,0 +1,22 @@
+import re
+import unicodedata
+
+_SEPARATORS = re.compile(r"[^\w]+|_")
+
+
+def normalize_city(city: str | None) -> str:
+    """Return the canonical search key for a city name.
+
+    Accents are stripped, case is folded and punctuation collapses to single spaces, so
+    ``"São  Paulo"``, ``"sao-paulo"`` and ``"SAO PAULO"`` all map to ``"sao paulo"``.
+    """
+    if not city:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", city)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_SEPARATORS.sub(" ", stripped.casefold()).split())
+
+
+def city_key_default(context) -> str:
+    """Column default deriving ``city_key`` from the ``city`` being inserted."""
+    return normalize_city(context.get_current_parameters().get("city"))
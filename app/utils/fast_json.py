@@ -0,0 +1,70 @@
+import json
+from collections.abc import Iterable, Sequence
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson leaves to ``default`` (and stdlib json all of them) as pydantic does."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response whose body is already serialized."""
+
+    media_type = "application/json"
+
+
+class RowSerializer:
+    """Serializes rows shaped like a response schema straight to JSON.
+
+    The schema's field names are resolved once, so a response is one pass over Core tuples
+    (selected with ``columns``) or already-built objects, with no per-row model validation.
+    Output matches the schema's own JSON for plain scalar, date, Decimal and enum fields;
+    nested models are not supported.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        self._getter = attrgetter(*self.fields)
+
+    def columns(self, model: type) -> list:
+        """The ORM columns to select for this schema, in field order."""
+        return [getattr(model, name) for name in self.fields]
+
+    def dumps(self, rows: Iterable[Sequence]) -> bytes:
+        """JSON array of objects from rows holding values in field order."""
+        fields = self.fields
+        return dumps([dict(zip(fields, row, strict=True)) for row in rows])
+
+    def dumps_objects(self, objects: Iterable[Any]) -> bytes:
+        """JSON array of objects read attribute by attribute from ``objects``."""
+        fields, getter = self.fields, self._getter
+        if len(fields) == 1:
+            return dumps([{fields[0]: getter(obj)} for obj in objects])
+        return dumps([dict(zip(fields, getter(obj), strict=True)) for obj in objects])
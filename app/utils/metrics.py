@@ -0,0 +1,202 @@
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+# Seconds, spanning a pooled checkout through a slow query
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = tuple[str, dict[str, str], float]
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics (cumulative ``le`` buckets, sum, count)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """``(upper_bound, observations <= upper_bound)`` pairs, ending with ``+Inf``."""
+        pairs, running = [], 0
+        for bound, count in zip((*self.buckets, float("inf")), self._counts, strict=True):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def snapshot(self) -> dict:
+        """JSON-friendly view of the histogram."""
+        return {
+            "buckets": {_format_bound(bound): count for bound, count in self.cumulative()},
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+    def samples(self, labels: dict[str, str]) -> Iterator[Sample]:
+        """Exposition samples for this histogram under ``labels``."""
+        for bound, count in self.cumulative():
+            yield "_bucket", {**labels, "le": _format_bound(bound)}, count
+        yield "_sum", labels, self.sum
+        yield "_count", labels, self.count
+
+
+@dataclass
+class MetricFamily:
+    """One metric name with its type, help text and samples, ready to render."""
+
+    name: str
+    type: str
+    help: str
+    samples: list[Sample] = field(default_factory=list)
+
+
+class CounterVec:
+    """Monotonic counters keyed by label values."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def collect(self) -> Iterable[MetricFamily]:
+        samples = [("", dict(zip(self.labelnames, key, strict=True)), value) for key, value in self._values.items()]
+        yield MetricFamily(self.name, "counter", self.help, samples)
+
+
+class HistogramVec:
+    """Histograms keyed by label values, created on first use."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._histograms: dict[tuple[str, ...], Histogram] = {}
+
+    def labels(self, *labels: str) -> Histogram:
+        histogram = self._histograms.get(labels)
+        if histogram is None:
+            histogram = self._histograms[labels] = Histogram(self.buckets)
+        return histogram
+
+    def items(self) -> Iterable[tuple[tuple[str, ...], Histogram]]:
+        return self._histograms.items()
+
+    def clear(self) -> None:
+        self._histograms.clear()
+
+    def collect(self) -> Iterable[MetricFamily]:
+        family = MetricFamily(self.name, "histogram", self.help)
+        for key, histogram in self._histograms.items():
+            family.samples.extend(histogram.samples(dict(zip(self.labelnames, key, strict=True))))
+        yield family
+
+
+class MetricsRegistry:
+    """Process-wide metrics rendered in the Prometheus text exposition format.
+
+    Recording is a dict lookup and a few additions, so it is cheap enough for every request;
+    all formatting happens when ``/metrics`` is scraped.
+    """
+
+    def __init__(self):
+        self._collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> CounterVec:
+        counter = CounterVec(name, help, labelnames)
+        self.register(counter.collect)
+        return counter
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> HistogramVec:
+        histogram = HistogramVec(name, help, labelnames, buckets)
+        self.register(histogram.collect)
+        return histogram
+
+    def register(self, collect: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Add a callable producing metric families at scrape time, e.g. pool gauges."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for collect in self._collectors:
+            for family in collect():
+                lines.append(f"# HELP {family.name} {family.help}")
+                lines.append(f"# TYPE {family.name} {family.type}")
+                for suffix, labels, value in family.samples:
+                    lines.append(f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+service_call_seconds = registry.histogram(
+    "service_call_duration_seconds", "Service method latency.", ("service", "method")
+)
+service_call_errors = registry.counter(
+    "service_call_errors_total", "Service method calls that raised.", ("service", "method", "exception")
+)
+
+
+def instrument(cls: type) -> type:
+    """Class decorator timing every public coroutine method into ``service_call_duration_seconds``."""
+    for name, method in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(method):
+            setattr(cls, name, _timed(cls.__name__, name, method))
+    return cls
+
+
+def _timed(service: str, name: str, method: Callable) -> Callable:
+    histogram = service_call_seconds.labels(service, name)
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception as exc:
+            service_call_errors.inc(service, name, type(exc).__name__)
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else str(bound)
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
@@ -0,0 +1,54 @@
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+_PENDING_KEY = "after_commit_callbacks"
+_WROTE_KEY = "wrote_in_transaction"
+
+
+def after_commit(db: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits; drop it on rollback.
+
+    Callbacks run synchronously inside the commit, so they must not do I/O themselves; schedule
+    a task on the running loop for anything that needs to await. ``db`` may also be the sync
+    ``Session`` handed to ORM event listeners.
+    """
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info.setdefault(_PENDING_KEY, []).append(callback)
+
+
+def has_written(db: AsyncSession) -> bool:
+    """Whether the session's current transaction has pending, flushed or executed writes."""
+    session = db.sync_session
+    return bool(session.new or session.dirty or session.deleted or session.info.get(_WROTE_KEY))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_PENDING_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_callbacks(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_write(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_mark(session: Session) -> None:
+    session.info.pop(_WROTE_KEY, None)
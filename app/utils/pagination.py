@@ -0,0 +1,53 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from sqlalchemy import Select, bindparam, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Renders ``:name`` placeholders, which ``text()`` binds back as parameters
+_NAMED_PARAMS_DIALECT = postgresql.dialect(paramstyle="named")
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """Pack keyset values into an opaque, URL-safe continuation token."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """Unpack a token from ``encode_cursor``; raises ``ValueError`` if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, dict):
+        raise ValueError("Malformed cursor")
+    return values
+
+
+async def estimate_row_count(db: AsyncSession, stmt: Select) -> int:
+    """Return the planner's row estimate for ``stmt`` without executing it.
+
+    Values stay bound parameters; user input is never rendered into the SQL string.
+    """
+    compiled = stmt.compile(dialect=_NAMED_PARAMS_DIALECT, compile_kwargs={"render_postcompile": True})
+    explain = text("EXPLAIN (FORMAT JSON) " + compiled.string).bindparams(
+        *(bindparam(name, value, type_=_bind_type(compiled, name)) for name, value in compiled.params.items())
+    )
+    result = await db.execute(explain)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _bind_type(compiled, name: str):
+    """Type of bound parameter ``name``, including the ``name_1``.. parameters of an expanded IN."""
+    bind = compiled.binds.get(name)
+    if bind is None:
+        bind = compiled.binds.get(name.rpartition("_")[0])
+    return bind.type if bind is not None else None
@@ -0,0 +1,75 @@
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.utils.metrics import Histogram
+
+# Connections in use, sampled at each checkout
+CHECKED_OUT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout counters and histograms for one connection pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    overflow_peak: int = 0
+    wait_seconds: Histogram = field(default_factory=Histogram)
+    checked_out: Histogram = field(default_factory=lambda: Histogram(CHECKED_OUT_BUCKETS))
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records how long each checkout waited and how busy it was.
+
+    Wait time covers queueing for a free connection and opening a new one, which is what a
+    request actually pays when the pool is undersized.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait_seconds.observe(time.perf_counter() - start)
+        self.metrics.checkouts += 1
+        self.metrics.checked_out.observe(self.checkedout())
+        self.metrics.overflow_peak = max(self.metrics.overflow_peak, self.overflow())
+        return connection
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_status(pool: Pool) -> dict:
+    """Live gauges and, for instrumented pools, checkout metrics."""
+    status: dict = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        # overflow() counts up from -pool_size until the pool has opened all its connections
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            overflow_peak=metrics.overflow_peak,
+            wait_seconds=metrics.wait_seconds.snapshot(),
+            checked_out_at_checkout=metrics.checked_out.snapshot(),
+        )
+    return status
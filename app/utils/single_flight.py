@@ -0,0 +1,127 @@
+import asyncio
+import copy
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.sql import Select
+
+from app.config import get_settings
+from app.utils.on_commit import has_written
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """How many calls ran their own computation and how many joined one in flight."""
+
+    executed: int = 0
+    shared: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight computation.
+
+    The first caller (the leader) runs the computation; callers arriving while it is in flight
+    await its result instead of taking their own pooled connection. Results and exceptions are
+    shared, so values must be treated as read-only. Nothing is kept once the leader finishes,
+    and a follower whose leader is cancelled runs the computation itself.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stats = SingleFlightStats()
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await fn()``, sharing one execution among concurrent callers of ``key``."""
+        if not self.enabled:
+            return await fn()
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.stats.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.do(key, fn)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.stats.executed += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an exception nobody else awaited is not logged at GC
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    async def read(self, db: AsyncSession, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """``do`` for a computation reading through ``db``; runs unshared if ``db`` has written.
+
+        A session with uncommitted writes must keep seeing its own changes, so it neither leads
+        nor joins a shared read. Calls only share with sessions on the same engine, so a
+        primary session never gets a result read from a lagging replica.
+        """
+        if not can_share(db):
+            return await fn()
+        return await self.do(_bound_key(db, key), fn)
+
+    async def scalar_one_or_none(self, db: AsyncSession, key: Hashable, statement: Select) -> Any | None:
+        """Coalesced single-entity SELECT; every caller gets the row attached to its own session.
+
+        The leader's row is shared as a column snapshot and merged into each session without
+        a query, as the principal cache does. Never pass locking (``FOR UPDATE``) statements.
+        """
+        if not self.enabled or not can_share(db):
+            return (await db.execute(statement)).scalar_one_or_none()
+
+        async def load() -> tuple[type, dict] | None:
+            row = (await db.execute(statement)).scalar_one_or_none()
+            return None if row is None else (type(row), _snapshot(row))
+
+        shared = await self.do(_bound_key(db, key), load)
+        if shared is None:
+            return None
+        model, snapshot = shared
+        row = model(**copy.deepcopy(snapshot))
+        make_transient_to_detached(row)
+        return await db.merge(row, load=False)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def can_share(db: AsyncSession) -> bool:
+    """Whether ``db`` reads the same committed state as other sessions, i.e. has not written."""
+    return not has_written(db)
+
+
+def _bound_key(db: AsyncSession, key: Hashable) -> Hashable:
+    """Scope ``key`` to the engine ``db`` reads from."""
+    return db.get_bind(), key
+
+
+def _snapshot(row: Any) -> dict:
+    return {attr.key: copy.deepcopy(getattr(row, attr.key)) for attr in inspect(row).mapper.column_attrs}
+
+
+single_flight = SingleFlight(enabled=settings.SINGLE_FLIGHT_ENABLED)
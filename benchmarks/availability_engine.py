@@ -0,0 +1,132 @@
+"""Hotel search latency from the SQL summary path versus the in-memory availability engine.
+
+Seeds ``--hotels`` hotels with two room types and ``--days`` days of inventory into the
+configured database under a throwaway owner, runs the same searches through both paths and
+removes the seeded rows afterwards. Requires NumPy.
+
+    python -m benchmarks.availability_engine --hotels 10000 --days 365 --searches 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.database import async_session_maker
+from app.models.user import User
+from app.services.availability_engine import AvailabilityEngine
+from app.services.hotel_min_price_service import HotelMinPriceService
+from app.services.search_service import SearchService
+
+_OWNER_EMAIL = "availability-engine-bench@example.com"
+_CITIES = 20
+
+
+async def _seed(hotels: int, days: int) -> int:
+    async with async_session_maker() as db:
+        owner = User(email=_OWNER_EMAIL, password="-", roles=["HOTEL_MANAGER"])
+        db.add(owner)
+        await db.flush()
+        params = {"owner_id": owner.id, "hotels": hotels, "cities": _CITIES, "days": days}
+        await db.execute(
+            text(
+                "INSERT INTO hotel (name, city, city_key, active, created_at, updated_at, owner_id) "
+                "SELECT 'Bench ' || n, 'Bench City ' || (n % :cities), 'bench city ' || (n % :cities), "
+                "true, now(), now(), :owner_id FROM generate_series(1, :hotels) AS n"
+            ),
+            params,
+        )
+        await db.execute(
+            text(
+                "INSERT INTO room (type, base_price, total_count, capacity, created_at, updated_at, hotel_id) "
+                "SELECT t.type, t.price, t.total, 2, now(), now(), h.id FROM hotel h "
+                "CROSS JOIN (VALUES ('Standard', 100, 3), ('Suite', 250, 1)) AS t(type, price, total) "
+                "WHERE h.owner_id = :owner_id"
+            ),
+            params,
+        )
+        # Some nights are sold out or closed so the searches have something to filter
+        await db.execute(
+            text(
+                "INSERT INTO inventory (hotel_id, room_id, date, total_count, book_count, reserved_count, "
+                "surge_factor, price, city, city_key, closed, created_at, updated_at) "
+                "SELECT r.hotel_id, r.id, current_date + d, r.total_count, "
+                "CASE WHEN (r.id + d) % 7 = 0 THEN r.total_count ELSE 0 END, 0, 1.0, "
+                "r.base_price + (r.id * 31 + d) % 50, h.city, h.city_key, (r.id + d) % 29 = 0, now(), now() "
+                "FROM room r JOIN hotel h ON h.id = r.hotel_id "
+                "CROSS JOIN generate_series(0, :days - 1) AS d WHERE h.owner_id = :owner_id"
+            ),
+            params,
+        )
+        await HotelMinPriceService(db).refresh_hotels(None)
+        await db.commit()
+        await db.execute(text("ANALYZE inventory"))
+        await db.execute(text("ANALYZE hotel_min_price"))
+        return owner.id
+
+
+async def _cleanup(owner_id: int) -> None:
+    async with async_session_maker() as db:
+        hotels = "SELECT id FROM hotel WHERE owner_id = :owner_id"
+        for table in ("hotel_min_price", "inventory", "room"):
+            await db.execute(text(f"DELETE FROM {table} WHERE hotel_id IN ({hotels})"), {"owner_id": owner_id})
+        await db.execute(text("DELETE FROM hotel WHERE owner_id = :owner_id"), {"owner_id": owner_id})
+        await db.execute(text("DELETE FROM app_user WHERE id = :owner_id"), {"owner_id": owner_id})
+        await db.commit()
+
+
+async def _time(engine: AvailabilityEngine | None, queries: list[tuple]) -> list[float]:
+    latencies = []
+    async with async_session_maker() as db:
+        service = SearchService(db)
+        service.cache, service.engine = None, engine
+        for city, check_in, check_out, rooms_count in queries:
+            start = time.perf_counter()
+            await service.search_hotels(city, check_in, check_out, rooms_count)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1]
+
+
+async def run(hotels: int, days: int, searches: int) -> None:
+    start = time.perf_counter()
+    owner_id = await _seed(hotels, days)
+    print(f"seeded {hotels} hotels x {days} days in {time.perf_counter() - start:.1f}s")
+    try:
+        engine = AvailabilityEngine(days=days)
+        start = time.perf_counter()
+        await engine.load()
+        print(f"engine: loaded {engine.stats.rooms} rooms in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(0)
+        today = date.today()
+        queries = []
+        for _ in range(searches):
+            check_in = today + timedelta(days=rng.randrange(days - 14))
+            check_out = check_in + timedelta(days=rng.randint(1, 7))
+            queries.append((f"Bench City {rng.randrange(_CITIES)}", check_in, check_out, rng.randint(1, 2)))
+
+        for label, path in (("sql", None), ("engine", engine)):
+            latencies = await _time(path, queries)
+            print(
+                f"{label:>7}: {searches} searches p50={_percentile(latencies, 50):.1f}ms "
+                f"p99={_percentile(latencies, 99):.1f}ms max={max(latencies):.1f}ms"
+            )
+    finally:
+        await _cleanup(owner_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hotels", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--searches", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.hotels, args.days, args.searches))
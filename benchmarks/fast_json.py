@@ -0,0 +1,103 @@
+"""Room inventory response latency through the response-model path versus the fast JSON path.
+
+Seeds one room with ``--days`` days of inventory into the configured database under a throwaway
+owner, requests the whole calendar through the ASGI app with ``FAST_JSON_RESPONSES`` off and on,
+and removes the seeded rows afterwards.
+
+    python -m benchmarks.fast_json --days 365 --requests 300
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.main import app
+from app.models.hotel import Hotel
+from app.models.room import Room
+from app.models.user import User
+from app.security.jwt import create_access_token
+
+_OWNER_EMAIL = "fast-json-bench@example.com"
+
+
+async def _seed(days: int) -> tuple[int, int]:
+    async with async_session_maker() as db:
+        owner = User(email=_OWNER_EMAIL, password="-", roles=["HOTEL_MANAGER"])
+        db.add(owner)
+        await db.flush()
+        hotel = Hotel(name="Bench", city="Bench City", active=True, owner_id=owner.id)
+        db.add(hotel)
+        await db.flush()
+        room = Room(type="Standard", base_price=100, total_count=5, capacity=2, hotel_id=hotel.id)
+        db.add(room)
+        await db.flush()
+        await db.execute(
+            text(
+                "INSERT INTO inventory (hotel_id, room_id, date, total_count, book_count, reserved_count, "
+                "surge_factor, price, city, city_key, closed, created_at, updated_at) "
+                "SELECT :hotel_id, :room_id, current_date + d, 5, d % 3, 0, 1.0, 100 + d % 40, "
+                "'Bench City', 'bench city', d % 29 = 0, now(), now() FROM generate_series(0, :days - 1) AS d"
+            ),
+            {"hotel_id": hotel.id, "room_id": room.id, "days": days},
+        )
+        await db.commit()
+        return owner.id, room.id
+
+
+async def _cleanup(owner_id: int) -> None:
+    async with async_session_maker() as db:
+        hotels = "SELECT id FROM hotel WHERE owner_id = :owner_id"
+        for table in ("hotel_min_price", "inventory", "room"):
+            await db.execute(text(f"DELETE FROM {table} WHERE hotel_id IN ({hotels})"), {"owner_id": owner_id})
+        await db.execute(text("DELETE FROM hotel WHERE owner_id = :owner_id"), {"owner_id": owner_id})
+        await db.execute(text("DELETE FROM app_user WHERE id = :owner_id"), {"owner_id": owner_id})
+        await db.commit()
+
+
+async def _time(client: AsyncClient, url: str, headers: dict, requests: int) -> tuple[list[float], int]:
+    latencies, size = [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+        size = len(response.content)
+    return latencies, size
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1]
+
+
+async def run(days: int, requests: int) -> None:
+    settings = get_settings()
+    owner_id, room_id = await _seed(days)
+    try:
+        url = f"/admin/inventory/rooms/{room_id}?end_date=9999-12-31"
+        headers = {"Authorization": f"Bearer {create_access_token(owner_id, ['HOTEL_MANAGER'])}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for label, fast in (("model", False), ("fast", True)):
+                settings.FAST_JSON_RESPONSES = fast
+                await _time(client, url, headers, 10)
+                latencies, size = await _time(client, url, headers, requests)
+                print(
+                    f"{label:>5}: {requests} requests of {size} bytes p50={_percentile(latencies, 50):.2f}ms "
+                    f"p99={_percentile(latencies, 99):.2f}ms mean={statistics.fmean(latencies):.2f}ms"
+                )
+    finally:
+        settings.FAST_JSON_RESPONSES = False
+        await _cleanup(owner_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(run(args.days, args.requests))
@@ -0,0 +1,67 @@
+"""Latency of an unrelated endpoint while a burst of password checks runs in the same worker.
+
+Compares the blocking ``verify_password`` (what login used to call) with ``verify_password_async``.
+The probe hits ``GET /`` through the ASGI app, so no database is needed.
+
+    python -m benchmarks.login_storm --logins 40 --probes 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.security.password import hash_password, verify_password, verify_password_async
+
+
+async def _probe(client: AsyncClient, count: int, interval: float, latencies: list[float]) -> None:
+    # Latency is measured from each request's scheduled send time, so time spent waiting for a
+    # blocked event loop counts against the request instead of being silently skipped.
+    first = time.perf_counter()
+    for i in range(count):
+        scheduled = first + i * interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        response = await client.get("/")
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+        assert response.status_code == 200
+
+
+async def _storm(hashed: str, logins: int, use_async: bool) -> None:
+    async def login() -> None:
+        if use_async:
+            await verify_password_async("password123", hashed)
+        else:
+            verify_password("password123", hashed)
+        await asyncio.sleep(0)
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1]
+
+
+async def run(logins: int, probes: int) -> None:
+    hashed = hash_password("password123")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, use_async in (("blocking", False), ("async pool", True)):
+            latencies: list[float] = []
+            start = time.perf_counter()
+            await asyncio.gather(_probe(client, probes, 0.01, latencies), _storm(hashed, logins, use_async))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:>10}: {logins} logins, GET / p50={_percentile(latencies, 50):.1f}ms "
+                f"p99={_percentile(latencies, 99):.1f}ms max={max(latencies):.1f}ms total={elapsed:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--probes", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.probes))
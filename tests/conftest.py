@@ -1,5 +1,6 @@
 import asyncio
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Callable, Generator
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager
 
 import pytest
 import pytest_asyncio
@@ -8,11 +9,15 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
-from app.database import Base, get_db
+from app.database import Base, get_db, get_primary_read_db, get_read_db, get_read_session_factory
 from app.main import app
+from app.middleware.query_stats import QueryStats, count_queries
 from app.models.enums import Role
+from app.payments.gateway import FakePaymentGateway, get_payment_gateway
 from app.security.jwt import create_access_token
 from app.security.password import hash_password
+from app.security.principal_cache import principal_cache
+from app.services.search_cache import search_cache
 
 # Test database URL - uses same database with test_ prefix
 settings = get_settings()
@@ -58,13 +63,41 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield db_session
 
+    @asynccontextmanager
+    async def shared_session():
+        yield db_session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_primary_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: shared_session
+    app.dependency_overrides[get_payment_gateway] = lambda: FakePaymentGateway()
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
     app.dependency_overrides.clear()
+    principal_cache.clear()
+    search_cache.clear()
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """Fail if the block runs more than ``limit`` SQL statements, e.g. one request via ``client``.
+
+    Fixture setup and other code inside the block count too, so keep only the call under test
+    in it.
+    """
+
+    @contextmanager
+    def check(limit: int) -> Generator[QueryStats, None, None]:
+        with count_queries(keep_statements=True) as stats:
+            yield stats
+        statements = "\n".join(f"  {statement}" for statement in stats.statements)
+        assert stats.count <= limit, f"{stats.count} queries, expected at most {limit}:\n{statements}"
+
+    return check
 
 
 @pytest_asyncio.fixture
@@ -112,6 +145,15 @@ async def manager_auth_headers(test_hotel_manager):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def internal_headers(monkeypatch):
+    """Configure INTERNAL_API_TOKEN and get headers carrying it."""
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "INTERNAL_API_TOKEN", "test-internal-token")
+    return {"Authorization": "Bearer test-internal-token"}
+
+
 @pytest_asyncio.fixture
 async def test_hotel(db_session: AsyncSession, test_hotel_manager):
     """Create a test hotel."""
@@ -100,3 +100,18 @@ class TestAuthRefresh:
         response = await client.post("/auth/refresh")
 
         assert response.status_code in (401, 422)
+
+
+class TestPasswordHashing:
+    """Tests for the async password hashing helpers."""
+
+    @pytest.mark.asyncio
+    async def test_async_hash_and_verify_round_trip(self):
+        """Test hashes made on the pool verify with both the sync and async helpers."""
+        from app.security.password import hash_password_async, verify_password, verify_password_async
+
+        hashed = await hash_password_async("s3cret-pass")
+
+        assert verify_password("s3cret-pass", hashed)
+        assert await verify_password_async("s3cret-pass", hashed)
+        assert not await verify_password_async("wrong-pass", hashed)
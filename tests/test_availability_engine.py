@@ -0,0 +1,317 @@
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from tests.conftest import TestAsyncSessionLocal
+
+pytest.importorskip("numpy")
+
+
+@pytest_asyncio.fixture
+async def engine(monkeypatch):
+    """The shared availability engine, enabled and reading from the test database."""
+    from app.config import get_settings
+    from app.services.availability_engine import availability_engine
+
+    monkeypatch.setattr(get_settings(), "AVAILABILITY_ENGINE_ENABLED", True)
+    monkeypatch.setattr(availability_engine, "session_maker", TestAsyncSessionLocal)
+    monkeypatch.setattr(availability_engine, "days", 30)
+    yield availability_engine
+    if availability_engine._reload is not None:
+        await availability_engine._reload
+    availability_engine.ready = False
+
+
+async def _seed(db_session, owner_id: int) -> list[int]:
+    """Three hotels in one city with different capacity, closures and prices."""
+    from app.models.hotel import Hotel
+    from app.models.inventory import Inventory
+    from app.models.room import Room
+    from app.services.hotel_min_price_service import HotelMinPriceService
+
+    today = date.today()
+    layouts = [
+        # (city, active, [(total_count, price, closed_day)])
+        ("Lyon", True, [(1, 120, None), (3, 150, None)]),
+        ("Lyon", True, [(2, 90, 2)]),
+        ("Lyon", False, [(5, 50, None)]),
+        ("Lyon Sud", True, [(2, 70, None)]),
+    ]
+    hotel_ids = []
+    for i, (city, active, rooms) in enumerate(layouts):
+        hotel = Hotel(name=f"Hotel {i}", city=city, active=active, owner_id=owner_id)
+        db_session.add(hotel)
+        await db_session.flush()
+        for total_count, price, closed_day in rooms:
+            room = Room(hotel_id=hotel.id, type="Standard", base_price=price, total_count=total_count, capacity=2)
+            db_session.add(room)
+            await db_session.flush()
+            for d in range(10):
+                db_session.add(
+                    Inventory(
+                        hotel_id=hotel.id,
+                        room_id=room.id,
+                        date=today + timedelta(days=d),
+                        total_count=total_count,
+                        price=price + d,
+                        city=city,
+                        closed=d == closed_day,
+                    )
+                )
+        hotel_ids.append(hotel.id)
+    await db_session.flush()
+    await HotelMinPriceService(db_session).refresh_hotels(hotel_ids)
+    await db_session.commit()
+    return hotel_ids
+
+
+class TestAvailabilityEngine:
+    """Tests for the in-memory availability engine."""
+
+    @pytest.mark.asyncio
+    async def test_matches_sql_search(self, engine, test_user, db_session):
+        """Test engine answers equal the SQL summary search for a spread of queries."""
+        from app.services.search_service import SearchService
+
+        await _seed(db_session, test_user.id)
+        await engine.load()
+        assert await engine.verify() == 0
+
+        today = date.today()
+        sql = SearchService(db_session, cache=None, engine=None)
+        sql.cache = sql.engine = None
+        queries = [
+            ("lyon", False, 0, 1, 1),
+            ("lyon", False, 0, 4, 2),
+            ("lyon", False, 3, 5, 3),
+            ("lyon", True, 0, 1, 1),
+            ("lyon", False, 25, 29, 1),
+            ("paris", False, 0, 1, 1),
+        ]
+        for city_key, fuzzy, first, last, rooms_count in queries:
+            check_in, check_out = today + timedelta(days=first), today + timedelta(days=last)
+            page = await sql.search_hotels(city_key, check_in, check_out, rooms_count, fuzzy, limit=100)
+            expected = sorted((h.id, h.min_price) for h in page.items)
+
+            assert sorted(engine.search(city_key, fuzzy, check_in, check_out, rooms_count)) == expected
+
+    @pytest.mark.asyncio
+    async def test_search_follows_committed_bookings(
+        self, client: AsyncClient, auth_headers, engine, test_hotel, test_room, db_session
+    ):
+        """Test bookings and cancellations are applied to the engine on commit."""
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for d in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=d),
+                    total_count=1,
+                    price=100,
+                    city="Test City",
+                )
+            )
+        await db_session.commit()
+        await engine.load()
+
+        params = {
+            "city": "Test City",
+            "check_in_date": today.isoformat(),
+            "check_out_date": (today + timedelta(days=1)).isoformat(),
+        }
+        booking = {
+            "hotel_id": test_hotel.id,
+            "room_id": test_room.id,
+            "check_in_date": params["check_in_date"],
+            "check_out_date": params["check_out_date"],
+            "rooms_count": 1,
+        }
+        searches = engine.stats.searches
+
+        response = await client.post("/bookings/init", headers=auth_headers, json=booking)
+        assert response.status_code == 200
+        booking_id = response.json()["id"]
+        await db_session.commit()
+
+        response = await client.get("/hotels/search", params=params)
+        assert response.json() == []
+        assert engine.stats.searches == searches + 1
+        assert await engine.verify() == 0
+
+        response = await client.post(f"/bookings/{booking_id}/cancel", headers=auth_headers)
+        assert response.status_code == 204
+        await db_session.commit()
+
+        response = await client.get("/hotels/search", params=params)
+        assert [h["id"] for h in response.json()] == [test_hotel.id]
+        assert await engine.verify() == 0
+
+    @pytest.mark.asyncio
+    async def test_structure_change_reloads(
+        self, client: AsyncClient, manager_auth_headers, engine, test_hotel, db_session
+    ):
+        """Test a new room takes the engine offline until its background reload finishes."""
+        await engine.load()
+        loads = engine.stats.loads
+
+        response = await client.post(
+            f"/admin/hotels/{test_hotel.id}/rooms",
+            headers=manager_auth_headers,
+            json={"type": "Standard", "base_price": 120, "total_count": 3, "capacity": 2},
+        )
+        assert response.status_code == 201
+        await db_session.commit()
+        assert not engine.ready
+
+        # SQL answers while the engine reloads
+        today = date.today()
+        params = {"city": "Test City", "check_in_date": today.isoformat(), "check_out_date": today.isoformat()}
+        response = await client.get("/hotels/search", params=params)
+        assert [h["id"] for h in response.json()] == [test_hotel.id]
+
+        await engine._reload
+        assert engine.ready
+        assert engine.stats.loads == loads + 1
+        assert engine.search("test city", False, today, today, 3) == [(test_hotel.id, 120)]
+
+    @pytest.mark.asyncio
+    async def test_search_catches_up_with_other_workers(
+        self, client: AsyncClient, engine, test_hotel, test_room, db_session, monkeypatch
+    ):
+        """Test writes committed elsewhere reach the engine before it answers a search."""
+        from sqlalchemy import update
+
+        from app.models.inventory import Inventory
+        from app.models.room import Room
+
+        monkeypatch.setattr(engine, "sync_seconds", 0)
+        today = date.today()
+        for d in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=d),
+                    total_count=1,
+                    price=100,
+                    city="Test City",
+                )
+            )
+        await db_session.commit()
+        await engine.load()
+
+        # Another worker takes the last room; only the database sees it
+        async with TestAsyncSessionLocal() as other:
+            await other.execute(
+                update(Inventory).where(Inventory.room_id == test_room.id, Inventory.date == today).values(book_count=1)
+            )
+            await other.commit()
+
+        params = {"city": "Test City", "check_in_date": today.isoformat(), "check_out_date": today.isoformat()}
+        searches, syncs = engine.stats.searches, engine.stats.syncs
+        response = await client.get("/hotels/search", params=params)
+        assert response.json() == []
+        assert engine.stats.searches == searches + 1
+        assert engine.stats.syncs == syncs + 1
+        assert await engine.verify() == 0
+
+        # A room added elsewhere reloads the engine
+        async with TestAsyncSessionLocal() as other:
+            other.add(Room(hotel_id=test_hotel.id, type="Suite", base_price=300, total_count=1, capacity=2))
+            await other.commit()
+        await engine.sync(db_session)
+        assert not engine.ready
+        await engine._reload
+        assert engine.ready
+
+    @pytest.mark.asyncio
+    async def test_large_counts_and_prices(
+        self, client: AsyncClient, engine, test_hotel, test_room, db_session, monkeypatch
+    ):
+        """Test counts and prices beyond 16/32-bit ranges load, sync and search correctly."""
+        from decimal import Decimal
+
+        from sqlalchemy import update
+
+        from app.models.inventory import Inventory
+
+        monkeypatch.setattr(engine, "sync_seconds", 0)
+        today = date.today()
+        for d in range(2):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=d),
+                    total_count=40000,
+                    price=Decimal("99999999.99"),
+                    city="Test City",
+                )
+            )
+        await db_session.commit()
+        await engine.load()
+        assert await engine.verify() == 0
+        tomorrow = today + timedelta(days=1)
+        assert engine.search("test city", False, today, tomorrow, 40000) == [(test_hotel.id, Decimal("99999999.99"))]
+
+        # Another worker writes values at the top of the column ranges
+        async with TestAsyncSessionLocal() as other:
+            await other.execute(
+                update(Inventory)
+                .where(Inventory.room_id == test_room.id)
+                .values(total_count=2**31 - 1, book_count=2**31 - 1, reserved_count=0, price=Decimal("21474836.48"))
+            )
+            await other.execute(
+                update(Inventory)
+                .where(Inventory.room_id == test_room.id, Inventory.date == tomorrow)
+                .values(book_count=0)
+            )
+            await other.commit()
+
+        params = {"city": "Test City", "check_in_date": tomorrow.isoformat(), "check_out_date": tomorrow.isoformat()}
+        searches = engine.stats.searches
+        response = await client.get("/hotels/search", params=params)
+        assert response.status_code == 200
+        assert Decimal(response.json()[0]["min_price"]) == Decimal("21474836.48")
+        assert engine.stats.searches == searches + 1
+        assert engine.search("test city", False, today, today, 1) == []
+        assert await engine.verify() == 0
+
+    @pytest.mark.asyncio
+    async def test_search_falls_back_to_sql_when_engine_fails(
+        self, client: AsyncClient, engine, test_hotel, test_room, db_session, monkeypatch
+    ):
+        """Test an engine error invalidates the engine and the search is answered from SQL."""
+        from app.models.inventory import Inventory
+        from app.services.hotel_min_price_service import HotelMinPriceService
+
+        today = date.today()
+        db_session.add(
+            Inventory(
+                hotel_id=test_hotel.id, room_id=test_room.id, date=today, total_count=1, price=100, city="Test City"
+            )
+        )
+        await db_session.flush()
+        await HotelMinPriceService(db_session).refresh_hotels([test_hotel.id])
+        await db_session.commit()
+        await engine.load()
+        loads = engine.stats.loads
+
+        def fail(*args, **kwargs):
+            raise OverflowError("out of bounds")
+
+        monkeypatch.setattr(engine, "search", fail)
+        params = {"city": "Test City", "check_in_date": today.isoformat(), "check_out_date": today.isoformat()}
+        response = await client.get("/hotels/search", params=params)
+        assert response.status_code == 200
+        assert [h["id"] for h in response.json()] == [test_hotel.id]
+
+        # The failed engine was reloaded in the background
+        await engine._reload
+        assert engine.ready
+        assert engine.stats.loads == loads + 1
@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import UTC, date, timedelta
 from decimal import Decimal
 
 import pytest
@@ -167,6 +167,99 @@ class TestCancelBooking:
 
         assert response.status_code == 204
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("booking_status", "reserved", "booked", "expected"),
+        [
+            ("RESERVED", 1, 0, (0, 0)),
+            ("CONFIRMED", 0, 1, (0, 0)),
+            ("EXPIRED", 0, 0, (0, 0)),
+            ("CANCELLED", 0, 0, (0, 0)),
+        ],
+    )
+    async def test_cancel_releases_inventory_once(
+        self,
+        client: AsyncClient,
+        auth_headers,
+        test_user,
+        test_hotel,
+        test_room,
+        db_session,
+        booking_status,
+        reserved,
+        booked,
+        expected,
+    ):
+        """Test cancelling gives back reserved or booked rooms once and skips inactive bookings."""
+        from sqlalchemy import select
+
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for i in range(2):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    book_count=booked,
+                    reserved_count=reserved,
+                    total_count=5,
+                    price=199.99,
+                    city="Test City",
+                )
+            )
+        booking = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=1,
+            check_in_date=today,
+            check_out_date=today + timedelta(days=1),
+            booking_status=BookingStatus(booking_status),
+            amount=399.98,
+        )
+        db_session.add(booking)
+        await db_session.commit()
+
+        for _ in range(2):
+            response = await client.post(f"/bookings/{booking.id}/cancel", headers=auth_headers)
+            assert response.status_code == 204
+
+        db_session.expire_all()
+        result = await db_session.execute(select(Inventory.reserved_count, Inventory.book_count))
+        assert set(result.all()) == {expected}
+        await db_session.refresh(booking)
+        expected_status = BookingStatus.EXPIRED if booking_status == "EXPIRED" else BookingStatus.CANCELLED
+        assert booking.booking_status == expected_status
+
+    @pytest.mark.asyncio
+    async def test_cancel_other_users_booking_not_found(
+        self, client: AsyncClient, manager_auth_headers, test_user, test_hotel, test_room, db_session
+    ):
+        """Test a booking cannot be cancelled by anyone but its owner."""
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+
+        booking = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=1,
+            check_in_date=date.today(),
+            check_out_date=date.today() + timedelta(days=1),
+            booking_status=BookingStatus.RESERVED,
+            amount=399.98,
+        )
+        db_session.add(booking)
+        await db_session.commit()
+
+        response = await client.post(f"/bookings/{booking.id}/cancel", headers=manager_auth_headers)
+
+        assert response.status_code == 404
+
 
 class TestAddGuests:
     """Tests for adding guests to booking."""
@@ -231,3 +324,204 @@ class TestPaymentInitiation:
 
         # Either success or Stripe error
         assert response.status_code in [200, 500]
+
+    @pytest.mark.asyncio
+    async def test_initiate_payment_marks_booking_pending(
+        self, client: AsyncClient, auth_headers, test_user, test_hotel, test_room, db_session
+    ):
+        """Test payment initiation stores the provider session and moves the booking to PAYMENTS_PENDING."""
+        from datetime import datetime
+
+        from sqlalchemy import select
+
+        from app.config import get_settings
+        from app.main import app
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+        from app.payments.gateway import FakePaymentGateway, get_payment_gateway
+
+        booking = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=1,
+            check_in_date=date.today(),
+            check_out_date=date.today() + timedelta(days=3),
+            booking_status=BookingStatus.RESERVED,
+            amount=599.97,
+        )
+        db_session.add(booking)
+        await db_session.commit()
+        await db_session.refresh(booking)
+        gateway = FakePaymentGateway()
+        app.dependency_overrides[get_payment_gateway] = lambda: gateway
+
+        response = await client.post(f"/bookings/{booking.id}/payments", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert "/fake-checkout/cs_fake_" in response.json()["session_url"]
+        # The checkout stops taking payment when the sweeper may release the hold
+        hold = (gateway.requests[0].expires_at - datetime.now(UTC)).total_seconds()
+        assert 0 < get_settings().PAYMENT_HOLD_MINUTES * 60 - hold < 60
+
+        result = await db_session.execute(
+            select(Booking.booking_status, Booking.payment_session_id).where(Booking.id == booking.id)
+        )
+        booking_status, session_id = result.one()
+        assert booking_status == BookingStatus.PAYMENTS_PENDING
+        assert session_id.startswith("cs_fake_")
+
+    @pytest.mark.asyncio
+    async def test_initiate_payment_provider_unavailable(
+        self, client: AsyncClient, auth_headers, test_user, test_hotel, test_room, db_session
+    ):
+        """Test a provider outage returns 503 and leaves the booking payable."""
+        from app.main import app
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+        from app.payments.gateway import FakePaymentGateway, PaymentGatewayUnavailable, get_payment_gateway
+
+        booking = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=1,
+            check_in_date=date.today(),
+            check_out_date=date.today() + timedelta(days=3),
+            booking_status=BookingStatus.GUESTS_ADDED,
+            amount=599.97,
+        )
+        db_session.add(booking)
+        await db_session.commit()
+        await db_session.refresh(booking)
+
+        gateway = FakePaymentGateway(fail_with=PaymentGatewayUnavailable("down"))
+        app.dependency_overrides[get_payment_gateway] = lambda: gateway
+
+        response = await client.post(f"/bookings/{booking.id}/payments", headers=auth_headers)
+
+        assert response.status_code == 503
+        await db_session.refresh(booking)
+        assert booking.booking_status == BookingStatus.GUESTS_ADDED
+
+
+class TestInventoryReservation:
+    """Tests for atomic inventory reservation."""
+
+    @pytest.mark.asyncio
+    async def test_init_booking_reserves_every_night(
+        self, client: AsyncClient, auth_headers, test_hotel, test_room, db_session
+    ):
+        """Test a successful booking reserves rooms on each night and prices the stay."""
+        from sqlalchemy import select
+
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for i in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    book_count=0,
+                    reserved_count=0,
+                    total_count=5,
+                    surge_factor=1.0,
+                    price=Decimal("100.00"),
+                    city="Test City",
+                    closed=False,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.post(
+            "/bookings/init",
+            headers=auth_headers,
+            json={
+                "hotel_id": test_hotel.id,
+                "room_id": test_room.id,
+                "check_in_date": today.isoformat(),
+                "check_out_date": (today + timedelta(days=2)).isoformat(),
+                "rooms_count": 2,
+            },
+        )
+
+        assert response.status_code == 200
+        assert Decimal(response.json()["amount"]) == Decimal("600.00")
+
+        result = await db_session.execute(
+            select(Inventory.reserved_count).where(Inventory.room_id == test_room.id).order_by(Inventory.date)
+        )
+        assert result.scalars().all() == [2, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_init_booking_partial_availability_reserves_nothing(
+        self, client: AsyncClient, auth_headers, test_hotel, test_room, db_session
+    ):
+        """Test a range with one sold-out night fails without touching the other nights."""
+        from sqlalchemy import select
+
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for i in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    book_count=5 if i == 1 else 0,
+                    reserved_count=0,
+                    total_count=5,
+                    surge_factor=1.0,
+                    price=Decimal("100.00"),
+                    city="Test City",
+                    closed=False,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.post(
+            "/bookings/init",
+            headers=auth_headers,
+            json={
+                "hotel_id": test_hotel.id,
+                "room_id": test_room.id,
+                "check_in_date": today.isoformat(),
+                "check_out_date": (today + timedelta(days=2)).isoformat(),
+                "rooms_count": 1,
+            },
+        )
+
+        assert response.status_code == 400
+
+        result = await db_session.execute(
+            select(Inventory.reserved_count).where(Inventory.room_id == test_room.id).order_by(Inventory.date)
+        )
+        assert result.scalars().all() == [0, 0, 0]
+
+    @pytest.mark.asyncio
+    async def test_init_booking_rejects_reversed_dates(
+        self, client: AsyncClient, auth_headers, test_hotel, test_room, db_session
+    ):
+        """Test a check-out before check-in is rejected instead of booking zero nights for free."""
+        from sqlalchemy import func, select
+
+        from app.models.booking import Booking
+
+        today = date.today()
+        response = await client.post(
+            "/bookings/init",
+            headers=auth_headers,
+            json={
+                "hotel_id": test_hotel.id,
+                "room_id": test_room.id,
+                "check_in_date": (today + timedelta(days=1)).isoformat(),
+                "check_out_date": today.isoformat(),
+                "rooms_count": 1,
+            },
+        )
+
+        assert response.status_code == 400
+        assert await db_session.scalar(select(func.count()).select_from(Booking)) == 0
@@ -0,0 +1,156 @@
+import pytest
+from httpx import AsyncClient
+
+
+class TestConnectionPool:
+    """Tests for pool configuration and pool metrics."""
+
+    @pytest.mark.asyncio
+    async def test_checkout_wait_and_timeouts_are_recorded(self):
+        """Test an exhausted pool times out and both checkouts are measured."""
+        from sqlalchemy import exc
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from app.database import engine_options
+        from app.utils.pool_metrics import InstrumentedPool, pool_status
+        from tests.conftest import TEST_DATABASE_URL
+
+        engine = create_async_engine(TEST_DATABASE_URL, **engine_options(pool_size=1, max_overflow=0, pool_timeout=0.2))
+        try:
+            assert isinstance(engine.pool, InstrumentedPool)
+            async with engine.connect():
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+                status = pool_status(engine.pool)
+                assert (status["size"], status["checked_out"], status["overflow"]) == (1, 1, 0)
+
+            status = pool_status(engine.pool)
+            assert status["checked_out"] == 0
+            assert (status["checkouts"], status["timeouts"]) == (1, 1)
+            assert status["wait_seconds"]["count"] == 2
+            assert status["wait_seconds"]["sum"] >= 0.2
+            assert status["checked_out_at_checkout"]["buckets"]["1"] == 1
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_overflow_peak_is_tracked(self):
+        """Test connections beyond pool_size show up as overflow."""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from app.database import engine_options
+        from app.utils.pool_metrics import pool_status
+        from tests.conftest import TEST_DATABASE_URL
+
+        engine = create_async_engine(TEST_DATABASE_URL, **engine_options(pool_size=1, max_overflow=2))
+        try:
+            async with engine.connect(), engine.connect(), engine.connect():
+                assert pool_status(engine.pool)["overflow"] == 2
+            status = pool_status(engine.pool)
+            assert status["overflow_peak"] == 2
+            assert status["checked_in"] == 1
+        finally:
+            await engine.dispose()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations land in every bucket at or above their value."""
+        from app.utils.metrics import Histogram
+
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+        assert histogram.snapshot()["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+        assert histogram.sum == pytest.approx(3.65)
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_endpoint(self, client: AsyncClient, internal_headers):
+        """Test every engine's pool is reported."""
+        response = await client.get("/health/pools", headers=internal_headers)
+
+        assert response.status_code == 200
+        pools = response.json()
+        assert {"primary", "read"} <= set(pools)
+        assert pools["primary"]["class"] == "InstrumentedPool"
+        assert "wait_seconds" in pools["read"]
+
+
+class TestQueryStats:
+    """Tests for per-request SQL statement counting."""
+
+    def _app(self, repeat: int):
+        """A bare app whose one route runs ``SELECT 1`` ``repeat`` times."""
+        from sqlalchemy import text
+        from starlette.applications import Starlette
+        from starlette.responses import PlainTextResponse
+        from starlette.routing import Route
+
+        from tests.conftest import TestAsyncSessionLocal
+
+        async def endpoint(request):
+            async with TestAsyncSessionLocal() as session:
+                for _ in range(repeat):
+                    await session.execute(text("SELECT 1"))
+            return PlainTextResponse("ok")
+
+        return Starlette(routes=[Route("/items/{item_id}", endpoint)])
+
+    @pytest.mark.asyncio
+    async def test_debug_headers_and_route_metrics(self, db_session):
+        """Test each request reports its own statement count, aggregated by route template."""
+        from httpx import ASGITransport
+
+        from app.middleware.query_stats import QueryStatsMiddleware, query_metrics
+
+        query_metrics.clear()
+        app = QueryStatsMiddleware(self._app(repeat=3), debug_headers=True)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            first = await client.get("/items/1")
+            second = await client.get("/items/2")
+
+        assert first.headers["X-DB-Query-Count"] == second.headers["X-DB-Query-Count"] == "3"
+        assert float(first.headers["X-DB-Time-Ms"]) > 0
+        metrics = query_metrics.snapshot()["GET /items/{item_id}"]
+        assert metrics["requests"] == 2
+        assert metrics["queries"]["count"] == 2 and metrics["queries"]["sum"] == 6
+        query_metrics.clear()
+
+    @pytest.mark.asyncio
+    async def test_query_stats_endpoint_is_internal(self, client: AsyncClient, auth_headers, internal_headers):
+        """Test per-route query stats are served only with the internal token."""
+        from app.middleware.query_stats import query_metrics
+
+        query_metrics.clear()
+        await client.get("/users/profile", headers=auth_headers)
+
+        assert (await client.get("/health/queries", headers=auth_headers)).status_code == 401
+        response = await client.get("/health/queries", headers=internal_headers)
+        assert response.status_code == 200
+        assert response.json()["GET /users/profile"]["requests"] == 1
+        query_metrics.clear()
+
+    @pytest.mark.asyncio
+    async def test_repeated_statements_are_flagged(self, db_session, caplog):
+        """Test a statement repeated past the threshold is logged as a likely N+1."""
+        from httpx import ASGITransport
+
+        from app.middleware.query_stats import QueryStatsMiddleware, query_metrics
+
+        query_metrics.clear()
+        app = QueryStatsMiddleware(self._app(repeat=4), debug_headers=False, repeat_threshold=4)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/items/1")
+
+        assert "X-DB-Query-Count" not in response.headers
+        assert "Possible N+1 query in GET /items/{item_id}: ran 4 times" in caplog.text
+        assert query_metrics.snapshot()["GET /items/{item_id}"]["repeated_statement_warnings"] == 1
+        query_metrics.clear()
+
+    @pytest.mark.asyncio
+    async def test_assert_max_queries_fails_over_budget(self, client: AsyncClient, assert_max_queries):
+        """Test the pytest helper reports the statements when a block exceeds its budget."""
+        with pytest.raises(AssertionError, match="1 queries, expected at most 0"):
+            with assert_max_queries(0):
+                await client.get("/hotels/1/info")
@@ -153,3 +153,64 @@ class TestHotelReports:
         data = response.json()
         assert "total_bookings" in data
         assert "total_revenue" in data
+
+    @pytest.mark.asyncio
+    async def test_get_hotel_report_aggregates(
+        self, client: AsyncClient, manager_auth_headers, test_user, test_hotel, test_room, db_session
+    ):
+        """Test report totals and the per-night breakdown cover the same inclusive date range."""
+        from datetime import date, timedelta
+
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+        from app.models.inventory import Inventory
+
+        start = date(2026, 3, 1)
+        for i in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=start + timedelta(days=i),
+                    book_count=i,
+                    reserved_count=0,
+                    total_count=4,
+                    surge_factor=1.0,
+                    price=100,
+                    city="Test City",
+                    closed=False,
+                )
+            )
+        for status, amount in [
+            (BookingStatus.CONFIRMED, 200),
+            (BookingStatus.CONFIRMED, 150),
+            (BookingStatus.CANCELLED, 99),
+        ]:
+            db_session.add(
+                Booking(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    user_id=test_user.id,
+                    rooms_count=1,
+                    check_in_date=start,
+                    check_out_date=start + timedelta(days=2),
+                    booking_status=status,
+                    amount=amount,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            f"/admin/hotels/{test_hotel.id}/reports",
+            headers=manager_auth_headers,
+            params={"start_date": "2026-03-01", "end_date": "2026-03-03", "detailed": "true"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_bookings"] == 2
+        assert float(data["total_revenue"]) == 350
+        assert [d["date"] for d in data["daily"]] == ["2026-03-01", "2026-03-02", "2026-03-03"]
+        assert [d["room_nights_sold"] for d in data["daily"]] == [0, 1, 2]
+        assert [float(d["revenue"]) for d in data["daily"]] == [0, 100, 200]
+        assert [d["occupancy_rate"] for d in data["daily"]] == [0, 0.25, 0.5]
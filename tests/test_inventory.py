@@ -100,3 +100,536 @@ class TestInventoryUpdate:
         )
 
         assert response.status_code == 200
+
+
+class TestInventoryWriter:
+    """Tests for the bulk inventory writer."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_copy", [True, False])
+    async def test_write_room_calendar(self, test_hotel, test_room, db_session, use_copy):
+        """Test both the COPY and multi-row INSERT paths write the full calendar."""
+        from sqlalchemy import select
+
+        from app.models.inventory import Inventory
+        from app.services.inventory_writer import InventoryWriter
+
+        today = date.today()
+        writer = InventoryWriter(db_session, use_copy=use_copy, chunk_size=4)
+        written = await writer.write_room_calendar(test_room, test_hotel, today, 10)
+        assert written == 10
+
+        result = await db_session.execute(
+            select(Inventory).where(Inventory.room_id == test_room.id).order_by(Inventory.date)
+        )
+        inventories = result.scalars().all()
+        assert [inv.date for inv in inventories] == [today + timedelta(days=i) for i in range(10)]
+        assert all(inv.available_count == test_room.total_count for inv in inventories)
+        assert all(float(inv.price) == 199.99 for inv in inventories)
+
+
+class TestInventoryIndexes:
+    """Tests that the statements services build for hot paths are planned as index scans."""
+
+    async def _seed(self, db_session, owner_id: int) -> None:
+        """Fill inventory and the search summary for 100 hotels x 200 days, then gather statistics."""
+        from sqlalchemy import text
+
+        from app.services.hotel_min_price_service import HotelMinPriceService
+
+        await db_session.execute(
+            text(
+                "INSERT INTO hotel (name, city, city_key, active, owner_id, created_at, updated_at) "
+                "SELECT 'Hotel ' || g, 'City ' || g % 25, 'city ' || g % 25, true, :owner_id, now(), now() "
+                "FROM generate_series(1, 100) AS g"
+            ),
+            {"owner_id": owner_id},
+        )
+        await db_session.execute(
+            text(
+                "INSERT INTO room (hotel_id, type, base_price, total_count, capacity, created_at, updated_at) "
+                "SELECT id, 'Standard', 100, 5, 2, now(), now() FROM hotel"
+            )
+        )
+        await db_session.execute(
+            text(
+                "INSERT INTO inventory (hotel_id, room_id, date, book_count, reserved_count, total_count, "
+                "surge_factor, price, city, city_key, closed, created_at) "
+                "SELECT r.hotel_id, r.id, current_date + d, 0, 0, 5, 1.0, 100, h.city, h.city_key, false, now() "
+                "FROM room AS r JOIN hotel AS h ON h.id = r.hotel_id, generate_series(0, 199) AS d"
+            )
+        )
+        await HotelMinPriceService(db_session).refresh_hotels(None)
+        await db_session.commit()
+        await db_session.execute(text("ANALYZE inventory"))
+        await db_session.execute(text("ANALYZE hotel_min_price"))
+        await db_session.commit()
+
+    async def _explain_executed(self, db_session, run, marker: str) -> str:
+        """Plan, without executing it again, the statement containing ``marker`` that ``run()`` sent."""
+        from sqlalchemy import event
+
+        from tests.conftest import test_engine
+
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append((statement, parameters))
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await run()
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        statement, parameters = next((sql, params) for sql, params in executed if marker in sql)
+        conn = await db_session.connection()
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        plan = "\n".join(result.scalars().all())
+        await db_session.rollback()
+        return plan
+
+    async def _first_room_id(self, db_session) -> int:
+        from sqlalchemy import func, select
+
+        from app.models.room import Room
+
+        return (await db_session.execute(select(func.min(Room.id)))).scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_reservation_uses_room_date_index(self, db_session, test_user):
+        """Test the reservation UPDATE finds the room's nights through the covering room/date index."""
+        from app.services.booking_service import BookingService
+
+        await self._seed(db_session, test_user.id)
+        room_id = await self._first_room_id(db_session)
+        today = date.today()
+
+        plan = await self._explain_executed(
+            db_session,
+            lambda: BookingService(db_session)._reserve_inventory(room_id, today, today + timedelta(days=3), 1),
+            "UPDATE inventory",
+        )
+
+        assert "ix_inventory_room_date" in plan
+
+    @pytest.mark.asyncio
+    async def test_summary_refresh_uses_hotel_date_index(self, db_session, test_user):
+        """Test the per-hotel summary refresh reads inventory through the covering hotel/date index."""
+        from sqlalchemy import select
+
+        from app.models.room import Room
+        from app.services.hotel_min_price_service import HotelMinPriceService
+
+        await self._seed(db_session, test_user.id)
+        room_id = await self._first_room_id(db_session)
+        hotel_id = (await db_session.execute(select(Room.hotel_id).where(Room.id == room_id))).scalar_one()
+        today = date.today()
+
+        plan = await self._explain_executed(
+            db_session,
+            lambda: HotelMinPriceService(db_session).refresh_hotel(hotel_id, today, today + timedelta(days=30)),
+            "INSERT INTO hotel_min_price",
+        )
+
+        assert "ix_inventory_hotel_date" in plan
+
+    @pytest.mark.asyncio
+    async def test_search_uses_covering_summary_index(self, db_session, test_user):
+        """Test the exact city search reads the summary through its covering index."""
+        from app.services.search_service import SearchService
+
+        await self._seed(db_session, test_user.id)
+        service = SearchService(db_session)
+        service.cache = service.engine = None
+        today = date.today()
+
+        plan = await self._explain_executed(
+            db_session,
+            lambda: service.search_hotels("City 1", today, today + timedelta(days=3)),
+            "FROM hotel_min_price",
+        )
+
+        assert "ix_hotel_min_price_search" in plan
+
+
+class TestFastJSON:
+    """Tests for the Core-row JSON path of inventory responses."""
+
+    @pytest.mark.asyncio
+    async def test_fast_inventory_matches_model_response(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, monkeypatch
+    ):
+        """Test the fast path returns byte-identical JSON to the response-model path."""
+        from app.config import get_settings
+
+        response = await client.post(
+            f"/admin/hotels/{test_hotel.id}/rooms",
+            headers=manager_auth_headers,
+            json={"type": "Standard", "base_price": 120.5, "total_count": 3, "capacity": 2},
+        )
+        url = f"/admin/inventory/rooms/{response.json()['id']}"
+        params = {"start_date": date.today().isoformat(), "end_date": (date.today() + timedelta(days=30)).isoformat()}
+
+        model_response = await client.get(url, headers=manager_auth_headers, params=params)
+        monkeypatch.setattr(get_settings(), "FAST_JSON_RESPONSES", True)
+        fast_response = await client.get(url, headers=manager_auth_headers, params=params)
+
+        assert fast_response.status_code == 200
+        assert fast_response.headers["content-type"] == "application/json"
+        assert len(fast_response.json()) == 31
+        assert fast_response.content == model_response.content
+
+
+class TestColumnarInventory:
+    """Tests for the columnar inventory calendar."""
+
+    async def _room_with_closed_days(self, client: AsyncClient, manager_auth_headers, test_hotel) -> int:
+        """A room whose inventory is closed on days 3-4 from today."""
+        response = await client.post(
+            f"/admin/hotels/{test_hotel.id}/rooms",
+            headers=manager_auth_headers,
+            json={"type": "Standard", "base_price": 120, "total_count": 3, "capacity": 2},
+        )
+        room_id = response.json()["id"]
+        await client.patch(
+            f"/admin/inventory/rooms/{room_id}",
+            headers=manager_auth_headers,
+            params={
+                "start_date": (date.today() + timedelta(days=3)).isoformat(),
+                "end_date": (date.today() + timedelta(days=4)).isoformat(),
+            },
+            json={"closed": True},
+        )
+        return room_id
+
+    @pytest.mark.asyncio
+    async def test_columnar_matches_rows(self, client: AsyncClient, manager_auth_headers, test_hotel):
+        """Test parallel arrays carry the same per-day values as the row format."""
+        room_id = await self._room_with_closed_days(client, manager_auth_headers, test_hotel)
+        url = f"/admin/inventory/rooms/{room_id}"
+        params = {"start_date": date.today().isoformat(), "end_date": (date.today() + timedelta(days=9)).isoformat()}
+
+        rows = (await client.get(url, headers=manager_auth_headers, params=params)).json()
+        response = await client.get(url, headers=manager_auth_headers, params={**params, "format": "columnar"})
+
+        assert response.status_code == 200
+        calendar = response.json()
+        assert calendar["start_date"] == date.today().isoformat()
+        assert calendar["days"] == len(rows) == 10
+        assert calendar["date_offsets"] is None
+        assert calendar["closed"] == [row["closed"] for row in rows]
+        assert calendar["price"] == [row["price"] for row in rows]
+        assert calendar["total_count"] == [3] * 10
+
+    @pytest.mark.asyncio
+    async def test_columnar_run_length_encoding(self, client: AsyncClient, manager_auth_headers, test_hotel):
+        """Test runs of identical values collapse into values and lengths."""
+        room_id = await self._room_with_closed_days(client, manager_auth_headers, test_hotel)
+        params = {
+            "start_date": date.today().isoformat(),
+            "end_date": (date.today() + timedelta(days=9)).isoformat(),
+            "format": "columnar",
+            "rle": True,
+        }
+
+        response = await client.get(f"/admin/inventory/rooms/{room_id}", headers=manager_auth_headers, params=params)
+
+        calendar = response.json()
+        assert calendar["closed"] == {"values": [False, True, False], "lengths": [3, 2, 5]}
+        assert calendar["total_count"] == {"values": [3], "lengths": [10]}
+
+    @pytest.mark.asyncio
+    async def test_columnar_offsets_for_missing_days(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, test_room, db_session
+    ):
+        """Test non-consecutive days are reported as offsets from the start date."""
+        from decimal import Decimal
+
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for offset in (0, 1, 5):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=offset),
+                    total_count=5,
+                    price=Decimal("150.00"),
+                    city="Test City",
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            f"/admin/inventory/rooms/{test_room.id}", headers=manager_auth_headers, params={"format": "columnar"}
+        )
+
+        calendar = response.json()
+        assert calendar["date_offsets"] == [0, 1, 5]
+        assert calendar["price"] == ["150.00"] * 3
+
+
+class TestBulkInventory:
+    """Tests for bulk inventory import and export."""
+
+    async def _rooms(self, client: AsyncClient, manager_auth_headers, test_hotel, count: int = 2) -> list[int]:
+        """Rooms created through the API, so each has a year of inventory."""
+        room_ids = []
+        for _ in range(count):
+            response = await client.post(
+                f"/admin/hotels/{test_hotel.id}/rooms",
+                headers=manager_auth_headers,
+                json={"type": "Standard", "base_price": 100, "total_count": 3, "capacity": 2},
+            )
+            room_ids.append(response.json()["id"])
+        return room_ids
+
+    async def _day(self, client: AsyncClient, headers, room_id: int, day: date) -> dict:
+        response = await client.get(
+            f"/admin/inventory/rooms/{room_id}",
+            headers=headers,
+            params={"start_date": day.isoformat(), "end_date": day.isoformat()},
+        )
+        return response.json()[0]
+
+    @pytest.mark.asyncio
+    async def test_csv_import_updates_many_rooms(self, client: AsyncClient, manager_auth_headers, test_hotel):
+        """Test one CSV payload updates several rooms; blanks keep values and the last line wins."""
+        first, second = await self._rooms(client, manager_auth_headers, test_hotel)
+        today = date.today()
+        tomorrow = today + timedelta(days=1)
+        body = (
+            "room_id,date,price,total_count,closed\n"
+            f"{first},{today},150.00,,\n"
+            f"{first},{tomorrow},,1,true\n"
+            f"{second},{today},90.00,4,false\n"
+            f"{second},{today},95.00,,\n"
+            f"{second},{today + timedelta(days=3000)},80.00,,\n"
+        )
+
+        response = await client.post(
+            "/admin/inventory/import", headers={**manager_auth_headers, "Content-Type": "text/csv"}, content=body
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"rows": 5, "rooms": 2, "updated": 3}
+        day = await self._day(client, manager_auth_headers, first, today)
+        assert (day["price"], day["total_count"], day["closed"]) == ("150.00", 3, False)
+        day = await self._day(client, manager_auth_headers, first, tomorrow)
+        assert (day["price"], day["total_count"], day["closed"]) == ("100.00", 1, True)
+        day = await self._day(client, manager_auth_headers, second, today)
+        assert (day["price"], day["total_count"]) == ("95.00", 3)
+
+    @pytest.mark.asyncio
+    async def test_ndjson_import_rejects_rooms_of_other_owners(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, db_session
+    ):
+        """Test a payload touching another owner's room is rejected as a whole."""
+        from app.models.hotel import Hotel
+        from app.models.room import Room
+        from app.models.user import User
+
+        (room_id,) = await self._rooms(client, manager_auth_headers, test_hotel, count=1)
+        other = User(email="other@example.com", password="-", roles=["HOTEL_MANAGER"])
+        db_session.add(other)
+        await db_session.flush()
+        hotel = Hotel(name="Other", city="Elsewhere", active=True, owner_id=other.id)
+        db_session.add(hotel)
+        await db_session.flush()
+        foreign = Room(hotel_id=hotel.id, type="Suite", base_price=300, total_count=1, capacity=2)
+        db_session.add(foreign)
+        await db_session.commit()
+
+        today = date.today().isoformat()
+        body = f'{{"room_id": {room_id}, "date": "{today}", "price": "1.00"}}\n{{"room_id": {foreign.id}, "date": "{today}"}}\n'
+        response = await client.post(
+            "/admin/inventory/import",
+            headers={**manager_auth_headers, "Content-Type": "application/x-ndjson"},
+            content=body,
+        )
+
+        assert response.status_code == 403
+        assert (await self._day(client, manager_auth_headers, room_id, date.today()))["price"] == "100.00"
+
+    @pytest.mark.asyncio
+    async def test_import_reports_bad_lines(self, client: AsyncClient, manager_auth_headers, test_hotel):
+        """Test malformed rows are reported with their line number and unknown formats are refused."""
+        (room_id,) = await self._rooms(client, manager_auth_headers, test_hotel, count=1)
+        url = "/admin/inventory/import"
+
+        response = await client.post(
+            url,
+            headers={**manager_auth_headers, "Content-Type": "text/csv"},
+            content=f"room_id,date,price\n{room_id},{date.today()},-5\n",
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"].startswith("Line 2: price:")
+
+        response = await client.post(
+            url, headers={**manager_auth_headers, "Content-Type": "application/x-ndjson"}, content="{not json}\n"
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"].startswith("Line 1:")
+
+        # Values the inventory columns cannot hold, and bytes that are not UTF-8
+        for content, detail in (
+            (f"room_id,date,price\n{room_id},{date.today()},123456789.00\n".encode(), "Line 2: price:"),
+            (f"room_id,date,total_count\n{room_id},{date.today()},{2**31}\n".encode(), "Line 2: total_count:"),
+            (f"room_id,date,price\n{room_id},{date.today()},1.00\n".encode() + b"\xff\n", "Line 3: invalid UTF-8"),
+        ):
+            response = await client.post(
+                url, headers={**manager_auth_headers, "Content-Type": "text/csv"}, content=content
+            )
+            assert response.status_code == 422
+            assert response.json()["detail"].startswith(detail)
+
+        response = await client.post(url, headers={**manager_auth_headers, "Content-Type": "application/xml"})
+        assert response.status_code == 415
+
+    @pytest.mark.asyncio
+    async def test_export_round_trips_through_import(self, client: AsyncClient, manager_auth_headers, test_hotel):
+        """Test the streamed export lists every day in order and can be imported back unchanged."""
+        import json
+
+        room_ids = await self._rooms(client, manager_auth_headers, test_hotel)
+        params = {"start_date": date.today().isoformat(), "end_date": (date.today() + timedelta(days=9)).isoformat()}
+
+        response = await client.get("/admin/inventory/export", headers=manager_auth_headers, params=params)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0] == "room_id,date,price,total_count,closed,book_count,reserved_count"
+        assert len(lines) == 21
+        assert lines[1] == f"{room_ids[0]},{date.today()},100.00,3,false,0,0"
+
+        response = await client.post(
+            "/admin/inventory/import",
+            headers={**manager_auth_headers, "Content-Type": "text/csv"},
+            content=response.text,
+        )
+        assert response.json() == {"rows": 20, "rooms": 2, "updated": 20}
+
+        response = await client.get(
+            "/admin/inventory/export",
+            headers=manager_auth_headers,
+            params={**params, "hotel_id": test_hotel.id, "format": "ndjson"},
+        )
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["room_id"] for r in records] == [room_ids[0]] * 10 + [room_ids[1]] * 10
+        assert records[0]["price"] == "100.00" and records[0]["closed"] is False
+
+
+class TestInventoryChangeFeed:
+    """Tests for the inventory change feed."""
+
+    async def _room(self, client: AsyncClient, manager_auth_headers, test_hotel) -> int:
+        response = await client.post(
+            f"/admin/hotels/{test_hotel.id}/rooms",
+            headers=manager_auth_headers,
+            json={"type": "Standard", "base_price": 100, "total_count": 3, "capacity": 2},
+        )
+        return response.json()["id"]
+
+    @pytest.mark.asyncio
+    async def test_pages_then_resumes_after_updates(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, db_session
+    ):
+        """Test the cursor walks every row once, holds when idle and picks up later updates."""
+        room_id = await self._room(client, manager_auth_headers, test_hotel)
+        await db_session.commit()
+        url = "/admin/inventory/changes"
+
+        seen, cursor, has_more = [], None, True
+        while has_more:
+            params = {"limit": 100, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get(url, headers=manager_auth_headers, params=params)).json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor, has_more = page["cursor"], page["has_more"]
+        total = len(seen)
+        assert total >= 365 and len(set(seen)) == total
+
+        idle = (await client.get(url, headers=manager_auth_headers, params={"cursor": cursor})).json()
+        assert idle == {"items": [], "cursor": cursor, "has_more": False}
+
+        tomorrow = date.today() + timedelta(days=1)
+        await client.patch(
+            f"/admin/inventory/rooms/{room_id}",
+            headers=manager_auth_headers,
+            params={"start_date": tomorrow.isoformat(), "end_date": tomorrow.isoformat()},
+            json={"price": 180},
+        )
+        await db_session.commit()
+        page = (await client.get(url, headers=manager_auth_headers, params={"cursor": cursor})).json()
+        assert [(item["date"], item["price"]) for item in page["items"]] == [(tomorrow.isoformat(), "180.00")]
+        assert page["cursor"] != cursor
+
+    @pytest.mark.asyncio
+    async def test_changes_wait_for_transactions_in_flight(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, db_session
+    ):
+        """Test a commit is held back while an older transaction is still open, then both appear."""
+        from sqlalchemy import update
+
+        from app.models.inventory import Inventory
+        from tests.conftest import TestAsyncSessionLocal
+
+        room_id = await self._room(client, manager_auth_headers, test_hotel)
+        await db_session.commit()
+        url = "/admin/inventory/changes"
+        cursor = None
+        while True:
+            page = (
+                await client.get(url, headers=manager_auth_headers, params={"cursor": cursor} if cursor else {})
+            ).json()
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+
+        today, tomorrow = date.today(), date.today() + timedelta(days=1)
+        async with TestAsyncSessionLocal() as slow:
+            await slow.execute(
+                update(Inventory).where(Inventory.room_id == room_id, Inventory.date == today).values(price=150)
+            )
+            await client.patch(
+                f"/admin/inventory/rooms/{room_id}",
+                headers=manager_auth_headers,
+                params={"start_date": tomorrow.isoformat(), "end_date": tomorrow.isoformat()},
+                json={"price": 180},
+            )
+            await db_session.commit()
+
+            held = (await client.get(url, headers=manager_auth_headers, params={"cursor": cursor})).json()
+            assert held == {"items": [], "cursor": cursor, "has_more": False}
+
+            await slow.commit()
+
+        page = (await client.get(url, headers=manager_auth_headers, params={"cursor": cursor})).json()
+        assert [(item["date"], item["price"]) for item in page["items"]] == [
+            (today.isoformat(), "150.00"),
+            (tomorrow.isoformat(), "180.00"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rejects_foreign_hotel_and_bad_cursor(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, db_session
+    ):
+        """Test another owner's hotel is refused and garbled cursors are rejected."""
+        from app.models.hotel import Hotel
+        from app.models.user import User
+
+        other = User(email="other@example.com", password="-", roles=["HOTEL_MANAGER"])
+        db_session.add(other)
+        await db_session.flush()
+        hotel = Hotel(name="Other", city="Elsewhere", active=True, owner_id=other.id)
+        db_session.add(hotel)
+        await db_session.commit()
+        url = "/admin/inventory/changes"
+
+        response = await client.get(url, headers=manager_auth_headers, params={"hotel_id": hotel.id})
+        assert response.status_code == 403
+
+        response = await client.get(url, headers=manager_auth_headers, params={"cursor": "garbage"})
+        assert response.status_code == 400
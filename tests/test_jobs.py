@@ -0,0 +1,200 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from tests.conftest import TestAsyncSessionLocal
+
+
+class TestBookingExpirySweeper:
+    """Tests for the stale booking sweeper."""
+
+    @pytest.mark.asyncio
+    async def test_sweeper_expires_stale_holds(self, test_user, test_hotel, test_room, db_session):
+        """Test stale holds are expired and their inventory released, fresh ones are kept."""
+        from app.jobs.booking_expiry import BookingExpirySweeper
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for i in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    book_count=0,
+                    reserved_count=3,
+                    total_count=5,
+                    surge_factor=1.0,
+                    price=199.99,
+                    city="Test City",
+                    closed=False,
+                )
+            )
+
+        an_hour_ago = datetime.utcnow() - timedelta(hours=1)
+        stale = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=2,
+            check_in_date=today,
+            check_out_date=today + timedelta(days=2),
+            booking_status=BookingStatus.GUESTS_ADDED,
+            amount=1199.94,
+            created_at=an_hour_ago,
+        )
+        fresh = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=1,
+            check_in_date=today,
+            check_out_date=today + timedelta(days=2),
+            booking_status=BookingStatus.PAYMENTS_PENDING,
+            amount=599.97,
+            created_at=an_hour_ago,
+        )
+        db_session.add_all([stale, fresh])
+        await db_session.commit()
+
+        sweeper = BookingExpirySweeper(
+            session_maker=TestAsyncSessionLocal, batch_size=1, hold_minutes=15, payment_hold_minutes=60
+        )
+        expired = await sweeper.run_once()
+
+        assert expired == 1
+        assert sweeper.stats.bookings_expired == 1
+        assert sweeper.stats.room_nights_released == 6
+
+        result = await db_session.execute(
+            select(Booking).where(Booking.id.in_([stale.id, fresh.id])).execution_options(populate_existing=True)
+        )
+        statuses = {b.id: b.booking_status for b in result.scalars().all()}
+        assert statuses == {stale.id: BookingStatus.EXPIRED, fresh.id: BookingStatus.PAYMENTS_PENDING}
+
+        result = await db_session.execute(
+            select(Inventory.reserved_count).where(Inventory.room_id == test_room.id).order_by(Inventory.date)
+        )
+        assert result.scalars().all() == [1, 1, 1]
+
+        # A second sweep finds nothing left to reclaim
+        assert await sweeper.run_once() == 0
+
+
+class TestInventoryHorizonExtender:
+    """Tests for the rolling inventory horizon job."""
+
+    @pytest.mark.asyncio
+    async def test_extender_fills_missing_tail_dates(self, test_hotel, test_room, db_session):
+        """Test the extender appends only missing dates and is idempotent."""
+        from app.jobs.inventory_horizon import InventoryHorizonExtender
+        from app.models.hotel_min_price import HotelMinPrice
+        from app.models.inventory import Inventory
+
+        today = date.today()
+        for i in range(3):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    book_count=1,
+                    reserved_count=0,
+                    total_count=5,
+                    surge_factor=1.5,
+                    price=250,
+                    city="Test City",
+                    closed=False,
+                )
+            )
+        await db_session.commit()
+
+        extender = InventoryHorizonExtender(session_maker=TestAsyncSessionLocal, horizon_days=10, batch_size=1)
+
+        assert await extender.run_once() == 7
+        assert await extender.run_once() == 0
+        assert extender.stats.rows_inserted == 7
+
+        result = await db_session.execute(
+            select(Inventory.date, Inventory.book_count, Inventory.price, Inventory.total_count, Inventory.city)
+            .where(Inventory.room_id == test_room.id)
+            .order_by(Inventory.date)
+        )
+        rows = result.all()
+        assert [r.date for r in rows] == [today + timedelta(days=i) for i in range(10)]
+        # Existing rows are untouched, new rows copy the room defaults
+        assert [r.book_count for r in rows[:3]] == [1, 1, 1]
+        assert all(float(r.price) == 199.99 and r.total_count == 5 for r in rows[3:])
+        assert all(r.city == "Test City" for r in rows)
+
+        result = await db_session.execute(
+            select(HotelMinPrice.date).where(HotelMinPrice.hotel_id == test_hotel.id).order_by(HotelMinPrice.date)
+        )
+        assert result.scalars().all() == [today + timedelta(days=i) for i in range(3, 10)]
+
+
+class TestSearchSummaryRefresher:
+    """Tests for the job applying search summary refreshes queued by bookings."""
+
+    @pytest.mark.asyncio
+    async def test_refresher_applies_queued_booking_refreshes(
+        self, client: AsyncClient, auth_headers, test_hotel, test_room, db_session
+    ):
+        """Test bookings leave the summary rows alone and the job merges and applies their refreshes."""
+        from app.jobs.search_summary import SearchSummaryRefresher
+        from app.models.hotel_min_price import HotelMinPrice
+        from app.models.hotel_min_price_refresh import HotelMinPriceRefresh
+        from app.models.inventory import Inventory
+        from app.services.hotel_min_price_service import HotelMinPriceService
+
+        today = date.today()
+        for i in range(4):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    total_count=1,
+                    price=100,
+                    city="Test City",
+                )
+            )
+        await db_session.flush()
+        await HotelMinPriceService(db_session).refresh_hotel(test_hotel.id)
+        await db_session.commit()
+
+        async def summary_dates() -> list[date]:
+            result = await db_session.execute(
+                select(HotelMinPrice.date).where(HotelMinPrice.hotel_id == test_hotel.id).order_by(HotelMinPrice.date)
+            )
+            return list(result.scalars().all())
+
+        for check_in, check_out in [(0, 0), (2, 3)]:
+            response = await client.post(
+                "/bookings/init",
+                headers=auth_headers,
+                json={
+                    "hotel_id": test_hotel.id,
+                    "room_id": test_room.id,
+                    "check_in_date": (today + timedelta(days=check_in)).isoformat(),
+                    "check_out_date": (today + timedelta(days=check_out)).isoformat(),
+                    "rooms_count": 1,
+                },
+            )
+            assert response.status_code == 200
+        await db_session.commit()
+
+        assert await summary_dates() == [today + timedelta(days=i) for i in range(4)]
+        queued = await db_session.scalar(select(func.count()).select_from(HotelMinPriceRefresh))
+        assert queued == 2
+
+        refresher = SearchSummaryRefresher(session_maker=TestAsyncSessionLocal, batch_size=1)
+        assert await refresher.run_once() == 2
+        assert await refresher.run_once() == 0
+        assert refresher.stats.entries_applied == 2
+        assert await summary_dates() == [today + timedelta(days=1)]
+        assert await db_session.scalar(select(func.count()).select_from(HotelMinPriceRefresh)) == 0
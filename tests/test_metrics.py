@@ -0,0 +1,104 @@
+import pytest
+from httpx import AsyncClient
+
+
+class TestMetrics:
+    """Tests for the /metrics exposition."""
+
+    def test_render_text_exposition(self):
+        """Test counters and histograms render with escaped labels and cumulative buckets."""
+        from app.utils.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        requests.inc('/a"b', amount=2)
+        latency.labels("/a").observe(0.5)
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{route="/a\\"b"} 2' in lines
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 0' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 1' in lines
+        assert 'latency_seconds_count{route="/a"} 1' in lines
+
+    @pytest.mark.asyncio
+    async def test_instrument_times_and_counts_errors(self):
+        """Test decorated service methods record their latency and the exceptions they raise."""
+        from app.utils.metrics import instrument, service_call_errors, service_call_seconds
+
+        @instrument
+        class ProbeService:
+            async def ok(self) -> int:
+                return 1
+
+            async def fail(self) -> None:
+                raise ValueError("boom")
+
+            async def _private(self) -> None:
+                pass
+
+        service = ProbeService()
+        assert await service.ok() == 1
+        with pytest.raises(ValueError):
+            await service.fail()
+
+        assert service_call_seconds.labels("ProbeService", "ok").count == 1
+        assert service_call_seconds.labels("ProbeService", "fail").count == 1
+        assert service_call_errors.value("ProbeService", "fail", "ValueError") == 1
+        assert ("ProbeService", "_private") not in dict(service_call_seconds.items())
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, client: AsyncClient, manager_auth_headers, test_room, internal_headers):
+        """Test requests are labelled by route template and service timers are exposed."""
+        await client.get(f"/admin/inventory/rooms/{test_room.id}", headers=manager_auth_headers)
+
+        response = await client.get("/metrics", headers=internal_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/admin/inventory/rooms/{room_id}",status="200"}' in body
+        assert f"/admin/inventory/rooms/{test_room.id}" not in body
+        assert 'service_call_duration_seconds_count{service="InventoryService",method="get_inventory_by_room"}' in body
+        assert 'db_pool_checked_out{pool="primary"}' in body
+        assert "# TYPE db_queries_per_request histogram" in body
+
+    @pytest.mark.asyncio
+    async def test_internal_endpoints_require_the_internal_token(
+        self, client: AsyncClient, manager_auth_headers, monkeypatch
+    ):
+        """Test operational endpoints are off without a token, refuse user tokens and stay out of the schema."""
+        from app.config import get_settings
+
+        paths = ["/metrics", "/health/queries", "/health/pools", "/health/replicas", "/health/search-cache"]
+        for path in paths:
+            assert (await client.get(path)).status_code == 404
+
+        monkeypatch.setattr(get_settings(), "INTERNAL_API_TOKEN", "secret")
+        for path in paths:
+            assert (await client.get(path)).status_code == 401
+            assert (await client.get(path, headers=manager_auth_headers)).status_code == 401
+            assert (await client.get(path, headers={"Authorization": "Bearer secret"})).status_code == 200
+
+        schema_paths = (await client.get("/openapi.json")).json()["paths"]
+        assert not [path for path in schema_paths if path == "/metrics" or path.startswith("/health")]
+
+    def test_route_template_uses_router_endpoint(self):
+        """Test a handled request's template comes from its endpoint without re-matching routes."""
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+
+        from app.middleware.routes import route_template
+
+        async def endpoint(request):
+            pass
+
+        app = Starlette(routes=[Route("/items/{item_id}", endpoint)])
+        scope = {"type": "http", "app": app, "method": "GET", "path": "/other", "endpoint": endpoint}
+
+        assert route_template(scope) == "/items/{item_id}"
+        assert route_template({**scope, "endpoint": None}) == "unmatched"
@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+import pytest
+
+
+def _request():
+    from app.payments.gateway import CheckoutRequest
+
+    return CheckoutRequest(
+        booking_id=1,
+        amount=Decimal("100.00"),
+        name="Booking #1",
+        description="Room booking",
+        success_url="http://test/success",
+        cancel_url="http://test/cancel",
+    )
+
+
+class TestPaymentGateway:
+    """Tests for the async payment gateway layer."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_unavailable(self):
+        """Test a slow provider call is cut off by the per-call timeout."""
+        from app.payments.gateway import FakePaymentGateway, PaymentGatewayUnavailable
+
+        gateway = FakePaymentGateway(timeout_seconds=0.01, latency_seconds=1)
+
+        with pytest.raises(PaymentGatewayUnavailable):
+            await gateway.create_checkout_session(_request())
+        assert gateway.breaker.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_after_transient_failures(self):
+        """Test the breaker fails fast once the failure threshold is reached."""
+        from app.payments.circuit_breaker import CircuitBreaker
+        from app.payments.gateway import FakePaymentGateway, PaymentGatewayError, PaymentGatewayUnavailable
+
+        gateway = FakePaymentGateway(
+            breaker=CircuitBreaker(failure_threshold=2, reset_seconds=60),
+            fail_with=PaymentGatewayError("connection reset", transient=True),
+        )
+
+        for _ in range(2):
+            with pytest.raises(PaymentGatewayError):
+                await gateway.create_checkout_session(_request())
+        assert gateway.breaker.state == "open"
+
+        with pytest.raises(PaymentGatewayUnavailable):
+            await gateway.create_checkout_session(_request())
+        # The open circuit rejected the call without reaching the provider
+        assert len(gateway.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_success_closes_circuit(self):
+        """Test a successful trial call after the reset window closes the circuit."""
+        from app.payments.circuit_breaker import CircuitBreaker
+        from app.payments.gateway import FakePaymentGateway, PaymentGatewayError
+
+        gateway = FakePaymentGateway(
+            breaker=CircuitBreaker(failure_threshold=1, reset_seconds=0),
+            fail_with=PaymentGatewayError("provider error", transient=True),
+        )
+        with pytest.raises(PaymentGatewayError):
+            await gateway.create_checkout_session(_request())
+
+        gateway.fail_with = None
+        session = await gateway.create_checkout_session(_request())
+
+        assert session.id.startswith("cs_fake_")
+        assert gateway.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_request_errors_do_not_trip_circuit(self):
+        """Test non-transient provider errors leave the circuit closed."""
+        from app.payments.circuit_breaker import CircuitBreaker
+        from app.payments.gateway import FakePaymentGateway, PaymentGatewayError
+
+        gateway = FakePaymentGateway(
+            breaker=CircuitBreaker(failure_threshold=1, reset_seconds=60),
+            fail_with=PaymentGatewayError("invalid amount"),
+        )
+        with pytest.raises(PaymentGatewayError):
+            await gateway.create_checkout_session(_request())
+
+        assert gateway.breaker.state == "closed"
@@ -27,6 +27,41 @@ class TestCreateRoom:
         assert float(data["base_price"]) == 999.99
         assert data["total_count"] == 2
 
+    @pytest.mark.asyncio
+    async def test_create_room_generates_inventory(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, db_session
+    ):
+        """Test room creation writes a year of inventory copied from the room."""
+        from datetime import date
+
+        from sqlalchemy import func, select
+
+        from app.models.inventory import Inventory
+
+        response = await client.post(
+            f"/admin/hotels/{test_hotel.id}/rooms",
+            headers=manager_auth_headers,
+            json={"type": "Standard", "base_price": 149.5, "total_count": 4, "capacity": 2},
+        )
+        assert response.status_code == 201
+        room_id = response.json()["id"]
+
+        result = await db_session.execute(
+            select(
+                func.count(Inventory.id),
+                func.min(Inventory.date),
+                func.min(Inventory.price),
+                func.max(Inventory.total_count),
+                func.max(Inventory.city),
+            ).where(Inventory.room_id == room_id)
+        )
+        count, first_date, price, total_count, city = result.one()
+        assert count == 365
+        assert first_date == date.today()
+        assert float(price) == 149.5
+        assert total_count == 4
+        assert city == "Test City"
+
     @pytest.mark.asyncio
     async def test_create_room_unauthorized(self, client: AsyncClient, test_hotel):
         """Test room creation without auth fails."""
@@ -72,6 +107,20 @@ class TestGetRooms:
         assert data["id"] == test_room.id
         assert data["type"] == "Deluxe"
 
+    @pytest.mark.asyncio
+    async def test_get_room_query_budget(
+        self, client: AsyncClient, manager_auth_headers, test_hotel, test_room, assert_max_queries
+    ):
+        """Test fetching a room takes the user, ownership and room lookups and nothing more."""
+        url = f"/admin/hotels/{test_hotel.id}/rooms/{test_room.id}"
+        with assert_max_queries(3):
+            response = await client.get(url, headers=manager_auth_headers)
+        assert response.status_code == 200
+
+        # The user now comes from the principal cache
+        with assert_max_queries(2):
+            await client.get(url, headers=manager_auth_headers)
+
 
 class TestUpdateRoom:
     """Tests for room update endpoint."""
@@ -114,3 +114,121 @@ class TestGuestManagement:
         )
 
         assert response.status_code == 422
+
+
+class TestPrincipalCache:
+    """Tests for cached principal resolution."""
+
+    @pytest.mark.asyncio
+    async def test_cached_user_is_attached_without_query(self, test_user):
+        """Test a cached user is re-attached to a new session without a SELECT and can be flushed."""
+        from sqlalchemy import event, select
+
+        from app.models.user import User
+        from app.security.principal_cache import PrincipalCache
+        from tests.conftest import TestAsyncSessionLocal, test_engine
+
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        cache.set_user(test_user)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with TestAsyncSessionLocal() as session:
+                user = await cache.get_user(test_user.id, session)
+                assert statements == []
+                assert user in session
+                assert user.email == "test@example.com"
+                assert user.roles == ["GUEST"]
+
+                user.name = "Renamed"
+                await session.commit()
+
+            async with TestAsyncSessionLocal() as session:
+                result = await session.execute(select(User.name).where(User.id == test_user.id))
+                assert result.scalar_one() == "Renamed"
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    @pytest.mark.asyncio
+    async def test_profile_update_invalidates_cache(self, client: AsyncClient, auth_headers, test_user, db_session):
+        """Test profile changes drop the cached user once committed and show on the next request."""
+        from app.security.principal_cache import principal_cache
+
+        await client.get("/users/profile", headers=auth_headers)
+        assert principal_cache.users.get(test_user.id) is not None
+
+        response = await client.patch("/users/profile", headers=auth_headers, json={"name": "Cached Name"})
+        assert response.status_code == 200
+        # Other requests must keep the committed row until the change commits
+        assert principal_cache.users.get(test_user.id) is not None
+        await db_session.commit()
+        assert principal_cache.users.get(test_user.id) is None
+
+        response = await client.get("/users/profile", headers=auth_headers)
+        assert response.json()["name"] == "Cached Name"
+
+    @pytest.mark.asyncio
+    async def test_role_and_password_writes_invalidate_cache(self, client: AsyncClient, auth_headers, test_user):
+        """Test user rows changed outside the profile service are dropped on commit, not on rollback."""
+        from sqlalchemy import update
+
+        from app.models.user import User
+        from app.security.principal_cache import principal_cache
+        from tests.conftest import TestAsyncSessionLocal
+
+        await client.get("/users/profile", headers=auth_headers)
+
+        async with TestAsyncSessionLocal() as session:
+            await session.execute(update(User).where(User.id == test_user.id).values(roles=["HOTEL_MANAGER"]))
+            await session.rollback()
+        assert principal_cache.users.get(test_user.id) is not None
+
+        async with TestAsyncSessionLocal() as session:
+            await session.execute(update(User).where(User.id == test_user.id).values(roles=["HOTEL_MANAGER"]))
+            await session.commit()
+        assert principal_cache.users.get(test_user.id) is None
+
+        await client.get("/users/profile", headers=auth_headers)
+        async with TestAsyncSessionLocal() as session:
+            user = await session.get(User, test_user.id)
+            user.password = "new-hash"
+            await session.commit()
+        assert principal_cache.users.get(test_user.id) is None
+
+    @pytest.mark.asyncio
+    async def test_fast_bookings_match_model_response(
+        self, client: AsyncClient, auth_headers, test_user, test_hotel, test_room, db_session, monkeypatch
+    ):
+        """Test the fast path returns the same bookings JSON as the response-model path."""
+        from datetime import date, timedelta
+
+        from app.config import get_settings
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus
+
+        db_session.add(
+            Booking(
+                hotel_id=test_hotel.id,
+                room_id=test_room.id,
+                user_id=test_user.id,
+                rooms_count=1,
+                check_in_date=date.today(),
+                check_out_date=date.today() + timedelta(days=3),
+                booking_status=BookingStatus.CONFIRMED,
+                amount=599.97,
+            )
+        )
+        await db_session.commit()
+
+        model_response = await client.get("/users/myBookings", headers=auth_headers)
+        monkeypatch.setattr(get_settings(), "FAST_JSON_RESPONSES", True)
+        fast_response = await client.get("/users/myBookings", headers=auth_headers)
+
+        assert fast_response.status_code == 200
+        assert fast_response.json()[0]["booking_status"] == "CONFIRMED"
+        assert fast_response.content == model_response.content
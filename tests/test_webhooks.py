@@ -0,0 +1,173 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from tests.conftest import TestAsyncSessionLocal
+
+
+def _signed(event: dict) -> tuple[bytes, dict]:
+    """Serialize an event and sign it the way Stripe does."""
+    from app.config import get_settings
+
+    payload = json.dumps(event).encode()
+    timestamp = int(time.time())
+    secret = get_settings().STRIPE_WEBHOOK_SECRET
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return payload, {"stripe-signature": f"t={timestamp},v1={signature}", "content-type": "application/json"}
+
+
+def _checkout_completed(event_id: str, booking_id: int) -> dict:
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {"id": "cs_test", "object": "checkout.session", "metadata": {"booking_id": str(booking_id)}}
+        },
+    }
+
+
+class TestPaymentWebhook:
+    """Tests for the payment webhook inbox."""
+
+    @pytest.mark.asyncio
+    async def test_webhook_invalid_signature(self, client: AsyncClient):
+        """Test unsigned webhooks are rejected."""
+        payload, _ = _signed(_checkout_completed("evt_bad", 1))
+        response = await client.post("/webhook/payment", content=payload, headers={"stripe-signature": "t=1,v1=x"})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_duplicate_deliveries_confirm_once(
+        self, client: AsyncClient, test_user, test_hotel, test_room, db_session
+    ):
+        """Test redelivered events are stored once and move inventory exactly once."""
+        from app.jobs.webhook_inbox import WebhookInboxProcessor
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus, WebhookEventStatus
+        from app.models.inventory import Inventory
+        from app.models.webhook_event import WebhookEvent
+
+        today = date.today()
+        for i in range(2):
+            db_session.add(
+                Inventory(
+                    hotel_id=test_hotel.id,
+                    room_id=test_room.id,
+                    date=today + timedelta(days=i),
+                    book_count=0,
+                    reserved_count=2,
+                    total_count=5,
+                    surge_factor=1.0,
+                    price=199.99,
+                    city="Test City",
+                    closed=False,
+                )
+            )
+        booking = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=2,
+            check_in_date=today,
+            check_out_date=today + timedelta(days=1),
+            booking_status=BookingStatus.PAYMENTS_PENDING,
+            amount=799.96,
+        )
+        db_session.add(booking)
+        await db_session.commit()
+
+        payload, headers = _signed(_checkout_completed("evt_1", booking.id))
+        for _ in range(2):
+            response = await client.post("/webhook/payment", content=payload, headers=headers)
+            assert response.status_code == 200
+        await db_session.commit()
+
+        result = await db_session.execute(select(func.count(WebhookEvent.id)))
+        assert result.scalar_one() == 1
+
+        processor = WebhookInboxProcessor(session_maker=TestAsyncSessionLocal, batch_size=10)
+        assert await processor.run_once() == 1
+        assert await processor.run_once() == 0
+
+        # A late redelivery after processing is ignored as well
+        response = await client.post("/webhook/payment", content=payload, headers=headers)
+        assert response.status_code == 200
+        await db_session.commit()
+        assert await processor.run_once() == 0
+
+        result = await db_session.execute(select(Booking.booking_status).where(Booking.id == booking.id))
+        assert result.scalar_one() == BookingStatus.CONFIRMED
+        result = await db_session.execute(
+            select(Inventory.reserved_count, Inventory.book_count).where(Inventory.room_id == test_room.id)
+        )
+        assert result.all() == [(0, 2), (0, 2)]
+        result = await db_session.execute(select(WebhookEvent.status))
+        assert result.scalar_one() == WebhookEventStatus.PROCESSED
+
+    @pytest.mark.asyncio
+    async def test_malformed_event_is_marked_failed(self, client: AsyncClient, db_session):
+        """Test a completed checkout without a booking id is parked as FAILED."""
+        from app.jobs.webhook_inbox import WebhookInboxProcessor
+        from app.models.enums import WebhookEventStatus
+        from app.models.webhook_event import WebhookEvent
+
+        event = _checkout_completed("evt_2", 1)
+        event["data"]["object"]["metadata"] = {}
+        payload, headers = _signed(event)
+        response = await client.post("/webhook/payment", content=payload, headers=headers)
+        assert response.status_code == 200
+        await db_session.commit()
+
+        processor = WebhookInboxProcessor(session_maker=TestAsyncSessionLocal, batch_size=10)
+        assert await processor.run_once() == 1
+
+        result = await db_session.execute(select(WebhookEvent.status))
+        assert result.scalar_one() == WebhookEventStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_payment_for_expired_booking_is_marked_failed(
+        self, client: AsyncClient, test_user, test_hotel, test_room, db_session
+    ):
+        """Test a completed checkout for a booking that expired first is kept for reconciliation."""
+        from app.jobs.webhook_inbox import WebhookInboxProcessor
+        from app.models.booking import Booking
+        from app.models.enums import BookingStatus, WebhookEventStatus
+        from app.models.webhook_event import WebhookEvent
+
+        today = date.today()
+        booking = Booking(
+            hotel_id=test_hotel.id,
+            room_id=test_room.id,
+            user_id=test_user.id,
+            rooms_count=1,
+            check_in_date=today,
+            check_out_date=today + timedelta(days=1),
+            booking_status=BookingStatus.EXPIRED,
+            amount=399.98,
+        )
+        db_session.add(booking)
+        await db_session.commit()
+
+        payload, headers = _signed(_checkout_completed("evt_3", booking.id))
+        response = await client.post("/webhook/payment", content=payload, headers=headers)
+        assert response.status_code == 200
+        await db_session.commit()
+
+        processor = WebhookInboxProcessor(session_maker=TestAsyncSessionLocal, batch_size=10)
+        assert await processor.run_once() == 1
+
+        result = await db_session.execute(select(WebhookEvent.status, WebhookEvent.last_error))
+        event_status, last_error = result.one()
+        assert event_status == WebhookEventStatus.FAILED
+        assert f"Booking {booking.id}" in last_error
+        assert "EXPIRED" in last_error
+        result = await db_session.execute(select(Booking.booking_status).where(Booking.id == booking.id))
+        assert result.scalar_one() == BookingStatus.EXPIRED